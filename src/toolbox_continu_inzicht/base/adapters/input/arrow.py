@@ -0,0 +1,228 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+def input_parquet(input_config: dict) -> pd.DataFrame:
+    """Laadt een Parquet-bestand in gegeven een pad
+
+    Notes:
+    ------
+    De datatypes (o.a. datetimes met tijdzone en categorieën) blijven behouden,
+    waardoor het niet nodig is om na het inlezen kolommen om te zetten.
+
+    Options in input_config:
+    ------------------------
+    columns: list[str]
+        Optioneel, alleen deze kolommen worden ingelezen.
+    filters: list
+        Optioneel, filters in de vorm [kolom, operator, waarde], bijvoorbeeld
+        `[["section_id", "in", [1, 2]], ["date_time", ">=", "2024-11-18 08:00:00"]]`.
+        Een lijst van zulke lijsten wordt als OF-combinatie gezien.
+        Row-groups die volgens de statistieken niet aan de filters voldoen worden overgeslagen.
+    memory_map: bool
+        Gebruik memory mapping bij het lezen (standaard True)
+
+    Returns:
+    --------
+    pd.Dataframe
+    """
+    path = input_config["abs_path"]
+    filters = input_config.get("filters", None)
+    if filters is not None:
+        filters = get_arrow_filter_expression(filters, pq.read_schema(path))
+
+    table = pq.read_table(
+        path,
+        columns=input_config.get("columns", None),
+        filters=filters,
+        memory_map=input_config.get("memory_map", True),
+        use_pandas_metadata=True,
+    )
+    return table.to_pandas(split_blocks=True)
+
+
+def input_feather(input_config: dict) -> pd.DataFrame:
+    """Laadt een Arrow IPC (Feather) bestand in gegeven een pad
+
+    Notes:
+    ------
+    Het bestand wordt standaard via memory mapping geopend, zodat alleen de
+    gevraagde kolommen daadwerkelijk van schijf worden gelezen. De filters worden per
+    record batch toegepast, voordat de batches worden samengevoegd.
+    De datatypes blijven behouden.
+
+    Options in input_config:
+    ------------------------
+    columns: list[str]
+        Optioneel, alleen deze kolommen worden ingelezen.
+    filters: list
+        Optioneel, filters in de vorm [kolom, operator, waarde], zie `input_parquet`.
+    memory_map: bool
+        Gebruik memory mapping bij het lezen (standaard True)
+
+    Returns:
+    --------
+    pd.Dataframe
+    """
+    path = input_config["abs_path"]
+    if input_config.get("memory_map", True):
+        source = pa.memory_map(str(path), "r")
+    else:
+        source = pa.OSFile(str(path), "rb")
+
+    columns = input_config.get("columns", None)
+    filters = input_config.get("filters", None)
+    with source:
+        reader = pa.ipc.open_file(source)
+        schema = reader.schema
+        expression = None
+        if filters is not None:
+            expression = get_arrow_filter_expression(filters, schema)
+
+        # alleen de gevraagde kolommen en de kolommen van de filters worden gelezen
+        read_columns = columns
+        if columns is not None and filters is not None:
+            read_columns = columns + [
+                column
+                for column in _get_filter_columns(filters)
+                if column not in columns
+            ]
+
+        # per record batch filteren, zodat niet eerst het hele bestand in het geheugen komt
+        batches = []
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if read_columns is not None:
+                batch = batch.select(read_columns)
+            if expression is not None:
+                batch = batch.filter(expression)
+            if columns is not None:
+                batch = batch.select(columns)
+            batches.append(batch)
+
+        if columns is not None:
+            schema = pa.schema(
+                [schema.field(column) for column in columns], metadata=schema.metadata
+            )
+        table = pa.Table.from_batches(batches, schema=schema)
+        df = table.to_pandas(split_blocks=True)
+    return df
+
+
+def input_parquet_dataset(input_config: dict) -> pd.DataFrame:
+    """Laadt een (hive-)gepartitioneerde Parquet dataset in gegeven een pad
+
+    Notes:
+    ------
+    Bedoeld voor datasets geschreven met `output_parquet_dataset`. Filters op partitie
+    kolommen (zoals `calc_date` of `section_id`) zorgen ervoor dat alleen de mappen die
+    aan het filter voldoen worden gelezen.
+
+    Options in input_config:
+    ------------------------
+    columns: list[str]
+        Optioneel, alleen deze kolommen worden ingelezen (ook partitie kolommen mogelijk).
+    filters: list
+        Optioneel, filters in de vorm [kolom, operator, waarde], zie `input_parquet`.
+        Bijvoorbeeld `[["calc_date", ">=", "2024-11-01"], ["section_id", "==", 1]]`.
+
+    Returns:
+    --------
+    pd.Dataframe
+    """
+    path = input_config["abs_path"]
+    dataset = ds.dataset(
+        path,
+        format="parquet",
+        partitioning=ds.HivePartitioning.discover(),
+    )
+    filters = input_config.get("filters", None)
+    if filters is not None:
+        filters = get_arrow_filter_expression(filters, dataset.schema)
+
+    table = dataset.to_table(columns=input_config.get("columns", None), filter=filters)
+    return table.to_pandas(split_blocks=True)
+
+
+def get_arrow_filter_expression(filters: list, schema: pa.Schema) -> pc.Expression:
+    """Zet filters uit de configuratie om naar een pyarrow expressie
+
+    Waarden voor datetime kolommen mogen als tekst worden opgegeven (zoals in de YAML),
+    deze worden omgezet naar het type van de kolom.
+
+    Parameters:
+    -----------
+    filters: list
+        Lijst met [kolom, operator, waarde] of een lijst van zulke lijsten (OF-combinatie)
+    schema: pa.Schema
+        Schema van het bestand, gebruikt om de waarden om te zetten
+
+    Returns:
+    --------
+    pc.Expression
+    """
+    if len(filters) == 0:
+        raise UserWarning("De optie `filters` mag niet leeg zijn.")
+
+    # een enkele lijst van condities is een EN-combinatie
+    if isinstance(filters[0][0], str):
+        filters = [filters]
+
+    dnf_filters = []
+    for conjunction in filters:
+        dnf_conjunction = []
+        for condition in conjunction:
+            if len(condition) != 3:
+                raise UserWarning(
+                    f"Een filter moet bestaan uit [kolom, operator, waarde], niet {condition}."
+                )
+            column, operator, value = condition
+            if column not in schema.names:
+                raise UserWarning(
+                    f"Filter kolom '{column}' niet gevonden in het bestand."
+                )
+            value = _cast_filter_value(value, schema.field(column).type)
+            dnf_conjunction.append((column, operator, value))
+        dnf_filters.append(dnf_conjunction)
+
+    return pq.filters_to_expression(dnf_filters)
+
+
+def _get_filter_columns(filters: list) -> list[str]:
+    """Geeft de kolommen die in de filters worden gebruikt"""
+    if len(filters) > 0 and isinstance(filters[0][0], str):
+        filters = [filters]
+    columns = []
+    for conjunction in filters:
+        for condition in conjunction:
+            if condition[0] not in columns:
+                columns.append(condition[0])
+    return columns
+
+
+def _cast_filter_value(value, arrow_type: pa.DataType):
+    """Zet een filterwaarde om naar het type van de kolom waar nodig (datetimes)"""
+    if isinstance(value, (list, tuple, set)):
+        return [_cast_filter_value(item, arrow_type) for item in value]
+
+    if pa.types.is_timestamp(arrow_type):
+        timestamp = pd.Timestamp(value)
+        if arrow_type.tz is not None:
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.tz_localize(arrow_type.tz)
+            else:
+                timestamp = timestamp.tz_convert(arrow_type.tz)
+        elif timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_localize(None)
+        return pa.scalar(timestamp, type=arrow_type)
+
+    # datums uit de YAML (zonder aanhalingstekens) vergelijken met tekst, zoals calc_date
+    if pa.types.is_string(arrow_type) and isinstance(value, (date, datetime)):
+        return value.isoformat()
+
+    return value
@@ -1,31 +1,80 @@
+from typing import Iterator
 import pandas as pd
 from toolbox_continu_inzicht.base.adapters.data_adapter_utils import get_kwargs
 
 
-def input_csv(input_config: dict) -> pd.DataFrame:
+def input_csv(input_config: dict) -> pd.DataFrame | Iterator[pd.DataFrame]:
     """Laadt een CSV-bestand in gegeven een pad
 
+    Notes:
+    ------
+    Met `schema_dtypes: True` worden, als de functie die de data opvraagt een schema
+    meegeeft, de numerieke datatypes uit het schema direct bij het inlezen gebruikt en
+    worden datetime kolommen omgezet.
+    Met `engine: pyarrow` wordt de (snellere) pyarrow CSV parser gebruikt, deze kan niet
+    samen met `chunksize` worden gebruikt.
+
+    Options in input_config:
+    ------------------------
+    schema_dtypes: bool
+        Gebruik de datatypes uit het schema van de functie (standaard False)
+    chunksize: int
+        Optioneel, lees het bestand in blokken van `chunksize` rijen.
+        In dat geval wordt een iterator met DataFrames teruggegeven.
+
     Returns:
     --------
-    pd.Dataframe
+    pd.Dataframe | Iterator[pd.DataFrame]
     """
     path = input_config["abs_path"]
 
     kwargs = get_kwargs(pd.read_csv, input_config)
+    schema = None
+    if input_config.get("schema_dtypes", False):
+        schema = input_config.get("input_schema", None)
+    dtype_map, date_columns = get_schema_dtypes(schema)
 
-    df = pd.read_csv(path, **kwargs)
-    return df
+    # de pyarrow parser kan niet in blokken lezen
+    chunksize = kwargs.pop("chunksize", None)
+    if chunksize is not None and kwargs.get("engine") == "pyarrow":
+        raise UserWarning(
+            "De opties `chunksize` en `engine: pyarrow` kunnen niet samen worden gebruikt."
+        )
+
+    if chunksize is None:
+        df = _read_csv_with_dtypes(path, kwargs, dtype_map)
+        return _parse_schema_dates(df, date_columns)
+
+    kwargs = _add_schema_dtypes(kwargs, dtype_map)
+
+    def _iterate_chunks():
+        with pd.read_csv(path, chunksize=chunksize, **kwargs) as reader:
+            for df_chunk in reader:
+                yield _parse_schema_dates(df_chunk, date_columns)
+
+    return _iterate_chunks()
 
 
-def input_csv_source(input_config: dict) -> pd.DataFrame:
+def input_csv_source(input_config: dict) -> pd.DataFrame | Iterator[pd.DataFrame]:
     """Laadt een CSV-bestand in gegeven een pad en filter op een waarde
 
+    Notes:
+    ------
+    Met `chunksize` wordt elk blok gefilterd en een iterator met DataFrames teruggegeven.
+
     Returns:
     --------
-    pd.Dataframe
+    pd.Dataframe | Iterator[pd.DataFrame]
     """
     df = input_csv(input_config)
 
+    if isinstance(df, pd.DataFrame):
+        return _filter_source(df, input_config)
+    return (_filter_source(chunk, input_config) for chunk in df)
+
+
+def _filter_source(df: pd.DataFrame, input_config: dict) -> pd.DataFrame:
+    """Filtert de rijen waarvan de kolom 'source' de waarde uit `filter` bevat"""
     if "source" in df.columns:
         filter_parameter = input_config["filter"]
         filter = f"source.str.contains('{filter_parameter}', case=False)"
@@ -35,3 +84,98 @@ def input_csv_source(input_config: dict) -> pd.DataFrame:
         raise UserWarning("De kolom 'source' is niet aanwezig in het CSV-bestand.")
 
     return df
+
+
+def get_schema_dtypes(schema: dict | None) -> tuple[dict, dict]:
+    """Leidt uit een schema de datatypes af die al bij het inlezen gebruikt kunnen worden
+
+    Parameters:
+    -----------
+    schema: dict | None
+        Schema zoals meegegeven aan `DataAdapter.input`, kolomnaam: datatype(s)
+
+    Returns:
+    --------
+    tuple[dict, dict]
+        Numerieke datatypes per kolom (voor `dtype`) en de toegestane datatypes
+        per datetime kolom.
+    """
+    dtype_map = {}
+    date_columns = {}
+    if schema is None:
+        return dtype_map, date_columns
+
+    numeric_dtypes = {
+        "int": "int64",
+        "int32": "int32",
+        "int64": "int64",
+        "float": "float64",
+        "float32": "float32",
+        "float64": "float64",
+        "bool": "bool",
+    }
+    for column, expected_dtype in schema.items():
+        expected_dtypes = (
+            expected_dtype if isinstance(expected_dtype, list) else [expected_dtype]
+        )
+        if any(str(dtype).startswith("datetime64") for dtype in expected_dtypes):
+            date_columns[column] = expected_dtype
+        elif len(expected_dtypes) == 1 and expected_dtypes[0] in numeric_dtypes:
+            dtype_map[column] = numeric_dtypes[expected_dtypes[0]]
+
+    return dtype_map, date_columns
+
+
+def _add_schema_dtypes(kwargs: dict, dtype_map: dict) -> dict:
+    """Voegt de datatypes uit het schema toe, datatypes uit de configuratie gaan voor"""
+    if len(dtype_map) == 0 or not isinstance(kwargs.get("dtype", {}), dict):
+        return kwargs
+    return kwargs | {"dtype": dtype_map | kwargs.get("dtype", {})}
+
+
+def _read_csv_with_dtypes(path, kwargs: dict, dtype_map: dict) -> pd.DataFrame:
+    """Leest het CSV-bestand met de datatypes uit het schema"""
+    kwargs_dtype = _add_schema_dtypes(kwargs, dtype_map)
+    try:
+        return _read_csv(path, kwargs_dtype)
+    except (ValueError, TypeError) as e:
+        if kwargs_dtype is kwargs:
+            raise
+        # bijv. lege waardes in een integer kolom
+        raise UserWarning(
+            f"Het CSV-bestand {path} kan niet worden ingelezen met de datatypes uit het schema "
+            f"({e}). Zet `schema_dtypes: False` of geef zelf `dtype` op."
+        ) from e
+
+
+def _read_csv(path, kwargs: dict) -> pd.DataFrame:
+    df = pd.read_csv(path, **kwargs)
+    if kwargs.get("engine") == "pyarrow":
+        # pyarrow geeft datetimes met een andere resolutie, zet deze om naar nanoseconden
+        for column in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                dtype = df[column].dtype
+                unit_dtype = (
+                    pd.DatetimeTZDtype("ns", dtype.tz)
+                    if isinstance(dtype, pd.DatetimeTZDtype)
+                    else "datetime64[ns]"
+                )
+                df[column] = df[column].astype(unit_dtype)
+    return df
+
+
+def _parse_schema_dates(df: pd.DataFrame, date_columns: dict) -> pd.DataFrame:
+    """Zet datetime kolommen om, alleen als het resultaat overeenkomt met het schema"""
+    for column, expected_dtype in date_columns.items():
+        if column not in df.columns or pd.api.types.is_datetime64_any_dtype(df[column]):
+            continue
+        try:
+            parsed = pd.to_datetime(df[column])
+        except (ValueError, TypeError):
+            continue
+        expected_dtypes = (
+            expected_dtype if isinstance(expected_dtype, list) else [expected_dtype]
+        )
+        if parsed.dtype in expected_dtypes:
+            df[column] = parsed
+    return df
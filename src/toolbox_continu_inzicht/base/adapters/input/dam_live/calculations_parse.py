@@ -1,6 +1,7 @@
 import warnings
 import pandas as pd
 from toolbox_continu_inzicht.base.adapters.input.dam_live.json_folder import (
+    cached_json_table,
     input_json_folder,
 )
 
@@ -16,8 +17,16 @@ def input_calculationsettings(input_config: dict) -> pd.DataFrame:
     en zet deze om naar een flat table.
 
     Per gevonden circle wordt één rij aangemaakt.
+    Met de optie `cache` wordt de tabel gecached, zie `cached_json_table`.
     """
+    return cached_json_table(
+        input_config,
+        "calculationsettings",
+        lambda: _parse_calculationsettings(input_config),
+    )
 
+
+def _parse_calculationsettings(input_config: dict) -> pd.DataFrame:
     rows = []
 
     for item in input_json_folder(input_config):
@@ -1,6 +1,7 @@
 import pandas as pd
 
 from toolbox_continu_inzicht.base.adapters.input.dam_live.json_folder import (
+    cached_json_table,
     input_json_folder,
 )
 
@@ -28,8 +29,15 @@ def input_geometries(input_config: dict) -> pd.DataFrame:
     layer_label
     points  # lijst van XZ coördinaten
     content_version
+
+    Met de optie `cache` wordt de tabel gecached, zie `cached_json_table`.
     """
+    return cached_json_table(
+        input_config, "geometries", lambda: _parse_geometries(input_config)
+    )
+
 
+def _parse_geometries(input_config: dict) -> pd.DataFrame:
     rows = []
 
     for item in input_json_folder(input_config):
@@ -1,18 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
+import os
 from pathlib import Path
-from typing import Iterator, Dict, Any
+import tempfile
+from typing import Callable, Iterator, Dict, Any
+import warnings
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from toolbox_continu_inzicht.base.adapters.data_adapter_utils import get_kwargs
 
+# Verhoog bij een wijziging in de parsers, zodat oude caches niet meer gebruikt worden
+JSON_TABLE_CACHE_VERSION = 1
+
+# In het geheugen per proces, alleen met de optie `cache`: (pad, tabel) -> (signatuur, DataFrame)
+_json_table_cache: dict[tuple[str, str], tuple[str, pd.DataFrame]] = {}
+
 
 def input_json_folder(input_config: dict) -> Iterator[Dict[str, Any]]:
     """Lees alle JSON bestanden in een folder.
 
+    De bestanden worden gelijktijdig (met meerdere threads) ingelezen en in volgorde
+    van bestandsnaam teruggegeven.
+
     Parameters
     ----------
     input_config : dict
         Configuratie met minimaal:
         - "abs_path": pad naar folder met JSON bestanden
+        - "max_workers": optioneel, maximaal aantal threads voor het inlezen
 
     Yields
     ------
@@ -42,11 +61,137 @@ def input_json_folder(input_config: dict) -> Iterator[Dict[str, Any]]:
 
     json_files = sorted(folder_path.glob("*.json"))
 
-    for file_path in json_files:
+    def _read_json(file_path: Path):
         with file_path.open("r", encoding="utf-8") as f:
-            data = json.load(f, **kwargs)
+            return json.load(f, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=input_config.get("max_workers")) as executor:
+        for file_path, data in zip(json_files, executor.map(_read_json, json_files)):
+            yield {
+                "file_name": file_path.name,
+                "data": data,
+            }
+
+
+def cached_json_table(
+    input_config: dict, table_name: str, parse: Callable[[], pd.DataFrame]
+) -> pd.DataFrame:
+    """Geeft de platte tabel van een JSON bestand of folder, uit de cache als niets is gewijzigd
+
+    De cache staat aan met de optie `cache: true` (of met `cache_dir`) en is gekoppeld aan
+    de naam, wijzigingstijd en grootte van de JSON bestanden. Binnen een proces wordt de
+    tabel in het geheugen bewaard en daarnaast als Parquet bestand naast de folder (of in
+    `cache_dir`) opgeslagen, zodat een volgende run de JSON bestanden niet opnieuw hoeft
+    te lezen. Zonder de optie wordt de tabel altijd opnieuw ingelezen.
+
+    Parameters
+    ----------
+    input_config : dict
+        Configuratie met "abs_path" en optioneel "cache" en "cache_dir"
+    table_name : str
+        Naam van de tabel, bijvoorbeeld "geometries"
+    parse : Callable[[], pd.DataFrame]
+        Functie die de JSON bestanden inleest en de tabel teruggeeft
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    if not (input_config.get("cache", False) or "cache_dir" in input_config):
+        return parse()
 
-        yield {
-            "file_name": file_path.name,
-            "data": data,
+    path = Path(input_config["abs_path"]).resolve()
+    signature = get_json_signature(path, input_config, table_name)
+    if signature is None:
+        # niet aanwezig: de parser geeft de foutmelding
+        return parse()
+
+    memory_key = (str(path), table_name)
+    cached = _json_table_cache.get(memory_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1].copy()
+
+    cache_dir = Path(input_config.get("cache_dir", path.parent))
+    cache_path = cache_dir / f".{path.name}.{table_name}.parquet"
+    df = _read_json_table_cache(cache_path, signature)
+    if df is None:
+        df = parse()
+        _write_json_table_cache(cache_path, signature, df)
+
+    _json_table_cache[memory_key] = (signature, df.copy())
+    return df
+
+
+def get_json_signature(path: Path, input_config: dict, table_name: str) -> str | None:
+    """Bepaalt een hash van de namen, wijzigingstijden en groottes van de JSON bestanden"""
+    if path.is_dir():
+        files = sorted(path.glob("*.json"))
+    elif path.is_file():
+        files = [path]
+    else:
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(f"{table_name}|{JSON_TABLE_CACHE_VERSION}".encode())
+    kwargs = get_kwargs(json.load, input_config)
+    digest.update(json.dumps(kwargs, sort_keys=True, default=str).encode())
+    for file_path in files:
+        stat = file_path.stat()
+        digest.update(f"|{file_path.name}|{stat.st_mtime_ns}|{stat.st_size}".encode())
+    return digest.hexdigest()
+
+
+def _read_json_table_cache(cache_path: Path, signature: str) -> pd.DataFrame | None:
+    """Leest de tabel uit het Parquet bestand als de signatuur overeenkomt"""
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowException):
+        return None
+    if metadata.get(b"json_signature", b"").decode() != signature:
+        return None
+
+    df = pq.read_table(cache_path).to_pandas()
+    # geneste waardes (lijsten en dicts) zijn als JSON tekst opgeslagen
+    for column in json.loads(metadata.get(b"json_columns", b"[]")):
+        df[column] = [
+            json.loads(value) if value is not None else None for value in df[column]
+        ]
+    return df
+
+
+def _write_json_table_cache(cache_path: Path, signature: str, df: pd.DataFrame) -> None:
+    """Schrijft de tabel (atomair) als Parquet bestand, met de signatuur in de metadata"""
+    df = df.copy()
+    json_columns = []
+    for column in df.select_dtypes(include="object").columns:
+        if any(isinstance(value, (list, dict)) for value in df[column]):
+            df[column] = [
+                json.dumps(value) if value is not None else None for value in df[column]
+            ]
+            json_columns.append(column)
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        warnings.warn(f"Tabel kan niet in de cache worden opgeslagen: {e}")
+        return
+    table = table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or {}),
+            b"json_signature": signature.encode(),
+            b"json_columns": json.dumps(json_columns).encode(),
         }
+    )
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, tmp_path = tempfile.mkstemp(
+        dir=cache_path.parent, prefix=f"{cache_path.name}-", suffix=".tmp"
+    )
+    os.close(file_descriptor)
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
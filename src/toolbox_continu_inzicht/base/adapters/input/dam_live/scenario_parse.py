@@ -1,6 +1,7 @@
 import pandas as pd
 
 from toolbox_continu_inzicht.base.adapters.input.dam_live.json_folder import (
+    cached_json_table,
     input_json_folder,
 )
 
@@ -9,6 +10,7 @@ def input_stages(input_config: dict) -> pd.DataFrame:
     """
     Lees alle scenario JSON bestanden uit een folder en zet de stages
     om naar een platte tabel met gekoppelde calculation-id's.
+    Met de optie `cache` wordt de tabel gecached, zie `cached_json_table`.
 
     Parameters
     ----------
@@ -21,7 +23,12 @@ def input_stages(input_config: dict) -> pd.DataFrame:
     pd.DataFrame
         Tabel met per stage (en per calculation) één rij.
     """
+    return cached_json_table(
+        input_config, "stages", lambda: _parse_stages(input_config)
+    )
 
+
+def _parse_stages(input_config: dict) -> pd.DataFrame:
     rows = []
 
     for item in input_json_folder(input_config):
@@ -1,5 +1,6 @@
 import pandas as pd
 from toolbox_continu_inzicht.base.adapters.input.dam_live.json_folder import (
+    cached_json_table,
     input_json_folder,
 )
 
@@ -26,8 +27,15 @@ def input_soillayers(input_config: dict) -> pd.DataFrame:
     layer_id
     soil_id
     content_version
+
+    Met de optie `cache` wordt de tabel gecached, zie `cached_json_table`.
     """
+    return cached_json_table(
+        input_config, "soillayers", lambda: _parse_soillayers(input_config)
+    )
+
 
+def _parse_soillayers(input_config: dict) -> pd.DataFrame:
     rows = []
 
     for item in input_json_folder(input_config):
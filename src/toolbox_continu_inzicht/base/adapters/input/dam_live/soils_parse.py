@@ -1,6 +1,10 @@
 import json
 import pandas as pd
 
+from toolbox_continu_inzicht.base.adapters.input.dam_live.json_folder import (
+    cached_json_table,
+)
+
 
 def input_soils(input_config: dict) -> pd.DataFrame:
     """
@@ -10,7 +14,12 @@ def input_soils(input_config: dict) -> pd.DataFrame:
         Configuratie voor het inlezen van de calculationsettings JSON bestanden.
 
     Lees een losse soils JSON file via input_config dict.
+    Met de optie `cache` wordt de tabel gecached, zie `cached_json_table`.
     """
+    return cached_json_table(input_config, "soils", lambda: _parse_soils(input_config))
+
+
+def _parse_soils(input_config: dict) -> pd.DataFrame:
     file_path = input_config["abs_path"]
 
     SOIL_COLOR_MAP = {
@@ -1,55 +1,59 @@
 from toolbox_continu_inzicht.base.adapters.input.dam_live.json_folder import (
+    cached_json_table,
     input_json_folder,
 )
 import pandas as pd
 
 
 def input_waternets(input_config: dict) -> pd.DataFrame:
-    rows = []
+    """Lees alle waternet JSON bestanden in een folder en zet de lijnen om naar een platte tabel.
+
+    Met de optie `cache` wordt de tabel gecached, zie `cached_json_table`.
+    """
+    return cached_json_table(
+        input_config, "waternets", lambda: _parse_waternets(input_config)
+    )
+
+
+def _parse_waternets(input_config: dict) -> pd.DataFrame:
+    # per kolom een lijst, een rij per punt van een lijn
+    columns = {
+        column: []
+        for column in [
+            "waternet_id",
+            "line_type",
+            "line_id",
+            "line_label",
+            "x",
+            "z",
+            "top_headline_id",
+            "bottom_headline_id",
+            "content_version",
+        ]
+    }
 
     for item in input_json_folder(input_config):
         data = item["data"]
         waternet_id = data.get("Id")
         content_version = data.get("ContentVersion")
 
-        # HeadLines
-        for head in data.get("HeadLines", []):
-            line_id = head.get("Id")
-            line_label = head.get("Label")
-            for p in head.get("Points", []):
-                rows.append(
-                    {
-                        "waternet_id": waternet_id,
-                        "line_type": "Head",
-                        "line_id": line_id,
-                        "line_label": line_label,
-                        "x": p.get("X"),
-                        "z": p.get("Z"),
-                        "top_headline_id": None,
-                        "bottom_headline_id": None,
-                        "content_version": content_version,
-                    }
-                )
-
-        # ReferenceLines
-        for ref in data.get("ReferenceLines", []):
-            line_id = ref.get("Id")
-            line_label = ref.get("Label")
-            top_id = ref.get("TopHeadLineId")
-            bottom_id = ref.get("BottomHeadLineId")
-            for p in ref.get("Points", []):
-                rows.append(
-                    {
-                        "waternet_id": waternet_id,
-                        "line_type": "Reference",
-                        "line_id": line_id,
-                        "line_label": line_label,
-                        "x": p.get("X"),
-                        "z": p.get("Z"),
-                        "top_headline_id": top_id,
-                        "bottom_headline_id": bottom_id,
-                        "content_version": content_version,
-                    }
-                )
-
-    return pd.DataFrame(rows)
+        for line_type, key in [("Head", "HeadLines"), ("Reference", "ReferenceLines")]:
+            for line in data.get(key, []):
+                points = line.get("Points", [])
+                n_points = len(points)
+                top_id, bottom_id = None, None
+                if line_type == "Reference":
+                    top_id = line.get("TopHeadLineId")
+                    bottom_id = line.get("BottomHeadLineId")
+
+                columns["waternet_id"].extend([waternet_id] * n_points)
+                columns["line_type"].extend([line_type] * n_points)
+                columns["line_id"].extend([line.get("Id")] * n_points)
+                columns["line_label"].extend([line.get("Label")] * n_points)
+                columns["x"].extend(p.get("X") for p in points)
+                columns["z"].extend(p.get("Z") for p in points)
+                columns["top_headline_id"].extend([top_id] * n_points)
+                columns["bottom_headline_id"].extend([bottom_id] * n_points)
+                columns["content_version"].extend([content_version] * n_points)
+
+    return pd.DataFrame(columns)
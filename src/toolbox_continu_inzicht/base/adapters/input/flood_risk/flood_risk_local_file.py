@@ -1,7 +1,10 @@
 from pathlib import Path
-from typing import Tuple
+from typing import Iterator, Tuple
 import numpy as np
 import rasterio
+from rasterio.enums import Resampling
+from rasterio.errors import WindowError
+from rasterio.windows import Window, from_bounds
 
 from toolbox_continu_inzicht.base.adapters.data_adapter_utils import get_kwargs
 
@@ -25,6 +28,21 @@ def input_flood_risk_local_file(
         Band nummer om in te lezen (standaard 1)
     nodata: float
         NoData waarde in het rasterbestand (standaard -9999)
+    bounds: list[float]
+        Optioneel, (xmin, ymin, xmax, ymax) in de coördinaten van het raster.
+        Alleen het deel van het raster binnen deze grenzen wordt ingelezen.
+    geometry: object
+        Optioneel, geometrie (shapely of (Geo)DataFrame/GeoSeries) waarvan de
+        grenzen als `bounds` worden gebruikt. Wordt genegeerd als `bounds` is opgegeven.
+    window_optional: bool
+        Optioneel, als de grenzen helemaal buiten het raster vallen wordt het hele raster
+        ingelezen in plaats van een fout te geven (standaard False)
+    overview_level: int
+        Optioneel, lees een grover overzichtsniveau (0 is het eerste overzicht).
+        Als het bestand geen overzichten bevat wordt met een factor 2**(overview_level + 1)
+        verkleind.
+    resampling: str
+        Resampling methode bij het lezen van een overzichtsniveau (standaard `nearest`)
 
     Returns:
     --------
@@ -32,7 +50,76 @@ def input_flood_risk_local_file(
     """
 
     kwargs = get_kwargs(rasterio.open, input_config)
+    grid_path = _get_grid_path(input_config)
 
+    # inlezen raster
+    band = input_config.get("band", 1)
+    nodata = input_config.get("nodata", -9999)
+    with rasterio.open(grid_path, **kwargs, dtype="float32") as src:
+        window = _get_window(src, input_config)
+        out_shape, resampling = _get_out_shape(src, band, window, input_config)
+        array_masked_grid_input = src.read(
+            band,
+            window=window,
+            out_shape=out_shape,
+            resampling=resampling,
+            masked=True,
+            fill_value=nodata,
+        )
+        affine = _get_affine(src, window, array_masked_grid_input.shape)
+
+    return _to_masked_float32(array_masked_grid_input, nodata), affine
+
+
+def input_flood_risk_local_file_blocks(
+    input_config: dict,
+) -> Iterator[Tuple[Window, np.ma.masked_array[np.float32], rasterio.Affine]]:
+    """Leest een rasterbestand (bijv. tiff) blok voor blok in, gegeven een lokaal pad
+
+    Hiermee is het geheugengebruik begrensd door de grootte van een blok in plaats
+    van de grootte van het hele raster.
+
+    Options in input_config:
+    ------------------------
+    Alle opties van `input_flood_risk_local_file` (behalve `overview_level`), aangevuld met:
+
+    block_size: int
+        Optioneel, grootte in pixels (rijen en kolommen) van de blokken.
+        Zonder deze optie worden de interne blokken van het bestand gebruikt.
+
+    Returns:
+    --------
+    Iterator[Tuple[rasterio.windows.Window, np.ma.masked_array, rasterio.Affine]]
+        Per blok het venster (t.o.v. het volledige raster), de data en de bijbehorende affine.
+    """
+    kwargs = get_kwargs(rasterio.open, input_config)
+    grid_path = _get_grid_path(input_config)
+
+    band = input_config.get("band", 1)
+    nodata = input_config.get("nodata", -9999)
+    block_size = input_config.get("block_size", None)
+
+    def _iterate_blocks():
+        with rasterio.open(grid_path, **kwargs, dtype="float32") as src:
+            window_total = _get_window(src, input_config)
+            for window in _get_block_windows(src, band, window_total, block_size):
+                array_masked_block = src.read(
+                    band,
+                    window=window,
+                    masked=True,
+                    fill_value=nodata,
+                )
+                yield (
+                    window,
+                    _to_masked_float32(array_masked_block, nodata),
+                    src.window_transform(window),
+                )
+
+    return _iterate_blocks()
+
+
+def _get_grid_path(input_config: dict) -> Path:
+    """Bepaalt het pad naar het rasterbestand uit de input_config"""
     # aanpassingen van paden
     # 4 opties om het pad naar de scenario grids te bepalen:
     # absoluut
@@ -64,25 +151,115 @@ def input_flood_risk_local_file(
     if not grid_path.exists():
         raise UserWarning(f"Grid file {grid_path} bestaat niet.")
 
-    # inlezen raster
-    band = input_config.get("band", 1)
-    nodata = input_config.get("nodata", -9999)
-    with rasterio.open(grid_path, **kwargs, dtype="float32") as src:
-        array_masked_grid_input = src.read(
-            band,
-            masked=True,
-            fill_value=nodata,
+    return grid_path
+
+
+def _get_window(src, input_config: dict) -> Window | None:
+    """Bepaalt het leesvenster uit de opties `bounds` of `geometry`, None betekent het hele raster"""
+    bounds = input_config.get("bounds", None)
+    geometry = input_config.get("geometry", None)
+    if bounds is None and geometry is not None:
+        if hasattr(geometry, "total_bounds"):
+            bounds = geometry.total_bounds
+        elif hasattr(geometry, "bounds"):
+            bounds = geometry.bounds
+        else:
+            raise UserWarning(
+                "De optie `geometry` moet een shapely geometrie of GeoDataFrame/GeoSeries zijn."
+            )
+    if bounds is None:
+        return None
+
+    if len(bounds) != 4:
+        raise UserWarning(
+            f"De optie `bounds` moet 4 waarden bevatten (xmin, ymin, xmax, ymax), niet {bounds}."
+        )
+    xmin, ymin, xmax, ymax = bounds
+    window = from_bounds(xmin, ymin, xmax, ymax, transform=src.transform)
+    # rond naar buiten af op hele pixels zodat alle pixels binnen de grenzen meegenomen worden
+    col_off = int(np.floor(window.col_off))
+    row_off = int(np.floor(window.row_off))
+    col_end = int(np.ceil(window.col_off + window.width))
+    row_end = int(np.ceil(window.row_off + window.height))
+    window = Window(col_off, row_off, col_end - col_off, row_end - row_off)
+    try:
+        return window.intersection(Window(0, 0, src.width, src.height))
+    except WindowError:
+        if input_config.get("window_optional", False):
+            return None
+        raise UserWarning(
+            f"De opgegeven grenzen {tuple(bounds)} vallen buiten het raster {src.bounds}."
         )
-        affine = src.transform
 
+
+def _get_out_shape(
+    src, band: int, window: Window | None, input_config: dict
+) -> Tuple[Tuple[int, int] | None, Resampling]:
+    """Bepaalt de uitvoergrootte bij het lezen van een overzichtsniveau"""
+    resampling = Resampling[input_config.get("resampling", "nearest")]
+    overview_level = input_config.get("overview_level", None)
+    if overview_level is None:
+        return None, resampling
+
+    overviews = src.overviews(band)
+    if overview_level < len(overviews):
+        factor = overviews[overview_level]
+    else:
+        factor = 2 ** (overview_level + 1)
+
+    height = src.height if window is None else window.height
+    width = src.width if window is None else window.width
+    out_shape = (max(1, int(height // factor)), max(1, int(width // factor)))
+    return out_shape, resampling
+
+
+def _get_affine(src, window: Window | None, shape: Tuple[int, int]) -> rasterio.Affine:
+    """Bepaalt de affine van het ingelezen (eventueel verkleinde) venster"""
+    if window is None:
+        window = Window(0, 0, src.width, src.height)
+    affine = src.window_transform(window)
+    rows, cols = shape
+    if (rows, cols) != (window.height, window.width):
+        affine = affine * rasterio.Affine.scale(
+            window.width / cols, window.height / rows
+        )
+    return affine
+
+
+def _get_block_windows(
+    src, band: int, window_total: Window | None, block_size: int | None
+) -> Iterator[Window]:
+    """Geeft de blokvensters binnen het (optionele) totale venster"""
+    if window_total is None:
+        window_total = Window(0, 0, src.width, src.height)
+
+    if block_size is None:
+        block_height, block_width = src.block_shapes[band - 1]
+    else:
+        block_height = block_width = int(block_size)
+
+    row_start = int(window_total.row_off)
+    col_start = int(window_total.col_off)
+    row_stop = row_start + int(window_total.height)
+    col_stop = col_start + int(window_total.width)
+    for row_off in range(row_start, row_stop, block_height):
+        height = min(block_height, row_stop - row_off)
+        for col_off in range(col_start, col_stop, block_width):
+            width = min(block_width, col_stop - col_off)
+            yield Window(col_off, row_off, width, height)
+
+
+def _to_masked_float32(
+    array_masked_grid_input: np.ma.masked_array, nodata: float
+) -> np.ma.masked_array[np.float32]:
+    """Zet de ingelezen data om naar float32 met NaN voor de nodata waarde"""
     data = array_masked_grid_input.data
     # Zorg data de gebruiker gedefineerde nodata value correct wordt behandeld
-    data = data.astype(np.float32)
-    data[np.where(data == nodata)] = np.nan
+    data = data.astype(np.float32, copy=False)
+    data[data == nodata] = np.nan
     array_masked_grid = np.ma.masked_array(
         data,
         mask=array_masked_grid_input.mask,
         dtype=np.float32,
     )
-
-    return array_masked_grid, affine
+    return array_masked_grid
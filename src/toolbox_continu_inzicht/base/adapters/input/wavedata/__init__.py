@@ -1 +1,2 @@
 from toolbox_continu_inzicht.base.adapters.input.wavedata.csv_wavedata import *  # noqa: F403
+from toolbox_continu_inzicht.base.adapters.input.wavedata.cube_wavedata import *  # noqa: F403
@@ -0,0 +1,321 @@
+"""
+Dichte kubus met voorberekende golfcondities
+
+De golftabellen (waveval_id en waveval) worden eenmalig omgezet naar een dichte kubus met de
+assen locatie x golfparameter x windsnelheid x windrichting x waterstand. De kubus wordt als
+map met `.npy` bestanden opgeslagen. Bij het openen worden de bestanden via memory mapping
+gelezen, zodat alleen de data van de gebruikte locaties van schijf wordt geladen en het
+selecteren van een locatie geen kopie maakt.
+"""
+
+import os
+from pathlib import Path
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Bestanden in de map van de kubus
+WAVEDATA_CUBE_ARRAYS = (
+    "values",
+    "hr_locid",
+    "waveval_type",
+    "windspeed",
+    "winddir",
+    "waterlevel",
+    "sizes",
+)
+
+
+class WaveDataCubeLocation:
+    """
+    Golfcondities van een locatie uit een `WaveDataCube`
+
+    De arrays zijn views op de (memory mapped) kubus.
+
+    Attributes
+    ----------
+    hr_locid : int
+        Id van de hydraulische locatie
+    waveval_type : np.ndarray
+        Golfparameters (2: Hs, 6: Tm-1,0 en 7: golfrichting)
+    windspeed : np.ndarray
+        Oplopende windsnelheden
+    winddir : np.ndarray
+        Oplopende windrichtingen
+    waterlevel : np.ndarray
+        Oplopende waterstanden
+    values : np.ndarray
+        Golfcondities met vorm (golfparameter, windsnelheid, windrichting, waterstand),
+        NaN voor ontbrekende combinaties
+    """
+
+    def __init__(
+        self,
+        hr_locid: int,
+        waveval_type: np.ndarray,
+        windspeed: np.ndarray,
+        winddir: np.ndarray,
+        waterlevel: np.ndarray,
+        values: np.ndarray,
+    ):
+        self.hr_locid = hr_locid
+        self.waveval_type = waveval_type
+        self.windspeed = windspeed
+        self.winddir = winddir
+        self.waterlevel = waterlevel
+        self.values = values
+
+    def get_grid(self, waveval_type: int) -> np.ndarray:
+        """Geeft het grid (windsnelheid, windrichting, waterstand) van een golfparameter"""
+        index = np.flatnonzero(self.waveval_type == waveval_type)
+        if len(index) == 0:
+            raise KeyError(f"{waveval_type} is not present in the wave data cube")
+        return self.values[index[0]]
+
+
+class WaveDataCube:
+    """
+    Dichte kubus met golfcondities voor meerdere locaties
+
+    Elke locatie heeft eigen assen voor windsnelheid, windrichting en waterstand. De assen
+    worden aangevuld met NaN tot de lengte van de langste as, het aantal waardes per
+    locatie staat in `sizes`.
+
+    Attributes
+    ----------
+    values : np.ndarray
+        Golfcondities met vorm (locatie, golfparameter, windsnelheid, windrichting, waterstand)
+    hr_locid : np.ndarray
+        Id's van de hydraulische locaties
+    waveval_type : np.ndarray
+        Golfparameters
+    windspeed, winddir, waterlevel : np.ndarray
+        Assen per locatie, met vorm (locatie, maximale lengte)
+    sizes : np.ndarray
+        Lengte van de assen per locatie, met vorm (locatie, 3)
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        hr_locid: np.ndarray,
+        waveval_type: np.ndarray,
+        windspeed: np.ndarray,
+        winddir: np.ndarray,
+        waterlevel: np.ndarray,
+        sizes: np.ndarray,
+    ):
+        self.values = values
+        self.hr_locid = hr_locid
+        self.waveval_type = waveval_type
+        self.windspeed = windspeed
+        self.winddir = winddir
+        self.waterlevel = waterlevel
+        self.sizes = sizes
+        self._location_index = {
+            int(locid): index for index, locid in enumerate(hr_locid)
+        }
+
+    def __len__(self) -> int:
+        return len(self.hr_locid)
+
+    def __contains__(self, hr_locid) -> bool:
+        return int(hr_locid) in self._location_index
+
+    @classmethod
+    def from_dataframes(
+        cls, df_waveval_id: pd.DataFrame, df_waveval: pd.DataFrame
+    ) -> "WaveDataCube":
+        """Maakt de kubus van de golftabellen
+
+        Parameters
+        ----------
+        df_waveval_id : pd.DataFrame
+            Tabel met de kolommen waveval_id, waveval_type, hr_locid, winddir en windspeed
+        df_waveval : pd.DataFrame
+            Tabel met de kolommen waveval_id, waterlevel en waveval
+        """
+        df = df_waveval_id[
+            ["waveval_id", "waveval_type", "hr_locid", "winddir", "windspeed"]
+        ].merge(df_waveval[["waveval_id", "waterlevel", "waveval"]], on="waveval_id")
+        return cls.from_long_dataframe(df)
+
+    @classmethod
+    def from_long_dataframe(cls, df: pd.DataFrame) -> "WaveDataCube":
+        """Maakt de kubus van een tabel met de kolommen hr_locid, waveval_type, windspeed,
+        winddir, waterlevel en waveval"""
+        missing_columns = {
+            "hr_locid",
+            "waveval_type",
+            "windspeed",
+            "winddir",
+            "waterlevel",
+            "waveval",
+        } - set(df.columns)
+        if len(missing_columns) > 0:
+            raise UserWarning(
+                f"Kolom(men) {sorted(missing_columns)} niet gevonden in de golfdata."
+            )
+
+        hr_locid, loc_idx = np.unique(df["hr_locid"].to_numpy(), return_inverse=True)
+        waveval_type, type_idx = np.unique(
+            df["waveval_type"].to_numpy().astype(int), return_inverse=True
+        )
+        ws = df["windspeed"].to_numpy(dtype=float)
+        wd = df["winddir"].to_numpy(dtype=float)
+        wl = df["waterlevel"].to_numpy(dtype=float)
+
+        # per locatie de assen en de posities van de waardes op de assen
+        axes = []
+        positions = np.empty((len(df), 3), dtype=np.intp)
+        order = np.argsort(loc_idx, kind="stable")
+        bounds = np.searchsorted(loc_idx[order], np.arange(len(hr_locid) + 1))
+        for i in range(len(hr_locid)):
+            rows = order[bounds[i] : bounds[i + 1]]
+            location_axes = []
+            for axis, column in enumerate([ws, wd, wl]):
+                axis_values, inverse = np.unique(column[rows], return_inverse=True)
+                positions[rows, axis] = inverse
+                location_axes.append(axis_values)
+            axes.append(location_axes)
+
+        sizes = np.array(
+            [[len(axis) for axis in location_axes] for location_axes in axes]
+        )
+        max_sizes = sizes.max(axis=0)
+        padded_axes = []
+        for axis in range(3):
+            padded = np.full((len(hr_locid), max_sizes[axis]), np.nan)
+            for i, location_axes in enumerate(axes):
+                padded[i, : sizes[i, axis]] = location_axes[axis]
+            padded_axes.append(padded)
+
+        values = np.full(
+            (len(hr_locid), len(waveval_type), *max_sizes), np.nan, dtype=float
+        )
+        values[loc_idx, type_idx, positions[:, 0], positions[:, 1], positions[:, 2]] = (
+            df["waveval"].to_numpy(dtype=float)
+        )
+
+        return cls(values, hr_locid, waveval_type, *padded_axes, sizes)
+
+    def save(self, path: str | Path) -> None:
+        """Slaat de kubus op als map met `.npy` bestanden
+
+        De kubus wordt eerst in een tijdelijke map naast `path` geschreven en daarna in
+        een keer hernoemd, zodat een lezer nooit een mix van oude en nieuwe bestanden ziet.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = Path(
+            tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}-", suffix=".tmp")
+        )
+        old_path = None
+        try:
+            for name in WAVEDATA_CUBE_ARRAYS:
+                np.save(
+                    tmp_path / f"{name}.npy", np.ascontiguousarray(getattr(self, name))
+                )
+            if path.exists():
+                # een bestaande map kan niet worden overschreven, eerst opzij zetten
+                old_path = Path(
+                    tempfile.mkdtemp(
+                        dir=path.parent, prefix=f".{path.name}-", suffix=".old"
+                    )
+                )
+                os.rmdir(old_path)
+                os.replace(path, old_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if old_path is not None and old_path.exists() and not path.exists():
+                os.replace(old_path, path)
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        if old_path is not None:
+            # geopende memory maps van de oude kubus blijven geldig
+            shutil.rmtree(old_path, ignore_errors=True)
+
+    @classmethod
+    def open(cls, path: str | Path, memory_map: bool = True) -> "WaveDataCube":
+        """Opent een opgeslagen kubus, standaard via memory mapping"""
+        path = Path(path)
+        if not (path / "values.npy").exists():
+            raise UserWarning(f"Geen golfdata kubus gevonden in {path}.")
+        mmap_mode = "r" if memory_map else None
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in WAVEDATA_CUBE_ARRAYS
+        }
+        # de assen zijn klein, deze altijd inlezen
+        for name in WAVEDATA_CUBE_ARRAYS[1:]:
+            arrays[name] = np.asarray(arrays[name])
+        return cls(**arrays)
+
+    def select(self, hr_locid: int) -> WaveDataCubeLocation:
+        """Geeft de golfcondities van een locatie, zonder kopie van de data"""
+        if hr_locid not in self:
+            raise UserWarning(f"Locatie {hr_locid} niet gevonden in de golfdata kubus.")
+        index = self._location_index[int(hr_locid)]
+        n_ws, n_wd, n_wl = (int(size) for size in self.sizes[index])
+        return WaveDataCubeLocation(
+            hr_locid=int(hr_locid),
+            waveval_type=self.waveval_type,
+            windspeed=self.windspeed[index, :n_ws],
+            winddir=self.winddir[index, :n_wd],
+            waterlevel=self.waterlevel[index, :n_wl],
+            values=self.values[index, :, :n_ws, :n_wd, :n_wl],
+        )
+
+
+_opened_cubes: dict[Path, tuple[tuple, WaveDataCube]] = {}
+
+
+def _cube_signature(path: Path) -> tuple | None:
+    """Wijzigingstijd en grootte van alle bestanden van de kubus"""
+    try:
+        return tuple(
+            (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            for stat in ((path / f"{name}.npy").stat() for name in WAVEDATA_CUBE_ARRAYS)
+        )
+    except FileNotFoundError:
+        return None
+
+
+def open_wavedata_cube(path: str | Path) -> WaveDataCube:
+    """Opent een kubus eenmalig per proces, opnieuw als een van de bestanden is gewijzigd"""
+    path = Path(path).resolve()
+    signature = _cube_signature(path)
+    opened = _opened_cubes.get(path)
+    if opened is not None and signature is not None and opened[0] == signature:
+        return opened[1]
+    cube = WaveDataCube.open(path)
+    _opened_cubes[path] = (signature, cube)
+    return cube
+
+
+def input_wavedata_cube(input_config: dict) -> WaveDataCube | WaveDataCubeLocation:
+    """Opent een golfdata kubus (zie `output_wavedata_cube`) gegeven een pad
+
+    Notes:
+    ------
+    De kubus wordt lazy via memory mapping geopend en binnen een proces hergebruikt.
+    In tegenstelling tot de andere adapters wordt geen DataFrame teruggegeven, maar de
+    kubus of de golfcondities van een locatie. Deze kunnen direct in een `WaveDataProvider`
+    worden gebruikt.
+
+    Options in input_config:
+    ------------------------
+    hr_locid: int
+        Optioneel, geef alleen de golfcondities van deze locatie terug
+
+    Returns:
+    --------
+    WaveDataCube | WaveDataCubeLocation
+    """
+    cube = open_wavedata_cube(input_config["abs_path"])
+    hr_locid = input_config.get("hr_locid", None)
+    if hr_locid is None:
+        return cube
+    return cube.select(hr_locid)
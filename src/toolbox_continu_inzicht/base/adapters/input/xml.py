@@ -1,74 +1,163 @@
-import pandas as pd
-import xml.etree.ElementTree as ET
+from collections.abc import Iterator
 import datetime
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+PI_NAMESPACE = "{http://www.wldelft.nl/fews/PI}"
 
 
-def input_xml_timeseries(input_config: dict) -> pd.DataFrame:
-    """Schrijft een XML-bestand in gegeven een pad
+def input_xml_timeseries(input_config: dict) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """Leest een FEWS PI-XML tijdreeksen bestand in gegeven een pad
 
     Notes:
     ------
     Gebruikt een custom XML-formaat dat compatibel is met FEWS.
+    Het bestand wordt met `iterparse` doorlopen, verwerkte elementen worden direct
+    opgeruimd. Datums en waardes worden verzameld en in één keer omgezet, de id's van
+    locaties en parameters worden per unieke waarde bepaald.
+
+    Options in input_config:
+    ------------------------
+    chunksize: int
+        Optioneel, lees het bestand in blokken van `chunksize` events.
+        In dat geval wordt een iterator met DataFrames teruggegeven.
 
     Returns:
     --------
-    None
+    pd.Dataframe | Iterator[pd.DataFrame]
     """
     # Data checks worden gedaan in de functies zelf, hier alleen geladen
     path = input_config["abs_path"]
+    chunksize = input_config.get("chunksize", None)
+    if chunksize is None:
+        return next(_iterate_xml_timeseries(path, chunksize=None))
+    return _iterate_xml_timeseries(path, chunksize=int(chunksize))
 
-    tree = ET.parse(path)
-    root = tree.getroot()
 
-    namespace = {"ns": "http://www.wldelft.nl/fews/PI"}
-
-    tz_element = root.find("ns:timeZone", namespace)
-    tz_offset = float(tz_element.text) if tz_element is not None else 0.0
-    tz = datetime.timezone(datetime.timedelta(hours=tz_offset))
-
-    df_list = []
-    for series in root.findall("ns:series", namespace):
-        header = series.find("ns:header", namespace)
-        station_name = header.find("ns:stationName", namespace).text
-        location = header.find("ns:locationId", namespace).text
-        parameter = header.find("ns:parameterId", namespace).text
-        unit = header.find("ns:units", namespace).text
-
-        if station_name != location:
-            if location is None or location == "":
-                location = station_name
-
-        for event in series.findall("ns:event", namespace):
-            date_str = event.get("date")
-            time_str = event.get("time")
-            value = event.get("value")
-
-            df_list.append(
-                {
-                    "date_time": pd.to_datetime(f"{date_str} {time_str}")
-                    .tz_localize(tz)
-                    .tz_convert("UTC"),
-                    "measurement_location_code": location,
-                    "parameter_code": parameter,
-                    "parameter_id": parameter,
-                    "unit": unit,
-                    "value": float(value),
-                }
-            )
+def _iterate_xml_timeseries(path, chunksize: int | None) -> Iterator[pd.DataFrame]:
+    """Doorloopt een PI-XML bestand en geeft de events in blokken van `chunksize` terug
 
-    df = pd.DataFrame(df_list)
-    if len(df) > 0:
-        for location in df["measurement_location_code"].unique():
-            df.loc[
-                df["measurement_location_code"] == location, "measurement_location_id"
-            ] = int(hash(location) % 10**7)
-        for parameter in df["parameter_code"].unique():
-            df.loc[df["parameter_code"] == parameter, "parameter_id"] = int(
-                hash(parameter) % 10**7
+    Zonder `chunksize` wordt een enkel DataFrame met alle events teruggegeven.
+    """
+    tz = datetime.timezone.utc
+    # id's per unieke locatie en parameter, gelijk over alle blokken
+    location_ids: dict[str, int] = {}
+    parameter_ids: dict[str, int] = {}
+    buffer = _XmlTimeseriesBuffer()
+    header = None
+
+    context = ET.iterparse(path, events=("start", "end"))
+    _, root = next(context)
+    for event, element in context:
+        if event == "start":
+            continue
+
+        tag = element.tag
+        if tag == f"{PI_NAMESPACE}event":
+            buffer.add_event(
+                element.get("date"), element.get("time"), element.get("value")
             )
-        df["measurement_location_id"] = df["measurement_location_id"].astype("int64")
-        df["parameter_id"] = df["parameter_id"].astype("int64")
-    return df
+            element.clear()
+            if chunksize is not None and len(buffer) >= chunksize:
+                yield buffer.to_dataframe(tz, location_ids, parameter_ids)
+                buffer = _XmlTimeseriesBuffer(header)
+        elif tag == f"{PI_NAMESPACE}header":
+            header = _read_header(element)
+            buffer.start_series(header)
+        elif tag == f"{PI_NAMESPACE}series":
+            # events en header zijn verwerkt
+            root.clear()
+        elif tag == f"{PI_NAMESPACE}timeZone":
+            tz_offset = float(element.text) if element.text is not None else 0.0
+            tz = datetime.timezone(datetime.timedelta(hours=tz_offset))
+
+    if chunksize is None or len(buffer) > 0:
+        yield buffer.to_dataframe(tz, location_ids, parameter_ids)
+
+
+def _read_header(header: ET.Element) -> tuple[str, str, str]:
+    """Geeft de locatie, parameter en eenheid uit de header van een reeks"""
+    station_name = header.find(f"{PI_NAMESPACE}stationName").text
+    location = header.find(f"{PI_NAMESPACE}locationId").text
+    parameter = header.find(f"{PI_NAMESPACE}parameterId").text
+    unit = header.find(f"{PI_NAMESPACE}units").text
+
+    if station_name != location:
+        if location is None or location == "":
+            location = station_name
+    return location, parameter, unit
+
+
+class _XmlTimeseriesBuffer:
+    """Verzamelt de events van een of meer reeksen als tekst, per reeks het aantal events"""
+
+    def __init__(self, header: tuple[str, str, str] | None = None):
+        self.dates: list[str] = []
+        self.times: list[str] = []
+        self.values: list[str] = []
+        self.headers: list[tuple[str, str, str]] = []
+        self.counts: list[int] = []
+        if header is not None:
+            self.start_series(header)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def start_series(self, header: tuple[str, str, str]) -> None:
+        self.headers.append(header)
+        self.counts.append(0)
+
+    def add_event(self, date: str, time: str, value: str) -> None:
+        self.dates.append(date)
+        self.times.append(time)
+        self.values.append(value)
+        self.counts[-1] += 1
+
+    def to_dataframe(
+        self,
+        tz: datetime.timezone,
+        location_ids: dict[str, int],
+        parameter_ids: dict[str, int],
+    ) -> pd.DataFrame:
+        if len(self) == 0:
+            return pd.DataFrame()
+
+        locations, parameters, units = (
+            np.array(column, dtype=object) for column in zip(*self.headers)
+        )
+        counts = np.array(self.counts)
+        for location in locations:
+            if location not in location_ids:
+                location_ids[location] = int(hash(location) % 10**7)
+        for parameter in parameters:
+            if parameter not in parameter_ids:
+                parameter_ids[parameter] = int(hash(parameter) % 10**7)
+
+        date_time = pd.to_datetime(
+            pd.Series(self.dates, dtype=object) + " " + pd.Series(self.times),
+            format="ISO8601",
+        )
+        parameter_codes = np.repeat(parameters, counts)
+        location_codes = np.repeat(locations, counts)
+        return pd.DataFrame(
+            {
+                "date_time": date_time.dt.tz_localize(tz).dt.tz_convert("UTC"),
+                "measurement_location_code": location_codes,
+                "parameter_code": parameter_codes,
+                "parameter_id": np.repeat(
+                    np.array([parameter_ids[p] for p in parameters], dtype="int64"),
+                    counts,
+                ),
+                "unit": np.repeat(units, counts),
+                "value": np.array(self.values, dtype=float),
+                "measurement_location_id": np.repeat(
+                    np.array([location_ids[loc] for loc in locations], dtype="int64"),
+                    counts,
+                ),
+            }
+        )
 
 
 def input_xml_calculation_parameters(input_config: dict) -> pd.DataFrame:
@@ -0,0 +1,185 @@
+import os
+from pathlib import Path
+import tempfile
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+
+def output_parquet(output_config: dict, df: pd.DataFrame):
+    """Schrijft een Parquet-bestand gegeven een pad
+
+    Notes:
+    ------
+    De datatypes blijven behouden, zodat bij het inlezen geen conversies nodig zijn.
+
+    Options in output_config:
+    -------------------------
+    index: bool
+        Schrijf de index van het DataFrame mee (standaard False)
+    compression: str
+        Compressie methode (standaard snappy)
+    row_group_size: int
+        Optioneel, maximaal aantal rijen per row-group.
+        Kleinere row-groups maken filteren bij het inlezen effectiever.
+    sort_by: str | list[str]
+        Optioneel, sorteer op deze kolom(men) voor het schrijven, zodat de
+        row-group statistieken beter aansluiten bij filters (bijv. section_id of date_time).
+
+    Returns:
+    --------
+    None
+    """
+    path = output_config["abs_path"]
+    table = _get_arrow_table(output_config, df)
+    pq.write_table(
+        table,
+        path,
+        compression=output_config.get("compression", "snappy"),
+        row_group_size=output_config.get("row_group_size", None),
+    )
+
+
+def output_feather(output_config: dict, df: pd.DataFrame):
+    """Schrijft een Arrow IPC (Feather) bestand gegeven een pad
+
+    Notes:
+    ------
+    Ongecomprimeerde bestanden (standaard) kunnen bij het inlezen zonder kopie
+    via memory mapping worden gebruikt.
+
+    Options in output_config:
+    -------------------------
+    index: bool
+        Schrijf de index van het DataFrame mee (standaard False)
+    compression: str
+        Compressie methode (standaard `uncompressed`, ook `lz4` of `zstd` mogelijk)
+    sort_by: str | list[str]
+        Optioneel, sorteer op deze kolom(men) voor het schrijven.
+
+    Returns:
+    --------
+    None
+    """
+    path = output_config["abs_path"]
+    table = _get_arrow_table(output_config, df)
+    feather.write_feather(
+        table,
+        path,
+        compression=output_config.get("compression", "uncompressed"),
+    )
+
+
+def output_parquet_dataset(output_config: dict, df: pd.DataFrame):
+    """Schrijft een Parquet dataset, gepartitioneerd op datum van de rekentijd (hive-stijl)
+
+    Notes:
+    ------
+    Elke run wordt als apart bestand in de map `calc_date=JJJJ-MM-DD` (en eventueel
+    extra partitiemappen) geschreven. Het bestand wordt eerst onder een tijdelijke naam
+    geschreven en daarna hernoemd, zodat lezers nooit een half geschreven bestand zien.
+    Opnieuw wegschrijven met dezelfde rekentijd vervangt de resultaten van die rekentijd.
+    Bestanden van andere rekentijden op dezelfde datum blijven standaard staan, met de optie
+    `overwrite_partitions` worden deze verwijderd.
+
+    Options in output_config:
+    -------------------------
+    partition_cols: list[str]
+        Optioneel, extra kolommen om op te partitioneren (bijv. section_id, failuremechanism_id)
+    calc_time: str | datetime
+        Optioneel, rekentijd om op te partitioneren. Als het DataFrame een kolom `calc_time`
+        heeft wordt die gebruikt, anders deze optie en anders de `calc_time` uit de GlobalVariables.
+    compression: str
+        Compressie methode (standaard snappy)
+    sort_by: str | list[str]
+        Optioneel, sorteer op deze kolom(men) voor het schrijven.
+    overwrite_partitions: bool
+        Optioneel, verwijder na het schrijven de bestanden van eerdere rekentijden uit de
+        geschreven partities (standaard False).
+
+    Returns:
+    --------
+    None
+    """
+    root_path = Path(output_config["abs_path"])
+    partition_cols = list(output_config.get("partition_cols", []))
+    missing_columns = set(partition_cols) - set(df.columns)
+    if len(missing_columns) > 0:
+        raise UserWarning(
+            f"Partitie kolom(men) {sorted(missing_columns)} niet gevonden in het DataFrame."
+        )
+
+    df = df.copy()
+    if "calc_time" not in df.columns:
+        calc_time = output_config.get(
+            "calc_time", output_config.get("global_calc_time")
+        )
+        if calc_time is None:
+            raise UserWarning(
+                "Geen rekentijd gevonden: geef een kolom `calc_time`, de optie `calc_time` of de GlobalVariable `calc_time` op."
+            )
+        df["calc_time"] = pd.Timestamp(calc_time)
+    df["calc_time"] = pd.to_datetime(df["calc_time"])
+    df["calc_date"] = df["calc_time"].dt.strftime("%Y-%m-%d")
+
+    for keys, df_partition in df.groupby(
+        ["calc_date"] + partition_cols, sort=False, dropna=False
+    ):
+        partition_dir = root_path.joinpath(
+            *[
+                f"{column}={_get_partition_value(value)}"
+                for column, value in zip(["calc_date"] + partition_cols, keys)
+            ]
+        )
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        df_partition = df_partition.drop(columns=["calc_date"] + partition_cols)
+        # per rekentijd een vast bestand, zodat herhalen van een run de resultaten vervangt
+        file_names = set()
+        for calc_time, df_calc_time in df_partition.groupby("calc_time", sort=False):
+            file_name = f"part-{pd.Timestamp(calc_time):%Y%m%dT%H%M%S}.parquet"
+            table = _get_arrow_table(output_config, df_calc_time)
+            _write_parquet_atomic(
+                table,
+                partition_dir / file_name,
+                compression=output_config.get("compression", "snappy"),
+            )
+            file_names.add(file_name)
+
+        # pas na het schrijven opruimen, zodat de partitie nooit leeg is
+        if output_config.get("overwrite_partitions", False):
+            for path in partition_dir.glob("part-*.parquet"):
+                if path.name not in file_names:
+                    path.unlink(missing_ok=True)
+
+
+def _get_partition_value(value) -> str:
+    """Zet een waarde om naar een (url-gecodeerde) hive partitie waarde"""
+    if pd.isna(value):
+        return "__HIVE_DEFAULT_PARTITION__"
+    return quote(str(value), safe="")
+
+
+def _write_parquet_atomic(table: pa.Table, path: Path, compression: str):
+    """Schrijft eerst naar een tijdelijk (verborgen) bestand en hernoemt daarna"""
+    file_descriptor, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.stem}-", suffix=".tmp"
+    )
+    os.close(file_descriptor)
+    try:
+        pq.write_table(table, tmp_path, compression=compression)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _get_arrow_table(output_config: dict, df: pd.DataFrame) -> pa.Table:
+    """Zet het DataFrame om naar een Arrow tabel, eventueel gesorteerd"""
+    sort_by = output_config.get("sort_by", None)
+    if sort_by is not None:
+        df = df.sort_values(sort_by, kind="stable")
+    return pa.Table.from_pandas(df, preserve_index=output_config.get("index", False))
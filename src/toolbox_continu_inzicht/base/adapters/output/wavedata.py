@@ -0,0 +1,21 @@
+import pandas as pd
+
+from toolbox_continu_inzicht.base.adapters.input.wavedata.cube_wavedata import (
+    WaveDataCube,
+)
+
+
+def output_wavedata_cube(output_config: dict, df: pd.DataFrame):
+    """Zet golfdata om naar een dichte kubus en slaat deze op als map met `.npy` bestanden
+
+    Notes:
+    ------
+    Het DataFrame is de samengevoegde golfdata (waveval_id en waveval), met de kolommen
+    hr_locid, waveval_type, windspeed, winddir, waterlevel en waveval.
+    De kubus kan met het type `wavedata_cube` weer worden ingelezen.
+
+    Returns:
+    --------
+    None
+    """
+    WaveDataCube.from_long_dataframe(df).save(output_config["abs_path"])
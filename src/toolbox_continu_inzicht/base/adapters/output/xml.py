@@ -1,5 +1,12 @@
+import os
+import tempfile
+
+import numpy as np
 import pandas as pd
 
+# Aantal events dat per keer naar het bestand wordt geschreven
+XML_EVENT_BLOCK_SIZE = 100_000
+
 
 def output_xml_timeseries(output_config: dict, df: pd.DataFrame):
     """Schrijft een XML-bestand in gegeven een pad
@@ -10,6 +17,8 @@ def output_xml_timeseries(output_config: dict, df: pd.DataFrame):
     Gaat uit van een tijdreeks met de volgende kolommen: 'date_time', 'measurement_location_code', 'parameter_code', 'value', 'unit'.
     Opties om dit aan te passen kunnen worden meegegeven in het configuratiebestand.
     Er kan ook een parameter_mapping worden meegegeven in het configuratiebestand om parameter_codes te mappen naar andere waarden.
+    De reeksen worden per locatie in blokken van events geformatteerd en naar het
+    bestand geschreven, zodat het geheugengebruik niet met de lengte van de reeks groeit.
 
     Returns:
     --------
@@ -17,9 +26,6 @@ def output_xml_timeseries(output_config: dict, df: pd.DataFrame):
     """
     # Data checks worden gedaan in de functies zelf, hier alleen geladen
     path = output_config["abs_path"]
-    output_xml_str = """<?xml version="1.0" encoding="UTF-8"?>
-<TimeSeries xmlns="http://www.wldelft.nl/fews/PI" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://www.wldelft.nl/fews/PI https://fewsdocs.deltares.nl/schemas/version1.0/pi-schemas/pi_timeseries.xsd" version="1.2">
-	<timeZone>1.0</timeZone>\n"""
     df.reset_index(inplace=True)  # some case datetime is the index
     assert "date_time" in df.columns, "DataFrame moet een 'date_time' kolom bevatten"
     assert "measurement_location_code" in df.columns, (
@@ -43,47 +49,113 @@ def output_xml_timeseries(output_config: dict, df: pd.DataFrame):
             .fillna(df["measurement_location_code"])
         )
 
-    for location in df["measurement_location_code"].unique():
-        df_subset = df[df["measurement_location_code"] == location]
-        # Extract date and time components for XML formatting
-        start_date = df_subset["date_time"].min()
-        end_date = df_subset["date_time"].max()
-
-        # Create XML for this location
-        # Calculate time delta to determine timeStep multiplier
-        if len(df_subset) > 1:
-            time_delta = (
-                df_subset["date_time"].iloc[1] - df_subset["date_time"].iloc[0]
-            ).total_seconds()
-            multiplier = int(time_delta)
-        else:
-            multiplier = 3600  # default to 1 hour if only one record
-
-        xml_output = f"""    <series>
+    date_time = df["date_time"]
+    value = df["value"]
+
+    # rijen per locatie, in volgorde van voorkomen
+    location_codes, locations = pd.factorize(
+        df["measurement_location_code"], use_na_sentinel=False
+    )
+    order = np.argsort(location_codes, kind="stable")
+    bounds = np.searchsorted(location_codes[order], np.arange(len(locations) + 1))
+
+    # eerst onder een tijdelijke naam, zodat bij een fout geen half bestand achterblijft
+    file_descriptor, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=f".{os.path.basename(path)}-",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(file_descriptor, "w") as f:
+            f.write(
+                """<?xml version="1.0" encoding="UTF-8"?>
+<TimeSeries xmlns="http://www.wldelft.nl/fews/PI" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://www.wldelft.nl/fews/PI https://fewsdocs.deltares.nl/schemas/version1.0/pi-schemas/pi_timeseries.xsd" version="1.2">
+	<timeZone>1.0</timeZone>\n"""
+            )
+            for i, location in enumerate(locations):
+                rows = order[bounds[i] : bounds[i + 1]]
+                f.write(_get_series_header(df, date_time, location, rows))
+                # Add events
+                for start in range(0, len(rows), XML_EVENT_BLOCK_SIZE):
+                    block = rows[start : start + XML_EVENT_BLOCK_SIZE]
+                    f.write(_format_events(date_time.iloc[block], value.iloc[block]))
+                f.write("\n    </series>\n")
+            f.write("</TimeSeries>")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _format_events(date_time: pd.Series, value: pd.Series) -> str:
+    """Formatteert een blok events, datum, tijd en waarde per kolom"""
+    dates, times = _format_date_time(date_time)
+    events = (
+        '\n        <event date="'
+        + dates
+        + '" time="'
+        + times
+        + '" value="'
+        + value.astype(str).to_numpy(dtype=object)
+        + '" flag="0"/>'
+    )
+    return "".join(events)
+
+
+def _format_date_time(date_time: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Formatteert de datum en tijd (in de tijdzone van de kolom) van een blok events"""
+    if date_time.dt.tz is not None:
+        date_time = date_time.dt.tz_localize(None)
+    if (
+        date_time.isna().any()
+        or date_time.min().year < 1000
+        or date_time.max().year > 9999
+    ):
+        # afwijkende datums (bijv. NaT), zoals bij strftime per event
+        return (
+            date_time.dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+            date_time.dt.strftime("%H:%M:%S").to_numpy(dtype=object),
+        )
+
+    date_times = np.datetime_as_string(
+        date_time.to_numpy().astype("datetime64[s]"), unit="s"
+    ).astype("U19")
+    # 'JJJJ-MM-DDTHH:MM:SS' splitsen in datum en tijd
+    characters = date_times.view("U1").reshape(-1, 19)
+    dates = np.ascontiguousarray(characters[:, :10]).view("U10").ravel()
+    times = np.ascontiguousarray(characters[:, 11:]).view("U8").ravel()
+    return dates.astype(object), times.astype(object)
+
+
+def _get_series_header(
+    df: pd.DataFrame, date_time: pd.Series, location, rows: np.ndarray
+) -> str:
+    """Geeft het begin van een reeks (tot en met de header) van een locatie"""
+    # Extract date and time components for XML formatting
+    start_date = date_time.iloc[rows].min()
+    end_date = date_time.iloc[rows].max()
+
+    # Calculate time delta to determine timeStep multiplier
+    if len(rows) > 1:
+        time_delta = (date_time.iloc[rows[1]] - date_time.iloc[rows[0]]).total_seconds()
+        multiplier = int(time_delta)
+    else:
+        multiplier = 3600  # default to 1 hour if only one record
+
+    return f"""    <series>
         <header>
             <type>instantaneous</type>
             <locationId>{location}</locationId>
-            <parameterId>{df_subset["parameter_code"].iloc[0]}</parameterId>
+            <parameterId>{df["parameter_code"].iloc[rows[0]]}</parameterId>
             <timeStep unit="second" multiplier="{multiplier}"/>
             <startDate date="{start_date.strftime("%Y-%m-%d")}" time="{start_date.strftime("%H:%M:%S")}"/>
             <endDate date="{end_date.strftime("%Y-%m-%d")}" time="{end_date.strftime("%H:%M:%S")}"/>
             <missVal>-999.0</missVal>
             <stationName>{location}</stationName>
-            <units>{df_subset["unit"].iloc[0]}</units>
+            <units>{df["unit"].iloc[rows[0]]}</units>
         </header>"""
 
-        # Add events
-        for _, row in df_subset.iterrows():
-            dt = row["date_time"]
-            xml_output += f'\n        <event date="{dt.strftime("%Y-%m-%d")}" time="{dt.strftime("%H:%M:%S")}" value="{row["value"]}" flag="0"/>'
-
-        xml_output += "\n    </series>"
-        output_xml_str += xml_output + "\n"
-
-    output_xml_str += "</TimeSeries>"
-    with open(path, "w") as f:
-        f.write(output_xml_str)
-
 
 def output_xml_calculation_parameters(output_config: dict, df) -> None:
     """writes an XML calculation parameters file given the dataframe
@@ -1,3 +1,4 @@
+import dataclasses
 import functools
 from abc import ABC, abstractmethod
 
@@ -16,6 +17,28 @@ class ToolboxBase(ABC):
         if hasattr(cls, "run"):
             cls.run = ToolboxBase.log_exceptions(getattr(cls, "run"))
 
+    @classmethod
+    def _construct(cls, **values):
+        """Maakt een instantie aan zonder pydantic validatie
+
+        Alleen bedoeld voor intern gebruik met vertrouwde waardes, zoals NumPy arrays die
+        de toolbox zelf heeft aangemaakt. Velden die niet worden meegegeven krijgen hun
+        standaardwaarde. Bij het aanmaken via de constructor wordt wel gevalideerd.
+        """
+        instance = cls.__new__(cls)
+        defaults, default_factories, required = _get_field_defaults(cls)
+        missing = required - values.keys()
+        if len(missing) > 0:
+            raise TypeError(
+                f"{cls.__name__} mist verplichte velden: {', '.join(sorted(missing))}"
+            )
+        instance.__dict__.update(defaults)
+        for name, default_factory in default_factories.items():
+            if name not in values:
+                instance.__dict__[name] = default_factory()
+        instance.__dict__.update(values)
+        return instance
+
     @staticmethod
     def log_exceptions(method):
         """Stuurt exceptions eerst naar de logger van de DataAdapter"""
@@ -38,3 +61,19 @@ class ToolboxBase(ABC):
     def run(self):
         """De run methode moet altijd gedefinieerd worden in een subclass"""
         pass
+
+
+@functools.cache
+def _get_field_defaults(cls) -> tuple[dict, dict, frozenset]:
+    """Standaardwaardes, default factories en verplichte velden van een dataclass"""
+    defaults = {}
+    default_factories = {}
+    required = set()
+    for field in dataclasses.fields(cls):
+        if field.default is not dataclasses.MISSING:
+            defaults[field.name] = field.default
+        elif field.default_factory is not dataclasses.MISSING:
+            default_factories[field.name] = field.default_factory
+        else:
+            required.add(field.name)
+    return defaults, default_factories, frozenset(required)
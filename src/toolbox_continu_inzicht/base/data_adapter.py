@@ -7,7 +7,7 @@ import os
 import logging
 
 import warnings
-from typing import Any, Optional, Dict
+from typing import Any, Iterator, Optional, Dict
 
 from dotenv import load_dotenv, dotenv_values
 from toolbox_continu_inzicht.base.config import Config
@@ -132,19 +132,25 @@ class DataAdapter(PydanticBaseModel):
             # Maar je wilt er vanuit de functies ook bij kunnen
             self.config.global_variables.update(environmental_variables)
 
+            # Het schema is ook beschikbaar voor de adapters (bijv. datatypes bij het inlezen)
+            function_input_config["input_schema"] = schema
+
             # Roep de bijbehorende functie bij het datatype aan en geef het input pad mee.
             if data_type in self.input_types:
                 corresponding_function = self.input_types[data_type]
                 df = corresponding_function(function_input_config)
 
-                # Controleer of er data is opgehaald.
-                if len(df) == 0:
+                # Controleer of er data is opgehaald, iterators (bijv. blokken) worden niet gecontroleerd.
+                if hasattr(df, "__len__") and len(df) == 0:
                     msg = f"Ophalen van gegevens van {input} heeft niets opgeleverd."
                     self.logger.warning(msg)
                     raise UserWarning(msg)
 
                 # Als schema is meegegeven, controleer of de data aan het schema voldoet.
-                if schema is not None:
+                if schema is not None and isinstance(df, Iterator):
+                    # blokken worden bij het doorlopen gecontroleerd
+                    df = self._validate_chunks(df, schema)
+                elif schema is not None:
                     status, message = validate_dataframe(df=df, schema=schema)
                     if status > 0:
                         raise UserWarning(message)
@@ -160,6 +166,17 @@ class DataAdapter(PydanticBaseModel):
 
         return df
 
+    @staticmethod
+    def _validate_chunks(
+        chunks: Iterator[pd.DataFrame], schema: Dict
+    ) -> Iterator[pd.DataFrame]:
+        """Controleert elk blok van een iterator met DataFrames op het schema"""
+        for df_chunk in chunks:
+            status, message = validate_dataframe(df=df_chunk, schema=schema)
+            if status > 0:
+                raise UserWarning(message)
+            yield df_chunk
+
     def output(self, output: str, df: pd.DataFrame) -> None:
         """Gegeven de config, stuurt de juiste inputwaarde aan
 
@@ -206,6 +223,11 @@ class DataAdapter(PydanticBaseModel):
         # voeg alle environmental variables toe aan de functie output config
         functie_output_config.update(environmental_variables)
 
+        # de rekentijd is ook beschikbaar voor de data adapters (bijv. om op te partitioneren)
+        functie_output_config["global_calc_time"] = self.config.global_variables.get(
+            "calc_time"
+        )
+
         # Roep de bijbehorende functie bij het datatype aan en geef het input pad mee.
         bijbehorende_functie = self.output_types[data_type]
         bijbehorende_functie(functie_output_config, df)
@@ -4,7 +4,7 @@ import pandas as pd
 from pydantic.dataclasses import dataclass
 
 from toolbox_continu_inzicht import ToolboxBase, DataAdapter
-from toolbox_continu_inzicht.utils.interpolate import log_x_interpolate_1d
+from toolbox_continu_inzicht.utils.interpolate import InterpolationPlan
 
 
 @dataclass(config={"arbitrary_types_allowed": True})
@@ -21,6 +21,8 @@ class ExceedanceFrequencyCurve(ToolboxBase):
         DataFrame met de overschrijdingsfrequentiecurve
     lower_limit: float
         Ondergrens voor de overschrijdingsfrequentie, standaard 1e-200
+    interpolation_plan: Optional[InterpolationPlan] | None
+        Laatst gebruikte interpolatie, wordt hergebruikt bij het opnieuw verfijnen op dezelfde waterstanden
     exceedance_frequency_curve_schema: ClassVar[dict[str, str]]
         Schema waaraan de overschrijdingsfrequentiecurve moet voldoen: {hydraulicload: float, probability_exceedance: float}
     """
@@ -28,6 +30,7 @@ class ExceedanceFrequencyCurve(ToolboxBase):
     data_adapter: DataAdapter
     df_out: Optional[pd.DataFrame] | None = None
     lower_limit: float = 1e-200
+    interpolation_plan: Optional[InterpolationPlan] | None = None
     exceedance_frequency_curve_schema: ClassVar[dict[str, str]] = {
         "hydraulicload": float,
         "probability_exceedance": float,
@@ -49,6 +52,14 @@ class ExceedanceFrequencyCurve(ToolboxBase):
         arr = self.df_out[["hydraulicload", "probability_exceedance"]].to_numpy()
         return arr
 
+    def copy(self):
+        """Maak een kopie van de overschrijdingsfrequentielijn
+
+        Het DataFrame wordt gedeeld met het origineel (copy-on-write): de methodes
+        vervangen `df_out` in plaats van het aan te passen.
+        """
+        return self._construct(**self.__dict__)
+
     def load(self, input: str):
         """Laad een overschrijdingsfrequentielijn in"""
         self.df_out = self.data_adapter.input(
@@ -57,12 +68,17 @@ class ExceedanceFrequencyCurve(ToolboxBase):
 
     def refine(self, hydraulicload):
         """Interpoleer de overschrijdingsfrequentielijn op de gegeven waterstanden"""
+        hydraulicload_curve = self.df_out["hydraulicload"].to_numpy()
+        if self.interpolation_plan is None or not self.interpolation_plan.matches(
+            hydraulicload, hydraulicload_curve
+        ):
+            self.interpolation_plan = InterpolationPlan(
+                hydraulicload, hydraulicload_curve
+            )
         df_new = pd.DataFrame(
             {
                 "hydraulicload": hydraulicload,
-                "probability_exceedance": log_x_interpolate_1d(
-                    hydraulicload,
-                    self.df_out["hydraulicload"].to_numpy(),
+                "probability_exceedance": self.interpolation_plan.log_x_interpolate_1d(
                     self.df_out["probability_exceedance"].to_numpy(),
                     ll=self.lower_limit,
                     clip01=True,
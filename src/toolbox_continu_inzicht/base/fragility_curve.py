@@ -7,10 +7,11 @@ from pydantic.dataclasses import dataclass
 
 from toolbox_continu_inzicht import ToolboxBase, DataAdapter
 from toolbox_continu_inzicht.utils.interpolate import (
+    InterpolationPlan,
+    grouped_x_interpolate_1d,
     log_y_interpolate_1d,
     log_x_interpolate_1d,
 )
-from pydantic import TypeAdapter
 
 
 @dataclass(config={"arbitrary_types_allowed": True})
@@ -134,12 +135,12 @@ class FragilityCurve(ToolboxBase):
             self.shift(effect=effect)
 
     def copy(self):
-        """Maak een kopie van de fragility curve"""
-        # Get all field values as dict and create new instance
-        adapter = TypeAdapter(FragilityCurve)
-        data = adapter.dump_python(self, exclude={"data_adapter"})
-        new_curve = FragilityCurve(data_adapter=self.data_adapter, **data)
-        return new_curve
+        """Maak een kopie van de fragility curve
+
+        De arrays worden gedeeld met het origineel (copy-on-write): de methodes van
+        FragilityCurve passen arrays niet aan, maar vervangen ze door nieuwe arrays.
+        """
+        return self._construct(**self.__dict__)
 
     def shift(self, effect: float):
         """Schuift de hydraulische belasting van de fragility curve op om
@@ -158,6 +159,61 @@ class FragilityCurve(ToolboxBase):
             x, xp, fp, ll=self.lower_limit, clip01=True
         )
 
+    def shift_many(self, effects: np.ndarray | list[float]) -> np.ndarray:
+        """Verschuift de fragility curve voor meerdere effecten tegelijk, zie `shift`
+
+        De curve zelf wordt niet aangepast. Alle verschuivingen worden in een keer
+        geinterpoleerd; per effect is het resultaat gelijk aan `shift`.
+
+        Parameters
+        ----------
+        effects : np.ndarray | list[float]
+            Verschuivingen van de hydraulische belasting
+
+        Returns
+        -------
+        np.ndarray
+            Faalkansen met vorm (aantal effecten, aantal punten), op de hydraulische
+            belastingen van de curve
+        """
+        effects = np.atleast_1d(np.asarray(effects, dtype=float))
+        x = self.hydraulicload
+        fp = self.failure_probability
+        n_points = len(x)
+        failure_probabilities = np.tile(fp, (len(effects), 1)).astype(float)
+
+        # bij effect 0 blijft de curve ongewijzigd, net als bij shift
+        shifted = np.nonzero(effects != 0.0)[0]
+        if len(shifted) == 0:
+            return failure_probabilities
+
+        # elke verschuiving is een eigen groep met xp = x + effect
+        groups = np.repeat(np.arange(len(shifted)), n_points)
+        failure_probabilities[shifted] = grouped_x_interpolate_1d(
+            np.tile(x, len(shifted)),
+            groups,
+            (x[None, :] + effects[shifted, None]).ravel(),
+            np.tile(fp, len(shifted)),
+            groups,
+            interp_func=self.interp_x_func,
+            ll=self.lower_limit,
+            clip01=True,
+        ).reshape(len(shifted), n_points)
+        return failure_probabilities
+
+    def as_shifted_dataframe(self, effects: np.ndarray | list[float]) -> pd.DataFrame:
+        """Geef de verschoven curves (zie `shift_many`) terug als lange tabel met de kolommen
+        effect, hydraulicload en failure_probability"""
+        effects = np.atleast_1d(np.asarray(effects, dtype=float))
+        failure_probabilities = self.shift_many(effects)
+        return pd.DataFrame(
+            {
+                "effect": np.repeat(effects, len(self.hydraulicload)),
+                "hydraulicload": np.tile(self.hydraulicload, len(effects)),
+                "failure_probability": failure_probabilities.ravel(),
+            }
+        )
+
     def check_monotonic_curve(self):
         """Forceert monotoon stijgende faalkansen"""
         if self.enforce_monotonic:
@@ -183,16 +239,77 @@ class FragilityCurve(ToolboxBase):
         self,
         new_hydraulicload: np.ndarray | list[float] | float,
         add_steps: bool = True,
+        plan: InterpolationPlan | None = None,
     ):
-        """Interpoleert de fragility curve op de gegeven waterstanden"""
-        new_failure_probability = self.interp_x_func(
-            new_hydraulicload,
-            self.hydraulicload,
-            self.failure_probability,
-            ll=self.lower_limit,
-            clip01=True,
-        )
+        """Interpoleert de fragility curve op de gegeven waterstanden
+
+        Een `InterpolationPlan` voor (new_hydraulicload, hydraulicload) kan worden meegegeven
+        om de indices en fracties te hergebruiken, zie ook `refine_many`.
+        """
+        if plan is not None and plan.matches(new_hydraulicload, self.hydraulicload):
+            new_failure_probability = plan.apply_interp_func(
+                self.interp_x_func,
+                self.failure_probability,
+                ll=self.lower_limit,
+                clip01=True,
+            )
+        else:
+            new_failure_probability = self.interp_x_func(
+                new_hydraulicload,
+                self.hydraulicload,
+                self.failure_probability,
+                ll=self.lower_limit,
+                clip01=True,
+            )
+        self._set_refined_curve(new_hydraulicload, new_failure_probability, add_steps)
 
+    @staticmethod
+    def refine_many(
+        fragility_curves: list["FragilityCurve"],
+        new_hydraulicload: np.ndarray | list[float],
+        add_steps: bool = True,
+    ):
+        """Interpoleert meerdere fragility curves op dezelfde waterstanden
+
+        Curves met dezelfde hydraulische belastingen (en interpolatiefunctie) worden met een
+        gedeeld `InterpolationPlan` in een keer geinterpoleerd.
+        """
+        new_hydraulicload = np.asarray(new_hydraulicload)
+        groups: dict[tuple, list[FragilityCurve]] = {}
+        for fragility_curve in fragility_curves:
+            hydraulicload = fragility_curve.hydraulicload
+            key = (
+                hydraulicload.shape,
+                hydraulicload.dtype.str,
+                hydraulicload.tobytes(),
+                fragility_curve.interp_x_func,
+                fragility_curve.lower_limit,
+            )
+            groups.setdefault(key, []).append(fragility_curve)
+
+        for group in groups.values():
+            first = group[0]
+            plan = InterpolationPlan(new_hydraulicload, first.hydraulicload)
+            new_failure_probabilities = plan.apply_interp_func(
+                first.interp_x_func,
+                np.vstack([curve.failure_probability for curve in group]),
+                ll=first.lower_limit,
+                clip01=True,
+            )
+            for fragility_curve, new_failure_probability in zip(
+                group, new_failure_probabilities
+            ):
+                fragility_curve._set_refined_curve(
+                    new_hydraulicload, new_failure_probability, add_steps
+                )
+
+    def _set_refined_curve(
+        self,
+        new_hydraulicload: np.ndarray,
+        new_failure_probability: np.ndarray,
+        add_steps: bool,
+    ):
+        """Zet de geinterpoleerde curve, eventueel aangevuld met de sprongen uit de huidige curve"""
         if add_steps:
             idxs = self.find_jump_indices()
             if len(idxs) > 0:
@@ -227,7 +344,8 @@ class FragilityCurve(ToolboxBase):
             by default 1
         """
         wl_grid = self.hydraulicload
-        fp_grid = self.failure_probability
+        # Kopie, de array kan gedeeld worden met een kopie van deze curve
+        fp_grid = self.failure_probability.copy()
 
         sel_update = wl_grid < update_level
         wl_steps = np.diff(wl_grid[sel_update])
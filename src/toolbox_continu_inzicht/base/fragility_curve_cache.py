@@ -0,0 +1,256 @@
+"""
+Cache op schijf voor berekende fragility curves
+
+De berekening van fragility curves voor golfoverslag en piping is duur, terwijl de input
+(profiel, hellingen, bodemhoogtes, grondparameters en opties) tussen twee runs meestal niet
+verandert. De cache gebruikt een hash van de (genormaliseerde) input als sleutel en slaat de
+resultaten op als `.npz` bestand. Bij een hit wordt de berekening overgeslagen.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from toolbox_continu_inzicht.base.adapters.data_adapter_utils import check_rootdir
+from toolbox_continu_inzicht.base.data_adapter import DataAdapter
+
+# Verhoog bij een wijziging in de berekening, zodat oude resultaten niet meer gebruikt worden
+CACHE_VERSION = 1
+
+# Opties die geen invloed hebben op het resultaat en dus niet in de sleutel komen
+CACHE_IGNORED_OPTIONS = {"cache_dir", "cache_max_size_mb", "progress", "debug"}
+
+
+class FragilityCurveCache:
+    """
+    Least recently used (LRU) cache op schijf voor berekende fragility curves
+
+    Elke entry is een `.npz` bestand met een of meer NumPy arrays. Bij een hit wordt de
+    wijzigingstijd van het bestand bijgewerkt; als de totale grootte boven `max_size_mb`
+    komt, worden de langst niet gebruikte bestanden verwijderd.
+
+    Parameters
+    ----------
+    cache_dir : Path
+        Map waarin de cache wordt opgeslagen
+    max_size_mb : float
+        Maximale grootte van de cache in MB, standaard 500
+    """
+
+    def __init__(self, cache_dir: Path, max_size_mb: float = 500.0):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_mb = max_size_mb
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_inputs(
+        frames: list[pd.DataFrame | pd.Series | np.ndarray | None],
+        options: dict | None = None,
+        key_prefix: str = "",
+    ) -> str:
+        """Bepaalt de sleutel van een berekening op basis van de input
+
+        Parameters
+        ----------
+        frames : list[pd.DataFrame | pd.Series | np.ndarray | None]
+            Input van de berekening
+        options : dict | None
+            Opties van de berekening, opties uit `CACHE_IGNORED_OPTIONS` tellen niet mee
+        key_prefix : str
+            Naam van de berekening, zodat verschillende berekeningen niet dezelfde sleutel krijgen
+
+        Returns
+        -------
+        str
+            SHA-256 hash van de input
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{key_prefix}|{CACHE_VERSION}".encode())
+        for frame in frames:
+            digest.update(b"|")
+            _update_digest(digest, frame)
+
+        options = {
+            key: value
+            for key, value in (options or {}).items()
+            if key not in CACHE_IGNORED_OPTIONS
+        }
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        """Geeft de opgeslagen arrays terug, of None als de sleutel niet in de cache staat"""
+        path = self._get_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            os.utime(path)
+        except (OSError, ValueError):
+            # niet aanwezig, of een onleesbaar bestand: opnieuw berekenen
+            self.misses += 1
+            return None
+        self.hits += 1
+        return arrays
+
+    def put(self, key: str, arrays: dict[str, np.ndarray]) -> None:
+        """Slaat de arrays op onder de sleutel en verwijdert zo nodig oude entries"""
+        path = self._get_path(key)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        file_descriptor, tmp_path = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=f".{key}-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def _get_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def _evict(self) -> None:
+        """Verwijdert de langst niet gebruikte entries tot de cache binnen de maximale grootte valt"""
+        entries = []
+        for path in self.cache_dir.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        max_size = self.max_size_mb * 1024**2
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= max_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total_size -= size
+
+
+_caches: dict[Path, FragilityCurveCache] = {}
+
+
+def get_fragility_curve_cache(
+    data_adapter: DataAdapter, options: dict
+) -> FragilityCurveCache | None:
+    """Geeft de cache volgens de opties `cache_dir` en `cache_max_size_mb`, of None als er geen cache is ingesteld
+
+    Een relatieve `cache_dir` is ten opzichte van de rootdir. Binnen een proces wordt per map
+    dezelfde cache gebruikt, zodat het aantal hits en misses over alle berekeningen wordt bijgehouden.
+    """
+    cache_dir = options.get("cache_dir", None)
+    if cache_dir is None:
+        return None
+
+    cache_dir = resolve_cache_dir(data_adapter.config.global_variables, cache_dir)
+    cache = _caches.get(cache_dir)
+    if cache is None:
+        cache = FragilityCurveCache(cache_dir)
+        _caches[cache_dir] = cache
+    cache.max_size_mb = float(options.get("cache_max_size_mb", 500.0))
+    return cache
+
+
+def resolve_cache_dir(global_variables: dict, cache_dir: str | Path) -> Path:
+    """Maakt een relatieve cache map absoluut ten opzichte van de rootdir"""
+    cache_dir = Path(cache_dir)
+    if not cache_dir.is_absolute():
+        root_dir = check_rootdir(global_variables)
+        if root_dir is not None:
+            cache_dir = root_dir / cache_dir
+    return cache_dir.resolve()
+
+
+def cached_calculation(
+    data_adapter: DataAdapter,
+    options: dict,
+    key_prefix: str,
+    frames: list[pd.DataFrame | pd.Series | np.ndarray | None],
+    calculate: Callable[[], dict[str, np.ndarray]],
+) -> dict[str, np.ndarray]:
+    """Voert de berekening uit, of haalt het resultaat uit de cache als deze is ingesteld
+
+    Parameters
+    ----------
+    data_adapter : DataAdapter
+        DataAdapter, voor de rootdir en de logger
+    options : dict
+        Opties van de berekening, inclusief `cache_dir` en `cache_max_size_mb`
+    key_prefix : str
+        Naam van de berekening
+    frames : list[pd.DataFrame | pd.Series | np.ndarray | None]
+        Input van de berekening
+    calculate : Callable[[], dict[str, np.ndarray]]
+        Functie die de berekening uitvoert en de resultaten als arrays teruggeeft
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Resultaten van de berekening
+    """
+    cache = get_fragility_curve_cache(data_adapter, options)
+    if cache is None:
+        return calculate()
+
+    key = cache.hash_inputs(frames, options=options, key_prefix=key_prefix)
+    arrays = cache.get(key)
+    status = "hit" if arrays is not None else "miss"
+    data_adapter.logger.info(
+        "FragilityCurveCache %s voor %s (%s): hits=%s, misses=%s",
+        status,
+        key_prefix,
+        key[:12],
+        cache.hits,
+        cache.misses,
+    )
+    if arrays is None:
+        arrays = calculate()
+        cache.put(key, arrays)
+    return arrays
+
+
+def _update_digest(digest, frame) -> None:
+    """Voegt een genormaliseerde representatie van de input toe aan de hash"""
+    if frame is None:
+        digest.update(b"None")
+        return
+
+    if isinstance(frame, np.ndarray):
+        array = np.ascontiguousarray(frame)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+        return
+
+    if isinstance(frame, pd.Series):
+        frame = frame.to_frame()
+
+    # een integer index is meestal een rijnummer uit een groter bestand en telt niet mee,
+    # een tekst index (zoals bij het profiel de parameters) wel
+    use_index = not pd.api.types.is_integer_dtype(frame.index)
+    frame = frame.reset_index(drop=not use_index)
+
+    digest.update(json.dumps([str(column) for column in frame.columns]).encode())
+    for column in frame.columns:
+        series = frame[column]
+        if series.dtype == object:
+            # gemengde kolommen (zoals de waardes van het profiel) als tekst vergelijken
+            series = series.astype(str)
+        digest.update(str(series.dtype).encode())
+        digest.update(
+            pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes()
+        )
@@ -1,14 +1,30 @@
+from pathlib import Path
 from pydantic.dataclasses import dataclass
 import pandas as pd
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
 from typing import Optional
 from toolbox_continu_inzicht.base.base_module import ToolboxBase
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon
+from toolbox_continu_inzicht.dam_live.plot_stage import (
+    draw_stage,
+    render_stage_figures,
+    split_stages,
+)
 
 
 @dataclass(config={"arbitrary_types_allowed": True})
 class CombineDamLiveResults(ToolboxBase):
+    """
+    Combineert de uit een .stix bestand ingelezen tabellen per stage.
+
+    Notes
+    -----
+    Het samenvoegen van de tabellen en het maken van figuren zijn gescheiden. Standaard
+    worden alleen de tabellen gemaakt en wordt matplotlib niet geladen. Met de optie
+    `plot: true` in de GlobalVariables (`CombineDamLiveResults`) wordt na het wegschrijven
+    per stage een figuur gemaakt in `figure_dir` (standaard `figures`, ten opzichte van de
+    rootdir), zie `render_stages` voor de overige opties.
+    """
+
     data_adapter: DataAdapter
 
     df_in: Optional[pd.DataFrame] | None = None
@@ -26,6 +42,7 @@ class CombineDamLiveResults(ToolboxBase):
             Lijst met namen van DataAdapter-inputs in de volgorde: [stages, geometries, soils, soillayers, waternets, calculationsettings].
         output: list[str]
             Lijst met namen van DataAdapter-outputs in de volgorde: [merged_soils, merged_waternet, merged_calculations].
+            Figuren worden alleen gemaakt met de optie `plot`.
 
         Raises
         ------
@@ -102,6 +119,20 @@ class CombineDamLiveResults(ToolboxBase):
         self.data_adapter.output(output[1], self.df_merged_waternet)
         self.data_adapter.output(output[2], self.df_merged_calculations)
 
+        options = self.data_adapter.config.global_variables.get(
+            "CombineDamLiveResults", {}
+        )
+        if options.get("plot", False):
+            self.render_stages(
+                output_dir=options.get("figure_dir", "figures"),
+                stage_ids=options.get("stage_ids", None),
+                xlim=options.get("xlim", None),
+                ylim=options.get("ylim", None),
+                figure_format=options.get("figure_format", "png"),
+                dpi=options.get("dpi", 100),
+                max_workers=options.get("max_workers", None),
+            )
+
     def merge_calculationsettings(self) -> pd.DataFrame:
         """
         Merge stages met calculationsettings op calculationsettings_id.
@@ -211,184 +242,76 @@ class CombineDamLiveResults(ToolboxBase):
 
         return df_merged
 
+    def render_stages(
+        self,
+        output_dir: str | Path = "figures",
+        stage_ids: Optional[list[str]] = None,
+        xlim: Optional[tuple[float, float]] = None,
+        ylim: Optional[tuple[float, float]] = None,
+        figure_format: str = "png",
+        dpi: int = 100,
+        max_workers: Optional[int] = None,
+    ) -> list[Path]:
+        """
+        Schrijft per stage een figuur weg, na `run`. De figuren worden met het
+        niet-interactieve Agg backend in een process pool gemaakt.
+
+        Parameters
+        ----------
+        output_dir: str | Path
+            Map voor de figuren, een relatief pad is ten opzichte van de rootdir
+        stage_ids: Optional[list[str]]
+            Optioneel, alleen deze stages, standaard alle stages
+        xlim, ylim: Optional[tuple[float, float]]
+            Optioneel, bereik van de assen
+        figure_format: str
+            Bestandsformaat (standaard png)
+        dpi: int
+            Resolutie van de figuren
+        max_workers: Optional[int]
+            Maximaal aantal processen, met 1 worden de figuren in het huidige proces gemaakt
+
+        Returns
+        -------
+        list[Path]
+            Paden van de weggeschreven figuren
+        """
+        output_dir = Path(output_dir)
+        if not output_dir.is_absolute():
+            output_dir = (
+                Path(self.data_adapter.get_global_variable("used_root_dir"))
+                / output_dir
+            )
+
+        return render_stage_figures(
+            self.df_merged_soils,
+            self.df_merged_waternet,
+            self.df_merged_calculations,
+            output_dir=output_dir,
+            stage_ids=stage_ids,
+            xlim=None if xlim is None else tuple(xlim),
+            ylim=None if ylim is None else tuple(ylim),
+            figure_format=figure_format,
+            dpi=dpi,
+            max_workers=max_workers,
+        )
+
     def plot_stage(self, stage_id, xlim, ylim):
         """
         Plot de geometrie van een stage inclusief soils,
-        waterlijnen en glijcirkels.
+        waterlijnen en glijcirkels, voor interactief gebruik (zoals in een notebook).
         """
+        import matplotlib.pyplot as plt
 
         stage_id = str(stage_id)
-
-        df_stage_soils = self.df_merged_soils[
-            self.df_merged_soils["stage_id"] == stage_id
-        ]
-
-        df_stage_waternets = self.df_merged_waternet[
-            self.df_merged_waternet["stage_id"] == stage_id
-        ]
-
-        df_stage_calculations = self.df_merged_calculations[
-            self.df_merged_calculations["stage_id"] == stage_id
-        ]
-
-        if df_stage_soils.empty:
-            raise ValueError(f"Geen soil data gevonden voor stage {stage_id}")
+        frames = split_stages(
+            self.df_merged_soils,
+            self.df_merged_waternet,
+            self.df_merged_calculations,
+            [stage_id],
+        )[stage_id]
 
         fig, ax = plt.subplots(figsize=(15, 15))
-
-        # --------------------
-        # SOILS
-        # --------------------
-        plotted_soils = {}
-
-        for _, row in df_stage_soils.iterrows():
-            points = row["points"]
-            if not points:
-                continue
-
-            polygon_coords = [(p["X"], p["Z"]) for p in points]
-            if polygon_coords[0] != polygon_coords[-1]:
-                polygon_coords.append(polygon_coords[0])
-
-            color = row["color"]
-
-            poly = Polygon(
-                polygon_coords,
-                closed=True,
-                facecolor=color,
-                edgecolor="k",
-                alpha=1,
-            )
-            ax.add_patch(poly)
-
-            soil_name = row["name"]
-            if soil_name not in plotted_soils:
-                plotted_soils[soil_name] = color
-
-        # --------------------
-        # WATERLIJNEN
-        # --------------------
-        plotted_lines = {}
-
-        for line_id, df_line in df_stage_waternets.groupby("line_id"):
-            xs = df_line["x"].tolist()
-            zs = df_line["z"].tolist()
-
-            line_label = df_line["line_label"].iloc[0]
-            color = df_line["color"].iloc[0]
-
-            ax.plot(xs, zs, color=color, linewidth=2)
-
-            if line_label not in plotted_lines:
-                plotted_lines[line_label] = color
-
-        # --------------------
-        # GLIJCIRKELS
-        # --------------------
-        # plotted_circles = {}
-
-        # for _, row in df_stage_calculations.iterrows():
-        #     if pd.notna(row.get("circle_center_x")) and pd.notna(
-        #         row.get("circle_radius")
-        #     ):
-        #         circle = Circle(
-        #             (row["circle_center_x"], row["circle_center_z"]),
-        #             row["circle_radius"],
-        #             edgecolor="red",
-        #             facecolor="none",
-        #             linewidth=2,
-        #             linestyle="--",
-        #         )
-        #         ax.add_patch(circle)
-
-        #         analysis_type = row["analysis_type"]
-        #         plotted_circles[analysis_type] = row["circle_radius"]
-
-        # --------------------
-        # GLIJCIRKELS (alleen middelpunt)
-        # --------------------
-        plotted_circles = {}
-
-        for _, row in df_stage_calculations.iterrows():
-            if pd.notna(row.get("circle_center_x")) and pd.notna(
-                row.get("circle_center_z")
-            ):
-                ax.plot(
-                    row["circle_center_x"],
-                    row["circle_center_z"],
-                    marker="o",
-                    color="red",
-                    markersize=6,
-                )
-
-                analysis_type = row["analysis_type"]
-                plotted_circles[analysis_type] = (
-                    row["circle_center_x"],
-                    row["circle_center_z"],
-                )
-
-        # --------------------
-        # LEGENDS
-        # --------------------
-
-        # --- Soils legend ---
-        soil_legend = None
-        if plotted_soils:
-            soil_handles = [
-                plt.Line2D([0], [0], color=c, lw=10) for c in plotted_soils.values()
-            ]
-            soil_legend = ax.legend(
-                soil_handles,
-                plotted_soils.keys(),
-                title="Soil type",
-                loc="upper right",
-                bbox_to_anchor=(1.0, 1.0),
-            )
-            ax.add_artist(soil_legend)
-
-        # --- Water legend ---
-        water_legend = None
-        if plotted_lines:
-            line_handles = [
-                plt.Line2D([0], [0], color=c, lw=2) for c in plotted_lines.values()
-            ]
-            water_legend = ax.legend(
-                line_handles,
-                plotted_lines.keys(),
-                title="Water lines",
-                loc="upper right",
-                bbox_to_anchor=(1.0, 0.5),
-            )
-            ax.add_artist(water_legend)
-
-        # --- Circle legend ---
-        circle_legend = None
-        if plotted_circles:
-            circle_handles = [
-                # plt.Line2D([0], [0], color="red", lw=2, linestyle="--") # voor hele cirkel
-                plt.Line2D(
-                    [0], [0], marker="o", color="red", linestyle="None"
-                )  # voor alleen middelpunt
-                for _ in plotted_circles
-            ]
-            circle_labels = [
-                f"{atype} middelpunten" for atype, (x, z) in plotted_circles.items()
-            ]
-            circle_legend = ax.legend(
-                circle_handles,
-                circle_labels,
-                title="Slip Circles",
-                loc="upper right",
-                bbox_to_anchor=(1.0, 0.15),
-            )
-            ax.add_artist(circle_legend)
-
-        ax.set_xlim(xlim)
-        ax.set_ylim(ylim)
-        ax.set_xlabel("X")
-        ax.set_ylabel("Z")
-        ax.set_title(f"Stage {stage_id}")
-        ax.set_aspect("equal")
-        plt.grid(True)
-        plt.tight_layout()
+        draw_stage(ax, stage_id, *frames, xlim=xlim, ylim=ylim)
+        fig.tight_layout()
         plt.show()
@@ -0,0 +1,298 @@
+"""
+Figuren van DAM Live stages
+
+Het tekenen van de stages is losgekoppeld van het samenvoegen van de tabellen in
+`CombineDamLiveResults`. Matplotlib wordt pas geïmporteerd als er daadwerkelijk een figuur
+wordt gemaakt. Bij het wegschrijven naar bestanden wordt het niet-interactieve Agg backend
+gebruikt (zonder pyplot), zodat meerdere figuren in aparte processen kunnen worden gemaakt.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pathlib import Path
+
+import pandas as pd
+
+
+def draw_stage(
+    ax,
+    stage_id: str,
+    df_stage_soils: pd.DataFrame,
+    df_stage_waternets: pd.DataFrame,
+    df_stage_calculations: pd.DataFrame,
+    xlim: tuple[float, float] | None = None,
+    ylim: tuple[float, float] | None = None,
+) -> None:
+    """
+    Tekent de geometrie van een stage inclusief soils, waterlijnen en middelpunten
+    van de glijcirkels op een bestaande matplotlib Axes.
+
+    Parameters
+    ----------
+    ax: matplotlib.axes.Axes
+        Axes waarop wordt getekend
+    stage_id: str
+        Id van de stage, voor de titel
+    df_stage_soils: pd.DataFrame
+        Samengevoegde soils van de stage (zie `CombineDamLiveResults.merge_geometries_soils`)
+    df_stage_waternets: pd.DataFrame
+        Samengevoegde waterlijnen van de stage
+    df_stage_calculations: pd.DataFrame
+        Samengevoegde berekeningsinstellingen van de stage
+    xlim, ylim: tuple[float, float] | None
+        Optioneel, bereik van de assen. Zonder bereik wordt het bereik van de data gebruikt.
+    """
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Polygon
+
+    # --------------------
+    # SOILS
+    # --------------------
+    plotted_soils = {}
+
+    for _, row in df_stage_soils.iterrows():
+        points = row["points"]
+        if not isinstance(points, (list, tuple)) or not points:
+            continue
+
+        polygon_coords = [(p["X"], p["Z"]) for p in points]
+        if polygon_coords[0] != polygon_coords[-1]:
+            polygon_coords.append(polygon_coords[0])
+
+        color = row["color"]
+
+        poly = Polygon(
+            polygon_coords,
+            closed=True,
+            facecolor=color,
+            edgecolor="k",
+            alpha=1,
+        )
+        ax.add_patch(poly)
+
+        soil_name = row["name"]
+        if soil_name not in plotted_soils:
+            plotted_soils[soil_name] = color
+
+    # --------------------
+    # WATERLIJNEN
+    # --------------------
+    plotted_lines = {}
+
+    for line_id, df_line in df_stage_waternets.groupby("line_id"):
+        xs = df_line["x"].tolist()
+        zs = df_line["z"].tolist()
+
+        line_label = df_line["line_label"].iloc[0]
+        color = df_line["color"].iloc[0]
+
+        ax.plot(xs, zs, color=color, linewidth=2)
+
+        if line_label not in plotted_lines:
+            plotted_lines[line_label] = color
+
+    # --------------------
+    # GLIJCIRKELS (alleen middelpunt)
+    # --------------------
+    plotted_circles = {}
+
+    for _, row in df_stage_calculations.iterrows():
+        if pd.notna(row.get("circle_center_x")) and pd.notna(
+            row.get("circle_center_z")
+        ):
+            ax.plot(
+                row["circle_center_x"],
+                row["circle_center_z"],
+                marker="o",
+                color="red",
+                markersize=6,
+            )
+
+            analysis_type = row["analysis_type"]
+            plotted_circles[analysis_type] = (
+                row["circle_center_x"],
+                row["circle_center_z"],
+            )
+
+    # --------------------
+    # LEGENDS
+    # --------------------
+    if plotted_soils:
+        soil_handles = [
+            Line2D([0], [0], color=c, lw=10) for c in plotted_soils.values()
+        ]
+        soil_legend = ax.legend(
+            soil_handles,
+            plotted_soils.keys(),
+            title="Soil type",
+            loc="upper right",
+            bbox_to_anchor=(1.0, 1.0),
+        )
+        ax.add_artist(soil_legend)
+
+    if plotted_lines:
+        line_handles = [Line2D([0], [0], color=c, lw=2) for c in plotted_lines.values()]
+        water_legend = ax.legend(
+            line_handles,
+            plotted_lines.keys(),
+            title="Water lines",
+            loc="upper right",
+            bbox_to_anchor=(1.0, 0.5),
+        )
+        ax.add_artist(water_legend)
+
+    if plotted_circles:
+        circle_handles = [
+            Line2D([0], [0], marker="o", color="red", linestyle="None")
+            for _ in plotted_circles
+        ]
+        circle_labels = [f"{atype} middelpunten" for atype in plotted_circles]
+        circle_legend = ax.legend(
+            circle_handles,
+            circle_labels,
+            title="Slip Circles",
+            loc="upper right",
+            bbox_to_anchor=(1.0, 0.15),
+        )
+        ax.add_artist(circle_legend)
+
+    if xlim is not None:
+        ax.set_xlim(xlim)
+    else:
+        ax.autoscale_view()
+    if ylim is not None:
+        ax.set_ylim(ylim)
+    ax.set_xlabel("X")
+    ax.set_ylabel("Z")
+    ax.set_title(f"Stage {stage_id}")
+    ax.set_aspect("equal")
+    ax.grid(True)
+
+
+def split_stages(
+    df_merged_soils: pd.DataFrame,
+    df_merged_waternet: pd.DataFrame,
+    df_merged_calculations: pd.DataFrame,
+    stage_ids: list[str] | None = None,
+) -> dict[str, tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+    """Verdeelt de samengevoegde tabellen eenmalig per stage, in plaats van per figuur te filteren"""
+    if stage_ids is None:
+        stage_ids = df_merged_soils["stage_id"].astype(str).unique().tolist()
+    stage_ids = [str(stage_id) for stage_id in stage_ids]
+
+    grouped = []
+    for df in [df_merged_soils, df_merged_waternet, df_merged_calculations]:
+        groups = dict(tuple(df.groupby(df["stage_id"].astype(str), sort=False)))
+        grouped.append(groups)
+
+    stages = {}
+    for stage_id in stage_ids:
+        if stage_id not in grouped[0]:
+            raise ValueError(f"Geen soil data gevonden voor stage {stage_id}")
+        stages[stage_id] = tuple(
+            groups.get(stage_id, df.iloc[0:0])
+            for groups, df in zip(
+                grouped, [df_merged_soils, df_merged_waternet, df_merged_calculations]
+            )
+        )
+    return stages
+
+
+def render_stage_figure(
+    stage_id: str,
+    frames: tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame],
+    path: str | Path,
+    xlim: tuple[float, float] | None = None,
+    ylim: tuple[float, float] | None = None,
+    figsize: tuple[float, float] = (15, 15),
+    dpi: int = 100,
+) -> Path:
+    """Tekent een stage en schrijft de figuur weg met het Agg backend
+
+    Er wordt geen pyplot gebruikt, zodat er geen globale figuren blijven bestaan en de
+    functie veilig in een apart proces kan draaien.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    draw_stage(ax, stage_id, *frames, xlim=xlim, ylim=ylim)
+    fig.tight_layout()
+    path = Path(path)
+    fig.savefig(path, dpi=dpi)
+    return path
+
+
+def _render_stage_figure_task(task: tuple) -> Path:
+    """Uitpakken van een taak uit de process pool"""
+    return render_stage_figure(*task)
+
+
+def render_stage_figures(
+    df_merged_soils: pd.DataFrame,
+    df_merged_waternet: pd.DataFrame,
+    df_merged_calculations: pd.DataFrame,
+    output_dir: str | Path,
+    stage_ids: list[str] | None = None,
+    xlim: tuple[float, float] | None = None,
+    ylim: tuple[float, float] | None = None,
+    figure_format: str = "png",
+    dpi: int = 100,
+    max_workers: int | None = None,
+) -> list[Path]:
+    """
+    Schrijft per stage een figuur naar `output_dir` (`stage_<stage_id>.<figure_format>`).
+
+    Parameters
+    ----------
+    df_merged_soils, df_merged_waternet, df_merged_calculations: pd.DataFrame
+        Resultaten van `CombineDamLiveResults`
+    output_dir: str | Path
+        Map waarin de figuren worden opgeslagen
+    stage_ids: list[str] | None
+        Optioneel, alleen deze stages tekenen, standaard alle stages
+    xlim, ylim: tuple[float, float] | None
+        Optioneel, bereik van de assen
+    figure_format: str
+        Bestandsformaat, standaard png
+    dpi: int
+        Resolutie van de figuren
+    max_workers: int | None
+        Aantal processen, standaard het aantal processoren. Met 1 (of bij een enkele stage)
+        worden de figuren in het huidige proces gemaakt.
+
+    Returns
+    -------
+    list[Path]
+        Paden van de figuren, in de volgorde van de stages
+    """
+    stages = split_stages(
+        df_merged_soils, df_merged_waternet, df_merged_calculations, stage_ids
+    )
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # alleen de data van de stage gaat mee naar het proces
+    tasks = [
+        (
+            stage_id,
+            frames,
+            output_dir / f"stage_{stage_id}.{figure_format}",
+            xlim,
+            ylim,
+            (15, 15),
+            dpi,
+        )
+        for stage_id, frames in stages.items()
+    ]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(tasks))
+    if max_workers <= 1:
+        return [_render_stage_figure_task(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_stage_figure_task, tasks))
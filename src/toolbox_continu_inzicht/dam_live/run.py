@@ -1,9 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
 import os
+from pathlib import Path
+import shutil
 import subprocess
 import sys
+import threading
 from typing import ClassVar, Optional
 from pydantic.dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 from toolbox_continu_inzicht.base.base_module import ToolboxBase
@@ -32,6 +38,12 @@ class UpdateDamLive(ToolboxBase):
 
     Notes
     -----
+    Met de optie `n_shards` in de GlobalVariables (`UpdateDamLive`) wordt de berekening
+    opgesplitst in groepen van tijdstippen. Elke groep krijgt een eigen werkmap (in
+    `shard_dir`, standaard `live_shards`) met een kopie van het .damx bestand, waarna DAM
+    Live per groep parallel wordt gestart (maximaal `max_workers` tegelijk). Met `timeout`
+    (in seconden) wordt een berekening die te lang duurt afgebroken. De uitvoer van de
+    groepen wordt weer samengevoegd tot een tijdreeks per locatie en parameter.
 
     """
 
@@ -110,15 +122,9 @@ class UpdateDamLive(ToolboxBase):
         }
         self.data_adapter.config.data_adapters.update(damlive_data_adapters)
 
-        # write output to the folder
-        self.data_adapter.output(output="live.InputTimeSeries", df=self.df_in_loads)
-        self.data_adapter.output(
-            output="live.ParametersFile", df=self.df_in_calculation_settings
-        )
         root_dir = self.data_adapter.get_global_variable("used_root_dir")
-        damlive_exe = self.data_adapter.config.data_adapters[
-            "live.InputTimeSeries"
-        ].get("DAMLIVE_EXE", None)
+        # de waardes uit het .env-bestand zijn bij het inlezen aan de GlobalVariables toegevoegd
+        damlive_exe = global_variables.get("DAMLIVE_EXE", None)
         assert damlive_exe is not None, (
             "DAMLIVE_EXE is not set, ensure that it is set in the .env file"
         )
@@ -128,6 +134,18 @@ class UpdateDamLive(ToolboxBase):
         if (root_dir / damlive_name).exists():
             if delete_output_folder:
                 remove_dir(root_dir / damlive_name)
+
+        n_shards = int(options.get("n_shards", 1))
+        if n_shards > 1:
+            self.df_out = self._run_shards(damlive_exe, root_dir, options, n_shards)
+            self.data_adapter.output(output=output, df=self.df_out)
+            return
+
+        # write output to the folder
+        self.data_adapter.output(output="live.InputTimeSeries", df=self.df_in_loads)
+        self.data_adapter.output(
+            output="live.ParametersFile", df=self.df_in_calculation_settings
+        )
         cmd = [
             damlive_exe,
             "-d",
@@ -139,22 +157,216 @@ class UpdateDamLive(ToolboxBase):
             "-p",
             (root_dir / "live.ParametersFile.xml").as_posix(),
         ]
-        self.data_adapter.logger.debug(f"Running command:\n{' '.join(cmd)}")
         # start dam live
-        proc = subprocess.Popen(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
-        )
-        for line in proc.stdout:
-            self.data_adapter.logger.info(line.rstrip())
-        returncode = proc.wait()
-        if returncode != 0:
-            raise subprocess.CalledProcessError(returncode, cmd)
+        run_damlive(cmd, self.data_adapter.logger, timeout=options.get("timeout"))
 
         self.df_out = self.data_adapter.input(
             input="live.OutputTimeSeries",
         )
         self.data_adapter.output(output=output, df=self.df_out)
 
+    def _run_shards(
+        self, damlive_exe: str, root_dir: Path, options: dict, n_shards: int
+    ) -> pd.DataFrame:
+        """Runt DAM Live parallel voor groepen van tijdstippen en voegt de uitvoer samen
+
+        Elke berekening rekent alle locaties uit het .damx bestand door, de tijdstippen
+        zijn onafhankelijk van elkaar. Daarom wordt op tijdstip gesplitst.
+        """
+        da = self.data_adapter
+        time_codes, date_times = pd.factorize(self.df_in_loads["date_time"], sort=True)
+        shards = np.array_split(
+            np.arange(len(date_times)), min(n_shards, len(date_times))
+        )
+        shard_root = root_dir / options.get("shard_dir", "live_shards")
+        if shard_root.exists():
+            remove_dir(shard_root)
+
+        # werkmappen vullen, de DataAdapters zijn niet thread-safe dus dit gebeurt vooraf
+        cmds = []
+        for i, shard_time_codes in enumerate(shards):
+            shard_path = shard_root / f"shard_{i:03d}"
+            shard_path.mkdir(parents=True)
+            damlive_file = copy_damlive_files(
+                root_dir / options["DAMLIVE_FILE"], shard_path
+            )
+            relative_path = shard_path.relative_to(root_dir)
+            df_shard = self.df_in_loads[np.isin(time_codes, shard_time_codes)].copy()
+            with da.temporary_adapter_config(
+                "live.InputTimeSeries",
+                {"path": (relative_path / "live.InputTimeSeries.xml").as_posix()},
+            ):
+                da.output(output="live.InputTimeSeries", df=df_shard)
+            with da.temporary_adapter_config(
+                "live.ParametersFile",
+                {"path": (relative_path / "live.ParametersFile.xml").as_posix()},
+            ):
+                da.output(
+                    output="live.ParametersFile",
+                    df=self.df_in_calculation_settings.copy(),
+                )
+            cmds.append(
+                [
+                    damlive_exe,
+                    "-d",
+                    damlive_file.as_posix(),
+                    "-i",
+                    (shard_path / "live.InputTimeSeries.xml").as_posix(),
+                    "-o",
+                    (shard_path / "live.OutputTimeSeries.xml").as_posix(),
+                    "-p",
+                    (shard_path / "live.ParametersFile.xml").as_posix(),
+                ]
+            )
+
+        max_workers = int(options.get("max_workers", min(len(cmds), os.cpu_count())))
+        da.logger.info(
+            "DAM Live in %s delen, maximaal %s tegelijk", len(cmds), max_workers
+        )
+        processes = DamLiveProcesses()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    run_damlive,
+                    cmd,
+                    da.logger,
+                    options.get("timeout"),
+                    f"shard {i}",
+                    processes,
+                )
+                for i, cmd in enumerate(cmds)
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                # bij de eerste fout de overige berekeningen niet afwachten
+                for future in futures:
+                    future.cancel()
+                processes.kill()
+                da.logger.warning("DAM Live delen gestopt na een fout")
+                raise
+
+        df_shards = []
+        for i in range(len(cmds)):
+            relative_path = (shard_root / f"shard_{i:03d}").relative_to(root_dir)
+            with da.temporary_adapter_config(
+                "live.OutputTimeSeries",
+                {"path": (relative_path / "live.OutputTimeSeries.xml").as_posix()},
+            ):
+                df_shards.append(da.input(input="live.OutputTimeSeries"))
+        return merge_damlive_output(df_shards)
+
+
+class DamLiveProcesses:
+    """Houdt de lopende DAM Live processen bij, zodat deze bij een fout gestopt kunnen worden"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes: set[subprocess.Popen] = set()
+        self.killed = False
+
+    def add(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.add(proc)
+            if self.killed:
+                # gestart na het stoppen
+                proc.kill()
+
+    def remove(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(proc)
+
+    def kill(self) -> None:
+        """Stopt alle lopende processen en processen die hierna nog starten"""
+        with self._lock:
+            self.killed = True
+            for proc in self._processes:
+                proc.kill()
+
+
+def run_damlive(
+    cmd: list[str],
+    logger: logging.Logger,
+    timeout: float | None = None,
+    name: str | None = None,
+    processes: DamLiveProcesses | None = None,
+) -> None:
+    """Start DAM Live en stuurt de uitvoer door naar de logger
+
+    Parameters
+    ----------
+    cmd: list[str]
+        Commando om DAM Live te starten
+    logger: logging.Logger
+        Logger voor de uitvoer van DAM Live
+    timeout: float | None
+        Maximale duur in seconden, daarna wordt DAM Live afgebroken
+    name: str | None
+        Naam van de berekening in de logging, bijvoorbeeld bij parallelle berekeningen
+    processes: DamLiveProcesses | None
+        Optioneel, registratie van de lopende processen om deze van buitenaf te stoppen
+
+    Raises
+    ------
+    subprocess.TimeoutExpired
+        Als de berekening langer duurt dan `timeout`
+    subprocess.CalledProcessError
+        Als DAM Live met een foutcode stopt
+    """
+    prefix = f"[{name}] " if name is not None else ""
+    logger.debug(f"{prefix}Running command:\n{' '.join(cmd)}")
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    if processes is not None:
+        processes.add(proc)
+    timed_out = threading.Event()
+
+    def _kill():
+        timed_out.set()
+        proc.kill()
+
+    timer = None
+    if timeout is not None:
+        timer = threading.Timer(float(timeout), _kill)
+        timer.start()
+    try:
+        for line in proc.stdout:
+            logger.info(f"{prefix}{line.rstrip()}")
+        returncode = proc.wait()
+    finally:
+        if timer is not None:
+            timer.cancel()
+        if processes is not None:
+            processes.remove(proc)
+        proc.stdout.close()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+def copy_damlive_files(damlive_file: Path, folder: Path) -> Path:
+    """Kopieert het .damx bestand en bijbehorende bestanden (zelfde naam) naar een map"""
+    stem = damlive_file.name.rsplit(".", 1)[0]
+    for path in damlive_file.parent.glob(f"{stem}.*"):
+        if path.is_file():
+            shutil.copy2(path, folder / path.name)
+    return folder / damlive_file.name
+
+
+def merge_damlive_output(df_shards: list[pd.DataFrame]) -> pd.DataFrame:
+    """Voegt de uitvoer van de delen samen, per locatie en parameter gesorteerd op tijd"""
+    df = pd.concat(df_shards, ignore_index=True)
+    series_codes, _ = pd.factorize(
+        pd.MultiIndex.from_frame(df[["measurement_location_code", "parameter_code"]])
+    )
+    df = df.assign(_series=series_codes)
+    df = df.sort_values(["_series", "date_time"], kind="stable")
+    return df.drop(columns="_series").reset_index(drop=True)
+
 
 def remove_dir(folder):
     folder = str(folder)
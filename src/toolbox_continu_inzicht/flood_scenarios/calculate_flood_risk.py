@@ -7,6 +7,7 @@ import geopandas as gpd
 
 from toolbox_continu_inzicht.base.base_module import ToolboxBase
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
+from toolbox_continu_inzicht.utils.geometry import GeometryProperties
 
 
 def import_rasterstats():
@@ -136,6 +137,8 @@ class CalculateFloodRisk(ToolboxBase):
         self.gdf_in_areas_to_aggregate = self.data_adapter.input(
             input=input[2],
         )
+        # oppervlaktes en bounds van de gebieden worden maar een keer bepaald
+        areas_properties = GeometryProperties(self.gdf_in_areas_to_aggregate)
 
         # lees de opties in
         global_variables = self.data_adapter.config.global_variables
@@ -168,62 +171,80 @@ class CalculateFloodRisk(ToolboxBase):
 
         # onconventionele manier om ervoor te zorgen dat de bibliotheken alleen worden geïmporteerd wanneer dat nodig is, wat lichtere installaties mogelijk maakt
         zonal_stats = import_rasterstats()
+        # lees alleen het deel van de grids in dat overlapt met de gebieden om te aggregeren
+        read_window = options.get("read_window", True)
+        grid_adapter_config = self.data_adapter.config.data_adapters[input[3]]
+        grid_adapter_overrides = {}
+        if (
+            read_window
+            and "bounds" not in grid_adapter_config
+            and "geometry" not in grid_adapter_config
+        ):
+            grid_adapter_overrides["bounds"] = list(areas_properties.total_bounds)
+            # gebieden buiten het grid geven net als zonder venster lege statistieken
+            grid_adapter_overrides["window_optional"] = True
+
         dict_segments_out = {}
-        for _, row in self.df_in_scenario_consequences_grids.iterrows():
-            # Grids met gevolgen laden
-            # Dynamisch grid_files dict maken van kolommen die eindigen op '_grid'
-            grid_files = {
-                col.replace("_grid", ""): row[col]
-                for col in self.df_in_scenario_consequences_grids.columns
-                if col.endswith("_grid")
-            }
-
-            # scenariokans voor segment ophalen
-            segment_id = row["segment_id"]
-            failure_probability_segment = self.df_in_scenario_failure_prob_segments.loc[
-                segment_id, "scenario_failure_probability"
-            ]
-
-            # maak een kopie van de gebieden om te aggregeren voor dit segment
-            dict_segments_out[segment_id] = self.gdf_in_areas_to_aggregate.copy()
-            dict_segments_out[segment_id].loc[:, "segment_id"] = segment_id
-
-            # loop door alle grids en bereken het risico
-            for grid_name, grid_file in grid_files.items():
-                # sla over als er een NAN waarde is voor het grid bestand (dan geen risico berekenen)
-                if pd.isna(grid_file):
-                    continue
-                self.data_adapter.config.data_adapters[input[3]]["grid_file"] = (
-                    grid_file
+        with self.data_adapter.temporary_adapter_config(
+            input[3], grid_adapter_overrides
+        ):
+            for _, row in self.df_in_scenario_consequences_grids.iterrows():
+                # Grids met gevolgen laden
+                # Dynamisch grid_files dict maken van kolommen die eindigen op '_grid'
+                grid_files = {
+                    col.replace("_grid", ""): row[col]
+                    for col in self.df_in_scenario_consequences_grids.columns
+                    if col.endswith("_grid")
+                }
+
+                # scenariokans voor segment ophalen
+                segment_id = row["segment_id"]
+                failure_probability_segment = (
+                    self.df_in_scenario_failure_prob_segments.loc[
+                        segment_id, "scenario_failure_probability"
+                    ]
                 )
 
-                array_masked_grid, affine = self.data_adapter.input(
-                    input=input[3],
-                )
-                assert np.issubdtype(array_masked_grid.data.dtype, np.floating), (
-                    "De grid data moet van float type zijn, zorg dat dit afgevangen wordt in de data adapter."
-                )
+                # maak een kopie van de gebieden om te aggregeren voor dit segment
+                dict_segments_out[segment_id] = self.gdf_in_areas_to_aggregate.copy()
+                dict_segments_out[segment_id].loc[:, "segment_id"] = segment_id
+
+                # loop door alle grids en bereken het risico
+                for grid_name, grid_file in grid_files.items():
+                    # sla over als er een NAN waarde is voor het grid bestand (dan geen risico berekenen)
+                    if pd.isna(grid_file):
+                        continue
+                    self.data_adapter.config.data_adapters[input[3]]["grid_file"] = (
+                        grid_file
+                    )
 
-                # kans vermenigvuldigen met raster
-                array_masked_grid *= failure_probability_segment
-                stat = aggregate_methods[grid_name]
-                zs = zonal_stats(
-                    vectors=self.gdf_in_areas_to_aggregate["geometry"],
-                    raster=array_masked_grid,
-                    affine=affine,
-                    stats=[stat],
-                    all_touched=False,
-                    nodata=np.nan,
-                )
+                    array_masked_grid, affine = self.data_adapter.input(
+                        input=input[3],
+                    )
+                    assert np.issubdtype(array_masked_grid.data.dtype, np.floating), (
+                        "De grid data moet van float type zijn, zorg dat dit afgevangen wordt in de data adapter."
+                    )
 
-                # add the zonal stats to the output geodataframe
-                dict_segments_out[segment_id] = pd.concat(
-                    (dict_segments_out[segment_id], pd.DataFrame(zs)), axis=1
-                )
-                dict_segments_out[segment_id].rename(
-                    columns={stat: grid_name}, inplace=True
-                )
-                dict_segments_out[segment_id].set_index("area_id")
+                    # kans vermenigvuldigen met raster
+                    array_masked_grid *= failure_probability_segment
+                    stat = aggregate_methods[grid_name]
+                    zs = zonal_stats(
+                        vectors=self.gdf_in_areas_to_aggregate["geometry"],
+                        raster=array_masked_grid,
+                        affine=affine,
+                        stats=[stat],
+                        all_touched=False,
+                        nodata=np.nan,
+                    )
+
+                    # add the zonal stats to the output geodataframe
+                    dict_segments_out[segment_id] = pd.concat(
+                        (dict_segments_out[segment_id], pd.DataFrame(zs)), axis=1
+                    )
+                    dict_segments_out[segment_id].rename(
+                        columns={stat: grid_name}, inplace=True
+                    )
+                    dict_segments_out[segment_id].set_index("area_id")
 
         # Concatenate all segment dataframes
         all_segments_df = pd.concat(dict_segments_out.values(), ignore_index=True)
@@ -269,9 +290,9 @@ class CalculateFloodRisk(ToolboxBase):
                 )
             for column_per_hectare in columns_per_hectare:
                 if column_per_hectare in self.df_out.columns:
-                    self.df_out[f"{column_per_hectare}_per_ha"] = self.df_out[
-                        column_per_hectare
-                    ] / (self.gdf_in_areas_to_aggregate["geometry"].area / 10000)
+                    self.df_out[f"{column_per_hectare}_per_ha"] = (
+                        self.df_out[column_per_hectare] / areas_properties.area_hectare
+                    )
                 else:
                     self.data_adapter.logger.warning(
                         f"Kolom {column_per_hectare} niet gevonden in output dataframe, kan niet omrekenen per hectare."
@@ -136,7 +136,7 @@ class LoadFromFloodScenarioProbability(ToolboxBase):
                     f"Zorg dat de fragility curves correct zijn ingeladen."
                 )
             # fragility curve object aanmaken en vullen met data uit dataframe
-            fragility_curve = FragilityCurve(data_adapter=self.data_adapter)
+            fragility_curve = FragilityCurve._construct(data_adapter=self.data_adapter)
             fragility_curve.lower_limit = (
                 1e-500  # FC defailt was 1e-200, we have smaller values here so adjust
             )
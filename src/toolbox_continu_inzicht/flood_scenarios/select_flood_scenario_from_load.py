@@ -1,4 +1,5 @@
 from typing import ClassVar, Optional
+import numpy as np
 import pandas as pd
 from pydantic.dataclasses import dataclass
 
@@ -108,60 +109,24 @@ class SelectFloodScenarioFromLoad(ToolboxBase):
         # bepaal de segmenten
         segments = self.df_in_scenarios_loads["segment_id"].unique()
         self.df_in_scenarios_loads.set_index("segment_id", inplace=True)
+        hydraulic_loads = (
+            self.df_in_scenarios_loads.groupby(level=0, sort=False)["hydraulicload"]
+            .first()
+            .to_numpy()
+        )
 
-        # lees de gevolgberekeningen in
-        consequences = self.df_in_consequences_loads.copy()
-
-        selected_grids = []
-        for segment in segments:
-            segment_series = self.df_in_scenarios_loads.loc[segment]
-            hydraulic_load = segment_series["hydraulicload"]
-            current_consequence_data = consequences[
-                consequences["segment_id"] == segment
-            ].copy()
-            smallest_load = current_consequence_data[
-                "hydraulicload_upperboundary"
-            ].min()
-            largest_load = current_consequence_data["hydraulicload_upperboundary"].max()
-            if hydraulic_load <= smallest_load:
-                # Er wordt altijd vanuit gegaan dat er een hydraulische belasting moet overschreden worden om risico te berekenen (er moet een overstroming/doorbraak zijn), anders is het risico gelijk aan 0
-                idx_selected_scenario = current_consequence_data[
-                    "hydraulicload_upperboundary"
-                ].idxmin()
-            elif hydraulic_load >= largest_load:
-                idx_selected_scenario = current_consequence_data[
-                    "hydraulicload_upperboundary"
-                ].idxmax()
-
-            else:
-                larger_loads = (
-                    current_consequence_data["hydraulicload_upperboundary"]
-                    >= hydraulic_load
-                )
-                subs_selection = current_consequence_data[larger_loads]
-                # standaard de laagste hogere belasting kiezen als representatief scenario
-                idx_selected_scenario = subs_selection[
-                    "hydraulicload_upperboundary"
-                ].idxmin()
-
-            grids_series = current_consequence_data.loc[[idx_selected_scenario]]
-
-            # indien gewenst ook de kleinste hogere belasting kiezen als representatief scenario
-            if return_two_scenarios:
-                # alleen als er een hogere belasting is
-                if (
-                    idx_selected_scenario
-                    > current_consequence_data["hydraulicload_upperboundary"].idxmin()
-                ):
-                    idx_lower_scenarios = idx_selected_scenario - 1
-                    grids_series = current_consequence_data.loc[
-                        [idx_lower_scenarios, idx_selected_scenario]
-                    ]
-
-            grids_series["segment_id"] = segment
-            selected_grids.append(grids_series)
-
-        self.df_out_scenario_consequences_grids = pd.concat(selected_grids, axis=0)
+        # bepaal in een keer voor alle segmenten het representatieve scenario
+        consequences = self.df_in_consequences_loads
+        selected_positions = select_scenario_positions(
+            consequence_segment_ids=consequences["segment_id"].to_numpy(),
+            consequence_loads=consequences["hydraulicload_upperboundary"].to_numpy(),
+            segment_ids=segments,
+            hydraulic_loads=hydraulic_loads,
+            return_two_scenarios=return_two_scenarios,
+        )
+        self.df_out_scenario_consequences_grids = consequences.iloc[
+            selected_positions
+        ].copy()
 
         # herschik de kolommen zodat segment_id vooraan staat
         columns = self.df_out_scenario_consequences_grids.columns.tolist()
@@ -174,3 +139,78 @@ class SelectFloodScenarioFromLoad(ToolboxBase):
         self.data_adapter.output(
             output=output, df=self.df_out_scenario_consequences_grids
         )
+
+
+def select_scenario_positions(
+    consequence_segment_ids: np.ndarray,
+    consequence_loads: np.ndarray,
+    segment_ids: np.ndarray,
+    hydraulic_loads: np.ndarray,
+    return_two_scenarios: bool = False,
+) -> np.ndarray:
+    """
+    Bepaalt voor alle segmenten tegelijk de posities van de representatieve scenario's.
+
+    De gevolgberekeningen worden eenmalig gesorteerd op (segment_id, hydraulicload_upperboundary),
+    waarna met een gegroepeerde `searchsorted` per segment de laagste bovengrens groter of gelijk
+    aan de belasting wordt gevonden. Aan beide kanten wordt afgekapt op het kleinste en grootste
+    scenario van het segment.
+
+    Parameters
+    ----------
+    consequence_segment_ids: np.ndarray
+        segment_id per gevolgberekening
+    consequence_loads: np.ndarray
+        hydraulicload_upperboundary per gevolgberekening
+    segment_ids: np.ndarray
+        Segmenten waarvoor een scenario gekozen wordt
+    hydraulic_loads: np.ndarray
+        Hydraulische belasting per segment
+    return_two_scenarios: bool
+        Geef ook het scenario met de eerstvolgende lagere bovengrens terug (indien aanwezig)
+
+    Returns
+    -------
+    np.ndarray
+        Posities (iloc) in de gevolgberekeningen, per segment in de volgorde van `segment_ids`
+        en bij twee scenario's eerst het lagere en dan het geselecteerde scenario.
+    """
+    consequence_segment_ids = np.asarray(consequence_segment_ids, dtype=np.int64)
+    consequence_loads = np.asarray(consequence_loads, dtype=np.float64)
+    segment_ids = np.asarray(segment_ids, dtype=np.int64)
+    hydraulic_loads = np.asarray(hydraulic_loads, dtype=np.float64)
+
+    # eenmalig sorteren op (segment_id, hydraulicload_upperboundary), stabiel voor gelijke waarden
+    order = np.lexsort((consequence_loads, consequence_segment_ids))
+    key_dtype = [("segment_id", np.int64), ("load", np.float64)]
+    sorted_keys = np.empty(len(order), dtype=key_dtype)
+    sorted_keys["segment_id"] = consequence_segment_ids[order]
+    sorted_keys["load"] = consequence_loads[order]
+
+    # begin en eind van elke groep
+    group_start = np.searchsorted(sorted_keys["segment_id"], segment_ids, side="left")
+    group_end = np.searchsorted(sorted_keys["segment_id"], segment_ids, side="right")
+    missing = group_start == group_end
+    if missing.any():
+        raise UserWarning(
+            f"Geen gevolgberekeningen gevonden voor segment(en): {segment_ids[missing].tolist()}."
+        )
+
+    # gegroepeerde searchsorted: eerste scenario met bovengrens >= belasting binnen het segment
+    query_keys = np.empty(len(segment_ids), dtype=key_dtype)
+    query_keys["segment_id"] = segment_ids
+    query_keys["load"] = hydraulic_loads
+    selected = np.searchsorted(sorted_keys, query_keys, side="left")
+    # Er wordt altijd vanuit gegaan dat er een hydraulische belasting moet overschreden worden
+    # om risico te berekenen, daarom kiezen we bij een te lage belasting het kleinste scenario
+    # en bij een te hoge belasting het grootste scenario.
+    selected = np.clip(selected, group_start, group_end - 1)
+
+    if not return_two_scenarios:
+        return order[selected]
+
+    # indien gewenst ook het scenario met de eerstvolgende lagere bovengrens, alleen als die er is
+    has_lower = selected > group_start
+    positions = np.stack((selected - 1, selected), axis=1)
+    keep = np.stack((has_lower, np.ones_like(has_lower)), axis=1)
+    return order[positions[keep]]
@@ -31,6 +31,7 @@ from toolbox_continu_inzicht.fragility_curves.combine_fragility_curves import (
     CombineFragilityCurvesIndependent,
     CombineFragilityCurvesDependent,
     CombineFragilityCurvesWeightedSum,
+    CombineFragilityCurvesMultiple,
 )
 from toolbox_continu_inzicht.fragility_curves.integrate_fragility_curves import (
     IntegrateFragilityCurve,
@@ -54,6 +55,7 @@ __all__ = [
     "CombineFragilityCurvesIndependent",
     "CombineFragilityCurvesDependent",
     "CombineFragilityCurvesWeightedSum",
+    "CombineFragilityCurvesMultiple",
     "IntegrateFragilityCurve",
     "IntegrateFragilityCurveMultiple",
     "LoadCachedFragilityCurveOneFailureMechanism",
@@ -8,7 +8,10 @@ from pydantic.dataclasses import dataclass
 from toolbox_continu_inzicht.base.base_module import ToolboxBase
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
 from toolbox_continu_inzicht.base.fragility_curve import FragilityCurve
-from toolbox_continu_inzicht.utils.interpolate import log_x_interpolate_1d
+from toolbox_continu_inzicht.utils.interpolate import (
+    grouped_x_interpolate_1d,
+    log_x_interpolate_1d,
+)
 
 
 def combine_independent(lst_fragility_curves, **kwargs):
@@ -42,6 +45,32 @@ def combine_weighted(lst_fragility_curves, weights=None):
     return overschrijdingskans
 
 
+def combine_independent_grouped(failure_probability, group, n_groups, weights=None):
+    """Combineer onafhankelijk per groep: P(fail,comb|h) = 1 - PROD(1 - P(fail,i|h))"""
+    onderschrijdingskans = np.ones(n_groups)
+    np.multiply.at(onderschrijdingskans, group, 1 - failure_probability)
+    return 1 - onderschrijdingskans
+
+
+def combine_dependent_grouped(failure_probability, group, n_groups, weights=None):
+    """Combineer afhankelijk per groep: P(fail,comb|h) = MAX(P(fail,i|h))"""
+    overschrijdingskans = np.full(n_groups, -np.inf)
+    np.maximum.at(overschrijdingskans, group, failure_probability)
+    return overschrijdingskans
+
+
+def combine_weighted_grouped(failure_probability, group, n_groups, weights=None):
+    """Combineer gewogen per groep: P(fail,comb|h) = SUM(w_i * P(fail,i|h))"""
+    if weights is None:
+        raise UserWarning(
+            "Voor de gewogen som zijn gewichten per faalmechanisme nodig."
+        )
+    overschrijdingskans = np.bincount(
+        group, weights=failure_probability * weights, minlength=n_groups
+    )
+    return np.clip(overschrijdingskans, 0, 1)
+
+
 @dataclass(config={"arbitrary_types_allowed": True})
 class CombineFragilityCurvesIndependent(ToolboxBase):
     """
@@ -130,13 +159,15 @@ class CombineFragilityCurvesIndependent(ToolboxBase):
         # hydraulische belasting en de hydraulische belasting plus een kleine
         # offset toe.
         steps = []
+        steps_found = set()
         for index, fragility_curve in enumerate(self.lst_fragility_curves):
-            fc = FragilityCurve(data_adapter=self.data_adapter)
+            fc = FragilityCurve._construct(data_adapter=self.data_adapter)
             fc.from_dataframe(fragility_curve)
             idxs = fc.find_jump_indices()
             if len(idxs) > 0:
                 for wl in np.unique(fc.hydraulicload[idxs]):
-                    if wl not in steps:
+                    if wl not in steps_found:
+                        steps_found.add(wl)
                         steps.append(wl)
                         steps.append(wl + 1e-16)
         hydraulicload = np.sort(np.hstack([hydraulicload, steps]))
@@ -144,12 +175,15 @@ class CombineFragilityCurvesIndependent(ToolboxBase):
         # Interpoleer fragility curves naar dezelfde hydraulicload. Aangezien
         # we de sprongen al hebben gedetecteerd en verwerkt, doe dat hier niet
         # nog een keer.
-        for index, fragility_curve in enumerate(self.lst_fragility_curves):
-            fc = FragilityCurve(data_adapter=self.data_adapter)
+        # Curves met dezelfde belastingen worden in een keer geinterpoleerd.
+        lst_fc = []
+        for fragility_curve in self.lst_fragility_curves:
+            fc = FragilityCurve._construct(data_adapter=self.data_adapter)
             fc.interp_func = self.interp_func
             fc.from_dataframe(fragility_curve)
-            fc.refine(hydraulicload, add_steps=False)
-            self.lst_fragility_curves[index] = fc.as_dataframe()
+            lst_fc.append(fc)
+        FragilityCurve.refine_many(lst_fc, hydraulicload, add_steps=False)
+        self.lst_fragility_curves = [fc.as_dataframe() for fc in lst_fc]
 
         overschrijdingskans = self.combine_func(
             self.lst_fragility_curves, weights=self.weights
@@ -290,3 +324,227 @@ class CombineFragilityCurvesWeightedSum(CombineFragilityCurvesIndependent):
 
         self.df_out = self.calculate_combined_curve(extend_past_max, refine_step_size)
         self.data_adapter.output(output, self.df_out)
+
+
+@dataclass(config={"arbitrary_types_allowed": True})
+class CombineFragilityCurvesMultiple(ToolboxBase):
+    """
+    Combineer de fragility curves van meerdere faalmechanismen voor alle vakken en maatregelen in een keer.
+
+    Attributes
+    ----------
+    data_adapter: DataAdapter
+        DataAdapter object
+    df_in: Optional[pd.DataFrame] | None
+        DataFrame met de fragility curves van alle vakken, maatregelen en faalmechanismen
+    df_weights: Optional[pd.DataFrame] | None
+        DataFrame met de gewichten per faalmechanisme, alleen bij de methode `weighted_sum`
+    df_out: Optional[pd.DataFrame] | None
+        DataFrame met de gecombineerde fragility curve per vak en maatregel
+    interp_func: Callable
+        Functie waarmee geinterpoleerd wordt
+    lower_limit: float
+        Ondergrens voor de interpolatie van de faalkans, standaard 1e-200
+    fragility_curves_schema: ClassVar[dict[str, str]]
+        Schema waaraan de fragility curves moeten voldoen: section_id: int, measure_id: int,
+        failuremechanism_id: int, hydraulicload: float, failure_probability: float
+    weights_schema: ClassVar[dict[str, str]]
+        Schema waaraan de gewichten moeten voldoen: failuremechanism_id: int, weights: float
+
+    Notes
+    -----
+    Per combinatie van vak en maatregel wordt een grid van waterstanden gemaakt, net als bij
+    `CombineFragilityCurvesIndependent`. Sprongen in de curves worden aan dit grid toegevoegd.
+    Daarna worden alle curves in een keer geinterpoleerd en gecombineerd.
+    De volgende opties kunnen via de config worden ingesteld:
+
+    1. combine_method. `independent` (standaard), `dependent` of `weighted_sum`.
+    2. extend_past_max. Hoever de nieuwe waterstanden verder gaan dan de maximale waterstanden van de inputcurves. Default is 0.01.
+    3. refine_step_size. De stapgrootte van de waterstanden die gebruikt wordt bij het herschalen van de kansen voor het combineren. Default is 0.05.
+    4. combined_failuremechanism_id. Het faalmechanisme id van de gecombineerde curve. Default is 1.
+    """
+
+    data_adapter: DataAdapter
+    df_in: Optional[pd.DataFrame] | None = None
+    df_weights: Optional[pd.DataFrame] | None = None
+    df_out: Optional[pd.DataFrame] | None = None
+    interp_func: Callable = log_x_interpolate_1d
+    lower_limit: float = 1e-200
+    fragility_curves_schema: ClassVar[dict[str, str]] = {
+        "section_id": "int",
+        "measure_id": "int",
+        "failuremechanism_id": "int",
+        "hydraulicload": "float",
+        "failure_probability": "float",
+    }
+    weights_schema: ClassVar[dict[str, str]] = {
+        "failuremechanism_id": "int",
+        "weights": "float",
+    }
+    combine_methods: ClassVar[dict[str, Callable]] = {
+        "independent": combine_independent_grouped,
+        "dependent": combine_dependent_grouped,
+        "weighted_sum": combine_weighted_grouped,
+    }
+
+    def run(self, input: str | list[str], output: str) -> None:
+        """
+        Combineert de fragility curves per vak en maatregel
+
+        Parameters
+        ----------
+        input: str | list[str]
+            Naam van de DataAdapter met fragility curves.
+            Bij de methode `weighted_sum` een lijst met als tweede de DataAdapter met de gewichten.
+        output: str
+            Naam van de output DataAdapter.
+
+        Raises
+        ------
+        UserWarning
+            Als de combinatiemethode onbekend is of als de gewichten ontbreken.
+        """
+        if isinstance(input, str):
+            input = [input]
+        self.df_in = self.data_adapter.input(input[0], self.fragility_curves_schema)
+
+        global_variables = self.data_adapter.config.global_variables
+        options = global_variables.get("CombineFragilityCurvesMultiple", {})
+        combine_method = options.get("combine_method", "independent")
+        extend_past_max = options.get("extend_past_max", 0.01)
+        refine_step_size = options.get("refine_step_size", 0.05)
+        combined_failuremechanism_id = options.get("combined_failuremechanism_id", 1)
+
+        if combine_method not in self.combine_methods:
+            raise UserWarning(
+                f"Onbekende combine_method '{combine_method}', kies uit {list(self.combine_methods)}."
+            )
+        if combine_method == "weighted_sum":
+            if len(input) < 2:
+                raise UserWarning(
+                    "Bij de methode `weighted_sum` moet de tweede input de gewichten per faalmechanisme bevatten."
+                )
+            self.df_weights = self.data_adapter.input(input[1], self.weights_schema)
+
+        self.df_out = self.calculate_combined_curves(
+            self.df_in,
+            extend_past_max,
+            refine_step_size,
+            combine_method=combine_method,
+            df_weights=self.df_weights,
+        )
+        self.df_out["failuremechanism_id"] = combined_failuremechanism_id
+        self.df_out = self.df_out[list(self.fragility_curves_schema.keys())]
+        self.data_adapter.output(output, self.df_out)
+
+    def calculate_combined_curves(
+        self,
+        df_in: pd.DataFrame,
+        extend_past_max: float,
+        refine_step_size: float,
+        combine_method: str = "independent",
+        df_weights: pd.DataFrame | None = None,
+    ) -> pd.DataFrame:
+        """Combineert de fragility curves van alle vakken en maatregelen
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame met section_id, measure_id, hydraulicload en failure_probability
+        """
+        group_columns = ["section_id", "measure_id"]
+        curve_columns = group_columns + ["failuremechanism_id"]
+
+        # Sorteer de curves zoals FragilityCurve.sort_curve en forceer monotoon stijgende faalkansen
+        df = df_in.sort_values(
+            curve_columns + ["hydraulicload", "failure_probability"], kind="stable"
+        ).reset_index(drop=True)
+        curve = df.groupby(curve_columns, sort=False).ngroup().to_numpy()
+        group = df.groupby(group_columns, sort=False).ngroup().to_numpy()
+        hydraulicload = df["hydraulicload"].to_numpy(dtype=float)
+        failure_probability = (
+            df["failure_probability"]
+            .groupby(curve, sort=False)
+            .cummax()
+            .to_numpy(dtype=float)
+        )
+
+        curve_start = np.flatnonzero(np.r_[True, curve[1:] != curve[:-1]])
+        curve_group = group[curve_start]
+        curve_failuremechanism = df["failuremechanism_id"].to_numpy()[curve_start]
+        group_start = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        df_groups = df.loc[group_start, group_columns].reset_index(drop=True)
+        n_groups = len(df_groups)
+
+        # Grid van hydraulische belastingen per groep: van de kleinste tot de grootste
+        # belasting van alle curves in de groep, met dezelfde stapgrootte.
+        load_min = np.minimum.reduceat(hydraulicload, group_start)
+        load_max = np.maximum.reduceat(hydraulicload, group_start)
+        n_grid = np.ceil((load_max + extend_past_max - load_min) / refine_step_size)
+        n_grid = np.maximum(n_grid, 0).astype(np.intp)
+        grid_group = np.repeat(np.arange(n_groups), n_grid)
+        grid_step = np.arange(len(grid_group)) - np.repeat(
+            np.cumsum(n_grid) - n_grid, n_grid
+        )
+        # zelfde waardes als np.arange(load_min, load_max + extend_past_max, refine_step_size)
+        grid_delta = (load_min + refine_step_size) - load_min
+        grid = load_min[grid_group] + grid_step * grid_delta[grid_group]
+
+        # Sprongen (gelijke opvolgende belastingen binnen een curve) worden per groep
+        # eenmalig aan het grid toegevoegd, samen met de belasting plus een kleine offset.
+        jumps = np.flatnonzero(
+            (np.diff(hydraulicload) == 0) & (curve[1:] == curve[:-1])
+        )
+        df_steps = pd.DataFrame(
+            {"group": group[jumps], "hydraulicload": hydraulicload[jumps]}
+        ).drop_duplicates()
+        step_group = df_steps["group"].to_numpy()
+        step_load = df_steps["hydraulicload"].to_numpy()
+        grid_group = np.concatenate([grid_group, step_group, step_group])
+        grid = np.concatenate([grid, step_load, step_load + 1e-16])
+        grid_order = np.lexsort((grid, grid_group))
+        grid_group = grid_group[grid_order]
+        grid = grid[grid_order]
+        n_grid = np.bincount(grid_group, minlength=n_groups)
+        grid_start = np.cumsum(n_grid) - n_grid
+
+        # Interpoleer alle curves in een keer naar het grid van hun groep
+        n_eval = n_grid[curve_group]
+        eval_curve = np.repeat(np.arange(len(curve_start)), n_eval)
+        eval_grid = grid_start[curve_group][eval_curve] + (
+            np.arange(n_eval.sum()) - np.repeat(np.cumsum(n_eval) - n_eval, n_eval)
+        )
+        eval_failure_probability = grouped_x_interpolate_1d(
+            grid[eval_grid],
+            eval_curve,
+            hydraulicload,
+            failure_probability,
+            curve,
+            interp_func=self.interp_func,
+            ll=self.lower_limit,
+            clip01=True,
+        )
+
+        weights = None
+        if df_weights is not None:
+            weight_per_mechanism = dict(
+                zip(df_weights["failuremechanism_id"], df_weights["weights"])
+            )
+            missing = set(curve_failuremechanism) - set(weight_per_mechanism)
+            if len(missing) > 0:
+                raise UserWarning(
+                    f"Geen gewicht opgegeven voor faalmechanisme(n) {sorted(missing)}."
+                )
+            curve_weights = np.array(
+                [weight_per_mechanism[fm] for fm in curve_failuremechanism], dtype=float
+            )
+            weights = curve_weights[eval_curve]
+
+        combined_failure_probability = self.combine_methods[combine_method](
+            eval_failure_probability, eval_grid, len(grid), weights=weights
+        )
+
+        df_out = df_groups.iloc[grid_group].reset_index(drop=True)
+        df_out["hydraulicload"] = grid
+        df_out["failure_probability"] = combined_failure_probability
+        return df_out
@@ -1,3 +1,5 @@
+import numpy as np
+
 from toolbox_continu_inzicht import DataAdapter
 from toolbox_continu_inzicht.fragility_curves import (
     FragilityCurveOvertoppingBedlevelFetch,
@@ -56,6 +58,26 @@ class _ShiftFragilityCurveOvertoppingMixin:
         self.shift(effect)
         self.data_adapter.output(output=output, df=self.as_dataframe())
 
+    def run_sweep(
+        self, input: list[str], output: str, effects: list[float] | np.ndarray
+    ) -> None:
+        """
+        Berekent de fragility curve voor golfoverslag een keer en verschuift deze met meerdere effecten
+
+        Parameters
+        ----------
+        input: list[str]
+            Lijst namen van de input DataAdapters, zie `run`
+        output: str
+            Naam van de DataAdapter voor de fragility curves, een lange tabel met de kolommen
+            effect, hydraulicload en failure_probability
+        effects: list[float] | np.ndarray
+            Verschuivingen van de fragility curve
+        """
+        self.calculate_fragility_curve(input, output)
+        self.df_out = self.as_shifted_dataframe(effects)
+        self.data_adapter.output(output=output, df=self.df_out)
+
 
 class _ChangeCrestHeightFragilityCurveOvertoppingMixin:
     """Verschuift de kruinhoogte met het gegeven effect en berekent de fragility curve"""
@@ -105,7 +127,8 @@ class _ChangeCrestHeightFragilityCurveOvertoppingMixin:
         1. fetch, lengte van fetch in meters
 
         """
-        df_profile = self.data_adapter.input(input[1])
+        # kopie, zodat de kruinhoogte in de input niet wordt aangepast
+        df_profile = self.data_adapter.input(input[1]).copy()
         if "parameters" in df_profile:
             df_profile.set_index("parameters", inplace=True)
         # converteer naar numeriek indien mogelijk, dit komt doordat de kolom zowel strings als floats bevat
@@ -123,6 +146,28 @@ class _ChangeCrestHeightFragilityCurveOvertoppingMixin:
         updated_input[1] = "changed_crest_profile"
         self.calculate_fragility_curve(updated_input, output)
 
+    def run_sweep(
+        self, input: list[str], output: str, effects: list[float] | np.ndarray
+    ) -> None:
+        """
+        Berekent de fragility curves voor golfoverslag voor meerdere aanpassingen van de kruinhoogte
+
+        De profielen, modelonzekerheden en golfcondities worden gedeeld tussen de varianten,
+        waardoor dit sneller is dan `run` per effect. Per effect is het resultaat gelijk aan `run`.
+
+        Parameters
+        ----------
+        input: list[str]
+            Lijst namen van de input DataAdapters, zie `run`
+        output: str
+            Naam van de DataAdapter voor de fragility curves, een lange tabel met de kolommen
+            effect, hydraulicload en failure_probability
+        effects: list[float] | np.ndarray
+            Verhogingen van de kruinhoogte
+        """
+        self.df_out = self.calculate_fragility_curves_crest_sweep(input, effects)
+        self.data_adapter.output(output=output, df=self.df_out)
+
 
 class ShiftFragilityCurveOvertoppingBedlevelFetch(
     _ShiftFragilityCurveOvertoppingMixin,
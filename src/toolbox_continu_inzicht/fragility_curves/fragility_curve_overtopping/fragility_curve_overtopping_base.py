@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from typing import ClassVar, Optional
 
+import numpy as np
 import pandas as pd
 from pydantic.dataclasses import dataclass
 
 from toolbox_continu_inzicht import DataAdapter, FragilityCurve
+from toolbox_continu_inzicht.base.fragility_curve_cache import cached_calculation
 from toolbox_continu_inzicht.fragility_curves.fragility_curve_overtopping.overtopping_utils import (
     build_pydra_profiles,
     parse_profile_dataframe,
@@ -17,6 +19,7 @@ from toolbox_continu_inzicht.fragility_curves.fragility_curve_overtopping.wave_o
 from toolbox_continu_inzicht.fragility_curves.fragility_curve_overtopping.wave_provider import (
     WaveProvider,
 )
+from toolbox_continu_inzicht.utils.interpolate import bracketing_indices
 
 
 @dataclass(config={"arbitrary_types_allowed": True})
@@ -48,6 +51,10 @@ class FragilityCurveOvertoppingBase(FragilityCurve):
     def _build_wave_provider(self, options: dict) -> WaveProvider:
         raise NotImplementedError
 
+    def _cache_inputs(self) -> list[pd.DataFrame | None]:
+        """Input naast de hellingen en het profiel die het resultaat bepaalt, voor de cache"""
+        raise NotImplementedError
+
     @classmethod
     def get_overtopping_options(
         cls, global_variables: dict, key: str, defaults: dict
@@ -94,8 +101,8 @@ class FragilityCurveOvertoppingBase(FragilityCurve):
         )
         return options
 
-    def calculate_fragility_curve(self, input: list[str], output: str) -> None:
-        da = self.data_adapter
+    def _prepare_calculation(self, input: list[str]) -> tuple[pd.Series, dict, object]:
+        """Laadt en controleert de input, geeft het profiel, de opties en de sluitsituatie terug"""
         self._load_inputs(input)
 
         profile_series = parse_profile_dataframe(self.df_profile)
@@ -107,13 +114,69 @@ class FragilityCurveOvertoppingBase(FragilityCurve):
             raise KeyError(
                 f"Missing overtopping config option 'closing_situation' for '{self.options_key}'."
             )
+        return profile_series, options, closing_situation
+
+    def calculate_fragility_curve(self, input: list[str], output: str) -> None:
+        da = self.data_adapter
+        profile_series, options, closing_situation = self._prepare_calculation(input)
+
+        def calculate() -> dict[str, np.ndarray]:
+            basis_profiel, overtopping = build_pydra_profiles(
+                self.df_slopes, profile_series
+            )
+            wave_provider = self._build_wave_provider(options)
+
+            niveaus, ovkansqcr = WaveOvertoppingCalculation.calculate_overtopping_curve(
+                profile_series["windspeed"],
+                profile_series["sectormin"],
+                profile_series["sectorsize"],
+                overtopping,
+                basis_profiel,
+                qcr=profile_series["qcr"],
+                closing_situation=closing_situation,
+                options=options,
+                wave_provider=wave_provider,
+            )
+            return {"hydraulicload": niveaus, "failure_probability": ovkansqcr}
 
+        # met de optie `cache_dir` wordt een eerder berekende curve met dezelfde input hergebruikt
+        result = cached_calculation(
+            da,
+            options,
+            key_prefix=self.options_key,
+            frames=[self.df_slopes, profile_series, *self._cache_inputs()],
+            calculate=calculate,
+        )
+        self.hydraulicload = result["hydraulicload"]
+        self.failure_probability = result["failure_probability"]
+
+        da.output(output=output, df=self.as_dataframe())
+
+    def calculate_fragility_curves_crest_sweep(
+        self, input: list[str], effects: list[float] | np.ndarray
+    ) -> pd.DataFrame:
+        """Berekent de fragility curves voor meerdere aanpassingen van de kruinhoogte in een keer
+
+        Parameters
+        ----------
+        input: list[str]
+            Lijst namen van de input DataAdapters, zie `run`
+        effects: list[float] | np.ndarray
+            Verhogingen van de kruinhoogte (m)
+
+        Returns
+        -------
+        pd.DataFrame
+            Lange tabel met de kolommen effect, hydraulicload en failure_probability
+        """
+        profile_series, options, closing_situation = self._prepare_calculation(input)
         basis_profiel, overtopping = build_pydra_profiles(
             self.df_slopes, profile_series
         )
         wave_provider = self._build_wave_provider(options)
 
-        niveaus, ovkansqcr = WaveOvertoppingCalculation.calculate_overtopping_curve(
+        effects = np.atleast_1d(np.asarray(effects, dtype=float))
+        curves = WaveOvertoppingCalculation.calculate_overtopping_curves_crest_sweep(
             profile_series["windspeed"],
             profile_series["sectormin"],
             profile_series["sectorsize"],
@@ -123,9 +186,94 @@ class FragilityCurveOvertoppingBase(FragilityCurve):
             closing_situation=closing_situation,
             options=options,
             wave_provider=wave_provider,
+            crest_effects=effects,
+        )
+        return pd.DataFrame(
+            {
+                "effect": np.repeat(effects, [len(niveaus) for niveaus, _ in curves]),
+                "hydraulicload": np.concatenate([niveaus for niveaus, _ in curves]),
+                "failure_probability": np.concatenate(
+                    [ovkansqcr for _, ovkansqcr in curves]
+                ),
+            }
         )
 
-        self.hydraulicload = niveaus
-        self.failure_probability = ovkansqcr
+    def calculate_fragility_curve_surface(
+        self, input: list[str], windspeeds: list[float] | np.ndarray
+    ) -> pd.DataFrame:
+        """Berekent de fragility curves voor meerdere windsnelheden in een keer
 
-        da.output(output=output, df=self.as_dataframe())
+        De windsnelheid uit het profiel wordt vervangen door de opgegeven windsnelheden.
+        Alle curves hebben dezelfde waterstanden, zodat het resultaat een vlak
+        (windsnelheid x waterstand) is, zie ook `interpolate_fragility_curve_surface`.
+
+        Parameters
+        ----------
+        input: list[str]
+            Lijst namen van de input DataAdapters, zie `run`
+        windspeeds: list[float] | np.ndarray
+            Windsnelheden (m/s)
+
+        Returns
+        -------
+        pd.DataFrame
+            Lange tabel met de kolommen windspeed, hydraulicload en failure_probability
+        """
+        profile_series, options, closing_situation = self._prepare_calculation(input)
+        basis_profiel, overtopping = build_pydra_profiles(
+            self.df_slopes, profile_series
+        )
+        wave_provider = self._build_wave_provider(options)
+
+        windspeeds = np.atleast_1d(np.asarray(windspeeds, dtype=float))
+        niveaus, ovkansqcr = WaveOvertoppingCalculation.calculate_overtopping_surface(
+            windspeeds,
+            profile_series["sectormin"],
+            profile_series["sectorsize"],
+            overtopping,
+            basis_profiel,
+            qcr=profile_series["qcr"],
+            closing_situation=closing_situation,
+            options=options,
+            wave_provider=wave_provider,
+        )
+        return pd.DataFrame(
+            {
+                "windspeed": np.repeat(windspeeds, len(niveaus)),
+                "hydraulicload": np.tile(niveaus, len(windspeeds)),
+                "failure_probability": ovkansqcr.ravel(),
+            }
+        )
+
+    def interpolate_fragility_curve_surface(
+        self, df_surface: pd.DataFrame, windspeed: float
+    ) -> None:
+        """Bepaalt de fragility curve voor een windsnelheid door lineair te interpoleren
+        tussen de curves van `calculate_fragility_curve_surface`, in plaats van opnieuw te rekenen
+
+        Parameters
+        ----------
+        df_surface: pd.DataFrame
+            Resultaat van `calculate_fragility_curve_surface`
+        windspeed: float
+            Windsnelheid (m/s), binnen het bereik van de berekende windsnelheden
+        """
+        surface = df_surface.pivot(
+            index="windspeed", columns="hydraulicload", values="failure_probability"
+        )
+        windspeeds = surface.index.to_numpy()
+        if not windspeeds[0] <= windspeed <= windspeeds[-1]:
+            raise UserWarning(
+                f"Windsnelheid {windspeed} valt buiten het berekende bereik [{windspeeds[0]}, {windspeeds[-1]}]."
+            )
+
+        if len(windspeeds) == 1:
+            failure_probability = surface.to_numpy()[0]
+        else:
+            i1, i2, fws = bracketing_indices(windspeeds, windspeed)
+            values = surface.to_numpy()
+            failure_probability = (1 - fws) * values[i1] + fws * values[i2]
+
+        self.hydraulicload = surface.columns.to_numpy()
+        self.failure_probability = failure_probability
+        self.check_monotonic_curve()
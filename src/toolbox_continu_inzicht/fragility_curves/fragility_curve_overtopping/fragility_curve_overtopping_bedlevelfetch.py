@@ -111,6 +111,9 @@ class FragilityCurveOvertoppingBedlevelFetch(FragilityCurveOvertoppingBase):
             tp_tspec=options.get("tp_tspec", 1.1),
         )
 
+    def _cache_inputs(self) -> list[pd.DataFrame | None]:
+        return [self.df_bed_levels]
+
     @classmethod
     def get_overtopping_options(
         cls, global_variables: dict, key: str, defaults: dict
@@ -283,7 +286,7 @@ class FragilityCurveOvertoppingBedlevelFetchMultiple(ToolboxBase):
         }
         with temp_data_adapter.temporary_adapters(overrides):
             # dit zorgt ervoor dat het beheerdersoordeel ook mee kan worden genomen
-            fc_overtopping = self.fc_function(data_adapter=temp_data_adapter)
+            fc_overtopping = self.fc_function._construct(data_adapter=temp_data_adapter)
             if self.effect is not None:
                 fc_overtopping.run(
                     input=[input[0], input[1], input[2]],
@@ -5,6 +5,10 @@ import pandas as pd
 from pydantic.dataclasses import dataclass
 
 from toolbox_continu_inzicht import DataAdapter, FragilityCurve, ToolboxBase
+from toolbox_continu_inzicht.base.adapters.input.wavedata.cube_wavedata import (
+    WaveDataCube,
+    WaveDataCubeLocation,
+)
 from toolbox_continu_inzicht.fragility_curves.fragility_curve_overtopping.fragility_curve_overtopping_base import (
     FragilityCurveOvertoppingBase,
 )
@@ -33,6 +37,9 @@ class FragilityCurveOvertoppingWaveData(FragilityCurveOvertoppingBase):
         DataFrame met golf metadata.
     df_waveval: Optional[pd.DataFrame] | None
         DataFrame met golfdata.
+    wave_location: Optional[WaveDataCubeLocation] | None
+        Golfcondities van de locatie uit een golfdata kubus, als alternatief voor
+        df_waveval_id en df_waveval.
     options_key: ClassVar[str]
         Config key voor overtopping opties.
 
@@ -48,6 +55,7 @@ class FragilityCurveOvertoppingWaveData(FragilityCurveOvertoppingBase):
     df_waveval_uncert: Optional[pd.DataFrame] | None = None
     df_waveval_id: Optional[pd.DataFrame] | None = None
     df_waveval: Optional[pd.DataFrame] | None = None
+    wave_location: Optional[WaveDataCubeLocation] | None = None
     options_key: ClassVar[str] = "FragilityCurveOvertoppingWaveData"
 
     def run(self, input: list[str], output: str) -> None:
@@ -103,6 +111,10 @@ class FragilityCurveOvertoppingWaveData(FragilityCurveOvertoppingBase):
         1. waveval_id, golfcombinatie id
         1. waterlevel, de waterstand in meters
         1. waveval, de waarde van de golfparameter (Hs: meters, Tm10: seconden, Wave direction: graden)
+
+        In plaats van de vierde en vijfde DataAdapter kan ook een enkele DataAdapter van het
+        type `wavedata_cube` worden opgegeven (met de optie `hr_locid` als de kubus meerdere
+        locaties bevat). De golfcondities worden dan zonder kopie uit de kubus gelezen.
         """
         self.calculate_fragility_curve(input, output)
 
@@ -111,12 +123,41 @@ class FragilityCurveOvertoppingWaveData(FragilityCurveOvertoppingBase):
         self.df_slopes = da.input(input[0])
         self.df_profile = da.input(input[1])
         self.df_waveval_uncert = da.input(input[2])  # @TODO doe hier iets mee
-        self.df_waveval_id = da.input(input[3])
-        self.df_waveval = da.input(input[4])
+        wavedata = da.input(input[3])
+        if isinstance(wavedata, WaveDataCube):
+            if len(wavedata) != 1:
+                raise UserWarning(
+                    f"De golfdata kubus van {input[3]} bevat meerdere locaties, geef de optie `hr_locid` op."
+                )
+            wavedata = wavedata.select(wavedata.hr_locid[0])
+
+        if isinstance(wavedata, WaveDataCubeLocation):
+            self.wave_location = wavedata
+            self.df_waveval_id = None
+            self.df_waveval = None
+        else:
+            self.wave_location = None
+            self.df_waveval_id = wavedata
+            self.df_waveval = da.input(input[4])
 
     def _build_wave_provider(self, options: dict) -> WaveDataProvider:
+        if self.wave_location is not None:
+            return WaveDataProvider.from_cube_location(self.wave_location)
         return WaveDataProvider(self.df_waveval_id, self.df_waveval)
 
+    def _cache_inputs(self) -> list[pd.DataFrame | np.ndarray | None]:
+        # de modelonzekerheden zitten al in de opties
+        if self.wave_location is not None:
+            location = self.wave_location
+            return [
+                location.waveval_type,
+                location.windspeed,
+                location.winddir,
+                location.waterlevel,
+                location.values,
+            ]
+        return [self.df_waveval_id, self.df_waveval]
+
     def _build_options(self) -> dict:
         options_raw = self.data_adapter.config.global_variables.get(
             self.options_key, {}
@@ -207,6 +248,18 @@ class FragilityCurveOvertoppingWaveDataMultiple(ToolboxBase):
     measure_id: int | None = None
 
     def run(self, input: list[str], output: str) -> None:
+        """
+        Runt de berekening van de fragility curves voor golfoverslag
+
+        Parameters
+        ----------
+        input: list[str]
+            Lijst namen van de input DataAdapters: slopes, profile, section_hrloc,
+            waveval_uncert, waveval_id en waveval. In plaats van waveval_id en waveval kan
+            ook een enkele DataAdapter van het type `wavedata_cube` worden opgegeven.
+        output: str
+            Naam van de DataAdapter Fragility curve output
+        """
         self.calculate_fragility_curve(input, output)
 
     def calculate_fragility_curve(self, input: list[str], output: str) -> None:
@@ -279,6 +332,22 @@ class FragilityCurveOvertoppingWaveDataMultiple(ToolboxBase):
         with da.temporary_adapter_config(input[4], {"hr_locid": hr_loc}):
             df_wvid = da.input(input[4])
 
+        if isinstance(df_wvid, WaveDataCubeLocation):
+            # golfdata kubus: de grids zijn views, filteren op de brackets is niet nodig
+            wavedata_overrides = {
+                input[4]: {"type": "python", "dataframe_from_python": df_wvid},
+            }
+            return self._run_section(
+                section_id,
+                [input[0], input[1], input[3], input[4]],
+                output,
+                options,
+                df_slopes,
+                df_profile,
+                df_wv_uncert,
+                wavedata_overrides,
+            )
+
         # Unique windspeeds and winddirections for this hr location
         uniq_windspeed = np.sort(df_wvid["windspeed"].unique())
         uniq_winddir = np.sort(df_wvid["winddir"].unique())
@@ -302,22 +371,45 @@ class FragilityCurveOvertoppingWaveDataMultiple(ToolboxBase):
         with da.temporary_adapter_config(input[5], {"waveval_bracket": uniq_wid}):
             df_waveval = da.input(input[5])
 
-        # Calculate fragility curve
-        overrides = {
-            input[0]: {"type": "python", "dataframe_from_python": df_slopes},
-            input[1]: {"type": "python", "dataframe_from_python": df_profile},
-            input[3]: {"type": "python", "dataframe_from_python": df_wv_uncert},
+        wavedata_overrides = {
             input[4]: {"type": "python", "dataframe_from_python": df_wvid},
             input[5]: {"type": "python", "dataframe_from_python": df_waveval},
+        }
+        return self._run_section(
+            section_id,
+            [input[0], input[1], input[3], input[4], input[5]],
+            output,
+            options,
+            df_slopes,
+            df_profile,
+            df_wv_uncert,
+            wavedata_overrides,
+        )
+
+    def _run_section(
+        self,
+        section_id: int,
+        fc_input: list[str],
+        output: str,
+        options: dict,
+        df_slopes: pd.DataFrame,
+        df_profile: pd.DataFrame,
+        df_wv_uncert: pd.DataFrame,
+        wavedata_overrides: dict,
+    ) -> pd.DataFrame:
+        """Berekent de fragility curve van een dijkvak met de geselecteerde (golf)data"""
+        da = self.data_adapter
+        overrides = {
+            fc_input[0]: {"type": "python", "dataframe_from_python": df_slopes},
+            fc_input[1]: {"type": "python", "dataframe_from_python": df_profile},
+            fc_input[2]: {"type": "python", "dataframe_from_python": df_wv_uncert},
+            **wavedata_overrides,
             output: {"type": "python", "dataframe_from_python": pd.DataFrame()},
         }
         with da.temporary_adapters(overrides):
             da.config.global_variables["FragilityCurveOvertoppingWaveData"] = options
-            fc_overtopping = self.fc_function(data_adapter=da)
-            fc_overtopping.run(
-                input=[input[0], input[1], input[3], input[4], input[5]],
-                output=output,
-            )
+            fc_overtopping = self.fc_function._construct(data_adapter=da)
+            fc_overtopping.run(input=fc_input, output=output)
 
             df_fc_overtopping = fc_overtopping.as_dataframe()
             df_fc_overtopping["section_id"] = section_id
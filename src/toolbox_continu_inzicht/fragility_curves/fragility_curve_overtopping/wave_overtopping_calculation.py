@@ -1,7 +1,7 @@
+import functools
 from typing import Any, Dict, List, Tuple
 
 import numpy as np
-import pandas as pd
 import pydra_core
 import pydra_core.location
 from pydra_core.location.model.statistics.stochastics.model_uncertainty import (
@@ -49,8 +49,8 @@ class WaveOvertoppingCalculation:
             if onzekerheid in options:
                 standaard_model_onzekerheden[onzekerheid] = options[onzekerheid]
 
-        self.modelonzekerheid: CustomModelUncertainty = CustomModelUncertainty(
-            standaard_model_onzekerheden
+        self.modelonzekerheid: CustomModelUncertainty = get_custom_model_uncertainty(
+            **standaard_model_onzekerheden
         )
         self.qov = []
         self.kansen = []
@@ -184,6 +184,218 @@ class WaveOvertoppingCalculation:
 
         return niveaus, ovkansqcr
 
+    @classmethod
+    def calculate_overtopping_curves_crest_sweep(
+        cls,
+        windspeed: float,
+        sectormin: float,
+        sectorsize: float,
+        overtopping: object,
+        basis_profiel: object,
+        qcr: float,
+        closing_situation: object,
+        options: Dict[str, Any],
+        wave_provider: WaveProvider,
+        crest_effects: List[float] | np.ndarray,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Berekent de overloopcurves voor meerdere aanpassingen van de kruinhoogte.
+
+        Geeft per effect hetzelfde resultaat als `calculate_overtopping_curve` met een
+        profiel waarvan de kruinhoogte met het effect is verhoogd, maar de profielen,
+        modelonzekerheden en golfcondities worden gedeeld tussen de varianten.
+        Per variant wordt de overslag voor alle combinaties van modelonzekerheid
+        in een aanroep berekend.
+
+        Parameters:
+        -----------
+        windspeed, sectormin, sectorsize, overtopping, basis_profiel, qcr, closing_situation, options, wave_provider
+            Zie `calculate_overtopping_curve`.
+        crest_effects : List[float] | np.ndarray
+            Verhogingen van de kruinhoogte (m), negatief voor een verlaging.
+
+        Returns:
+        --------
+        List[Tuple[np.ndarray, np.ndarray]]
+            Per effect de niveaus en de overloopkansen.
+        """
+        overtopping.closing_situation = closing_situation
+        basis_profiel.closing_situation = closing_situation
+        berekening = cls(overtopping, options, wave_provider)
+        berekening_basis = cls(basis_profiel, options, wave_provider)
+
+        windrichtingen = make_winddirections(sectormin, sectorsize)
+        t_tspec = 1.1
+        if "tp_tspec" in options:
+            t_tspec = options["tp_tspec"]
+
+        original_crestlevel = overtopping.dike_crest_level
+        original_basis_crestlevel = basis_profiel.dike_crest_level
+        crestlevels = [original_crestlevel + effect for effect in crest_effects]
+        try:
+            # Bepaal per variant de dominante windrichting en het waterstandsgrid
+            richtingen = []
+            lst_waterlevels = []
+            for crestlevel in crestlevels:
+                basis_profiel.set_dike_crest_level(crestlevel)
+                ir = berekening_basis.bepaal_dominante_richting(
+                    crestlevel - 0.5,
+                    windspeed,
+                    windrichtingen,
+                    t_tspec,
+                )
+                richtingen.append(windrichtingen[ir])
+                lst_waterlevels.append(build_waterlevel_grid(crestlevel, options))
+
+            # Golfcondities een keer per richting, voor alle waterstanden van de varianten
+            wave_conditions = {}
+            for richting in np.unique(richtingen):
+                all_waterlevels = np.unique(
+                    np.concatenate(
+                        [
+                            waterlevels
+                            for waterlevels, r in zip(lst_waterlevels, richtingen)
+                            if r == richting
+                        ]
+                    )
+                )
+                hs_dw, tspec_dw, wave_direction = (
+                    berekening.wave_provider.get_wave_conditions_for_levels(
+                        windspeed=windspeed,
+                        direction=richting,
+                        waterlevels=all_waterlevels[:, None],
+                    )
+                )
+                wave_conditions[richting] = (
+                    all_waterlevels,
+                    np.ravel(hs_dw),
+                    np.ravel(tspec_dw),
+                    np.ravel(wave_direction),
+                )
+
+            # De combinaties van modelonzekerheid zijn voor alle varianten gelijk
+            model_uncertainties = list(
+                berekening.modelonzekerheid.iterate_model_uncertainty_wave_conditions(
+                    closing_situation=closing_situation
+                )
+            )
+            factors_hs = np.array([factor for factor, _, _ in model_uncertainties])
+            factors_tspec = np.array([factor for _, factor, _ in model_uncertainties])
+
+            results = []
+            for crestlevel, richting, waterlevels in zip(
+                crestlevels, richtingen, lst_waterlevels
+            ):
+                all_waterlevels, hs_all, tspec_all, direction_all = wave_conditions[
+                    richting
+                ]
+                idx = np.searchsorted(all_waterlevels, waterlevels)
+                hs_dw, tspec_dw = hs_all[idx], tspec_all[idx]
+
+                # Alle combinaties van modelonzekerheid achter elkaar in een aanroep
+                n_levels = len(waterlevels)
+                hs = factors_hs[:, None] * hs_dw[None, :]
+                tspec = factors_tspec[:, None] * tspec_dw[None, :]
+                overtopping.set_dike_crest_level(crestlevel)
+                qov = np.atleast_1d(
+                    overtopping.calculate_overtopping(
+                        water_level=np.tile(waterlevels, len(model_uncertainties)),
+                        significant_wave_height=hs.ravel(),
+                        spectral_wave_period=tspec.ravel(),
+                        wave_direction=np.tile(
+                            direction_all[idx], len(model_uncertainties)
+                        ),
+                        tp_tspec=t_tspec,
+                        dll_settings=None,
+                    )
+                ).reshape(len(model_uncertainties), n_levels)
+
+                ovkansqcr = np.zeros(n_levels)
+                for i, (_, _, onzkans) in enumerate(model_uncertainties):
+                    ovkansqcr += compute_failure_probability(
+                        qov[i], qcr, hs[i], onzkans
+                    )
+                results.append((waterlevels, ovkansqcr))
+        finally:
+            overtopping.set_dike_crest_level(original_crestlevel)
+            basis_profiel.set_dike_crest_level(original_basis_crestlevel)
+
+        return results
+
+    @classmethod
+    def calculate_overtopping_surface(
+        cls,
+        windspeeds: List[float] | np.ndarray,
+        sectormin: float,
+        sectorsize: float,
+        overtopping: object,
+        basis_profiel: object,
+        qcr: float,
+        closing_situation: object,
+        options: Dict[str, Any],
+        wave_provider: WaveProvider,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Berekent de overloopkansen voor meerdere windsnelheden in een keer.
+
+        Per windsnelheid is het resultaat gelijk aan `calculate_overtopping_curve`. De
+        dominante windrichting wordt per windsnelheid bepaald; windsnelheden met dezelfde
+        richting worden samen in `bereken_fc_cond` berekend.
+
+        Parameters:
+        -----------
+        windspeeds : List[float] | np.ndarray
+            De windsnelheden.
+        sectormin, sectorsize, overtopping, basis_profiel, qcr, closing_situation, options, wave_provider
+            Zie `calculate_overtopping_curve`.
+
+        Returns:
+        --------
+        niveaus : np.ndarray
+            De niveaus, gelijk voor alle windsnelheden.
+        ovkansqcr : np.ndarray
+            De overloopkansen met de vorm (windsnelheden, niveaus).
+        """
+        windspeeds = np.atleast_1d(np.asarray(windspeeds, dtype=float))
+        overtopping.closing_situation = closing_situation
+        basis_profiel.closing_situation = closing_situation
+        berekening = cls(overtopping, options, wave_provider)
+        berekening_basis = cls(basis_profiel, options, wave_provider)
+
+        windrichtingen = make_winddirections(sectormin, sectorsize)
+        t_tspec = 1.1
+        if "tp_tspec" in options:
+            t_tspec = options["tp_tspec"]
+
+        richtingen = np.array(
+            [
+                windrichtingen[
+                    berekening_basis.bepaal_dominante_richting(
+                        overtopping.dike_crest_level - 0.5,
+                        windspeed,
+                        windrichtingen,
+                        t_tspec,
+                    )
+                ]
+                for windspeed in windspeeds
+            ]
+        )
+
+        niveaus = build_waterlevel_grid(overtopping.dike_crest_level, options)
+        ovkansqcr = np.zeros((len(windspeeds), len(niveaus)))
+        for richting in np.unique(richtingen):
+            idx = richtingen == richting
+            niveaus, ovkansqcr[idx] = berekening.bereken_fc_cond(
+                richting=richting,
+                windsnelheid=windspeeds[idx],
+                qcr=qcr,
+                crestlevel=overtopping.dike_crest_level,
+                closing_situation=closing_situation,
+                t_tspec=t_tspec,
+                options=options,
+            )
+        return niveaus, ovkansqcr
+
     def bepaal_dominante_richting(
         self,
         level: float,
@@ -231,7 +443,7 @@ class WaveOvertoppingCalculation:
     def bereken_fc_cond(
         self,
         richting: float,
-        windsnelheid: float,
+        windsnelheid: float | np.ndarray,
         qcr: float,
         t_tspec: float,
         crestlevel: float,
@@ -245,8 +457,8 @@ class WaveOvertoppingCalculation:
         -----------
         richting : float
             De windrichting.
-        windsnelheid : float
-            De windsnelheid.
+        windsnelheid : float | np.ndarray
+            De windsnelheid, of een 1-D array met windsnelheden.
         qcr : float
             De kritieke afvoer.
         t_tspec : float
@@ -261,7 +473,8 @@ class WaveOvertoppingCalculation:
         Returns:
         --------
         Tuple[np.ndarray, np.ndarray]
-            Een tuple met de niveaus en overloopkansen.
+            Een tuple met de niveaus en overloopkansen. Bij een array met windsnelheden
+            hebben de overloopkansen de vorm (windsnelheden, niveaus).
         """
         # Stel standaardwaarden in
         waterlevels = build_waterlevel_grid(crestlevel, options)[:, None]
@@ -271,9 +484,11 @@ class WaveOvertoppingCalculation:
             direction=richting,
             waterlevels=waterlevels,
         )
+        # bij meerdere windsnelheden worden alle punten in een aanroep berekend
+        water_level = np.broadcast_to(waterlevels, hs_dw.shape)
 
         # Alloceer lege array om kansen aan toe te kennen
-        ovkansqcr = np.zeros(len(waterlevels))
+        ovkansqcr = np.zeros(hs_dw.shape[:-1])
 
         # Voor elke combinatie van modelonzekerheid
         for (
@@ -289,7 +504,7 @@ class WaveOvertoppingCalculation:
                 tspec_dw * factor_tspec,
             )
             qov = self.profile.calculate_overtopping(
-                water_level=waterlevels.flatten(),
+                water_level=water_level.flatten(),
                 significant_wave_height=hs.flatten(),
                 spectral_wave_period=tspec.flatten(),
                 wave_direction=richting.flatten(),
@@ -298,7 +513,9 @@ class WaveOvertoppingCalculation:
             )
             qov = np.array(qov)
             self.qov.append(qov * 1000)
-            ovkansqcr += compute_failure_probability(qov, qcr, hs, onzkans)
+            ovkansqcr += compute_failure_probability(qov, qcr, hs, onzkans).reshape(
+                ovkansqcr.shape
+            )
         return waterlevels.squeeze(), ovkansqcr
 
 
@@ -322,22 +539,65 @@ class CustomModelUncertainty(ModelUncertainty):
             "tspec": standaard_model_onzekerheden["gp_onz_aantal"],
         }
 
-        mu = pd.DataFrame(columns=["k", "rvid", "mean", "stdev"])
-        mu.loc[0, "k"] = standaard_model_onzekerheden["closing_situation"]
-        mu.loc[0, "rvid"] = "hs"
-        mu.loc[0, "mean"] = standaard_model_onzekerheden["gh_onz_mu"]
-        mu.loc[0, "stdev"] = standaard_model_onzekerheden["gh_onz_sigma"]
+        closing_situation = standaard_model_onzekerheden["closing_situation"]
+        for rvid, mean, stdev in [
+            (
+                "hs",
+                standaard_model_onzekerheden["gh_onz_mu"],
+                standaard_model_onzekerheden["gh_onz_sigma"],
+            ),
+            (
+                "tspec",
+                standaard_model_onzekerheden["gp_onz_mu_tspec"],
+                standaard_model_onzekerheden["gp_onz_sigma_tspec"],
+            ),
+        ]:
+            self.model_uncertainties[(closing_situation, rvid)] = (
+                DistributionUncertainty([closing_situation, rvid, mean, stdev])
+            )
+        self._wave_condition_combinations = {}
 
-        mu.loc[1, "k"] = standaard_model_onzekerheden["closing_situation"]
-        mu.loc[1, "rvid"] = "tspec"
-        mu.loc[1, "mean"] = standaard_model_onzekerheden["gp_onz_mu_tspec"]
-        mu.loc[1, "stdev"] = standaard_model_onzekerheden["gp_onz_sigma_tspec"]
+    def iterate_model_uncertainty_wave_conditions(
+        self, closing_situation: int = 1, wave_period: str = "tspec"
+    ):
+        """
+        Zie `ModelUncertainty.iterate_model_uncertainty_wave_conditions`, de combinaties
+        worden per sluitsituatie een keer bepaald en daarna hergebruikt.
+        """
+        key = (closing_situation, wave_period)
+        if key not in self._wave_condition_combinations:
+            self._wave_condition_combinations[key] = list(
+                super().iterate_model_uncertainty_wave_conditions(
+                    closing_situation=closing_situation, wave_period=wave_period
+                )
+            )
+        yield from self._wave_condition_combinations[key]
+
+
+@functools.lru_cache(maxsize=128)
+def get_custom_model_uncertainty(
+    gh_onz_mu: float,
+    gh_onz_sigma: float,
+    gp_onz_mu_tspec: float,
+    gp_onz_sigma_tspec: float,
+    gh_onz_aantal: int,
+    gp_onz_aantal: int,
+    closing_situation: int,
+) -> CustomModelUncertainty:
+    """Geeft een (gedeelde) CustomModelUncertainty voor de gegeven modelonzekerheden"""
+    return CustomModelUncertainty(
+        {
+            "gh_onz_mu": gh_onz_mu,
+            "gh_onz_sigma": gh_onz_sigma,
+            "gp_onz_mu_tspec": gp_onz_mu_tspec,
+            "gp_onz_sigma_tspec": gp_onz_sigma_tspec,
+            "gh_onz_aantal": gh_onz_aantal,
+            "gp_onz_aantal": gp_onz_aantal,
+            "closing_situation": closing_situation,
+        }
+    )
 
-        # Zorg ervoor dat de index voor alle punten hetzelfde is, zodat deze overeenkomt met de oorspronkelijke implementatie
-        mu.index = [0, 0]
-        mu.index.name = "HRDLocationId"
 
-        for comb, uncertainty in mu.groupby(["k", "rvid"]):
-            self.model_uncertainties[comb] = DistributionUncertainty(
-                uncertainty.to_numpy()[0]
-            )
+def clear_pydra_cache() -> None:
+    """Leegt de cache met modelonzekerheden"""
+    get_custom_model_uncertainty.cache_clear()
@@ -6,10 +6,14 @@ from typing import Protocol
 import numpy as np
 import pandas as pd
 
+from toolbox_continu_inzicht.base.adapters.input.wavedata.cube_wavedata import (
+    WaveDataCubeLocation,
+)
 from toolbox_continu_inzicht.fragility_curves.fragility_curve_overtopping.pydra_legacy import (
     bretschneider,
 )
 from toolbox_continu_inzicht.utils.interpolate import (
+    InterpolationPlan,
     bracketing_indices,
     circular_interpolate_1d,
     interpolate_1d,
@@ -53,7 +57,7 @@ class WaveProvider(Protocol):
 
     def get_wave_conditions_for_levels(
         self,
-        windspeed: float,
+        windspeed: float | np.ndarray,
         direction: float,
         waterlevels: np.ndarray,
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
@@ -62,8 +66,8 @@ class WaveProvider(Protocol):
 
         Parameters
         ----------
-        windspeed : float
-            Windsnelheid.
+        windspeed : float | np.ndarray
+            Windsnelheid, of een 1-D array met windsnelheden.
         direction : float
             Windrichting (graden).
         waterlevels : np.ndarray
@@ -72,7 +76,8 @@ class WaveProvider(Protocol):
         Returns
         -------
         tuple[np.ndarray, np.ndarray, np.ndarray]
-            hs, tspec en wave_direction per waterlevel.
+            hs, tspec en wave_direction per waterlevel. Bij een array met windsnelheden
+            hebben de arrays een extra eerste as voor de windsnelheid.
         """
 
 
@@ -115,11 +120,20 @@ class BretschneiderWaveProvider(WaveProvider):
 
     def get_wave_conditions_for_levels(
         self,
-        windspeed: float,
+        windspeed: float | np.ndarray,
         direction: float,
         waterlevels: np.ndarray,
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         waterlevels = np.asarray(waterlevels, dtype=float)
+        if np.ndim(windspeed) > 0:
+            # extra eerste as voor de windsnelheden
+            windspeed = np.asarray(windspeed, dtype=float)
+            waterlevels = np.broadcast_to(
+                waterlevels, windspeed.shape + waterlevels.shape
+            )
+            windspeed = windspeed.reshape(
+                windspeed.shape + (1,) * (waterlevels.ndim - 1)
+            )
         bedlevel = float(
             np.interp([direction], self.windrichtingen, self.bedlevel, period=360)[0]
         )
@@ -140,6 +154,9 @@ class BretschneiderWaveProvider(WaveProvider):
 class WaveDataProvider(WaveProvider):
     """
     WaveProvider implementatie op basis van voorberekende golfcondities.
+
+    Per golfparameter wordt bij het aanmaken eenmalig een grid met de assen windsnelheid x
+    windrichting x waterstand opgebouwd, dat bij elke interpolatie wordt hergebruikt.
     """
 
     def __init__(self, df_waveval_id: pd.DataFrame, df_waveval: pd.DataFrame) -> None:
@@ -152,6 +169,40 @@ class WaveDataProvider(WaveProvider):
             if required_wvt.value not in self.waveval_by_type:
                 raise KeyError(f"{required_wvt} is not present in df_waveval_id")
 
+        self.grid_by_type = {}
+        for wvt, group in self.waveval_by_type.items():
+            wsv, ws_idx = np.unique(group["windspeed"].to_numpy(), return_inverse=True)
+            wdv, wd_idx = np.unique(group["winddir"].to_numpy(), return_inverse=True)
+            wlv, wl_idx = np.unique(group["waterlevel"].to_numpy(), return_inverse=True)
+
+            grid_wswdwl = np.full((wsv.size, wdv.size, wlv.size), np.nan, dtype=float)
+            grid_wswdwl[ws_idx, wd_idx, wl_idx] = group["waveval"].to_numpy()
+            self.grid_by_type[wvt] = (wsv, wdv, wlv, grid_wswdwl)
+
+    @classmethod
+    def from_cube_location(cls, location: WaveDataCubeLocation) -> WaveDataProvider:
+        """
+        Maakt een WaveDataProvider van de golfcondities van een locatie uit een golfdata kubus.
+
+        De grids zijn views op de (memory mapped) kubus, er wordt geen data gekopieerd.
+
+        Parameters
+        ----------
+        location : WaveDataCubeLocation
+            Golfcondities van een locatie, zie `input_wavedata_cube`.
+        """
+        provider = cls.__new__(cls)
+        provider.waveval_by_type = {}
+        provider.grid_by_type = {}
+        for required_wvt in WaveType:
+            provider.grid_by_type[required_wvt.value] = (
+                location.windspeed,
+                location.winddir,
+                location.waterlevel,
+                location.get_grid(required_wvt.value),
+            )
+        return provider
+
     def _interpolate_type_for_directions(
         self,
         waveval_type: int,
@@ -159,18 +210,7 @@ class WaveDataProvider(WaveProvider):
         windrichtingen: np.ndarray,
         waterlevel: float,
     ) -> np.ndarray:
-        group = self.waveval_by_type[waveval_type]
-        ws = group["windspeed"].to_numpy()
-        wd = group["winddir"].to_numpy()
-        wl = group["waterlevel"].to_numpy()
-        wy = group["waveval"].to_numpy()
-
-        wsv, ws_idx = np.unique(ws, return_inverse=True)
-        wdv, wd_idx = np.unique(wd, return_inverse=True)
-        wlv, wl_idx = np.unique(wl, return_inverse=True)
-
-        grid_wswdwl = np.full((wsv.size, wdv.size, wlv.size), np.nan, dtype=float)
-        grid_wswdwl[ws_idx, wd_idx, wl_idx] = wy
+        wsv, wdv, wlv, grid_wswdwl = self.grid_by_type[waveval_type]
 
         i1, i2, fws = bracketing_indices(wsv, windspeed)
         grid_wdwl = (1 - fws) * grid_wswdwl[i1, :, :] + fws * grid_wswdwl[i2, :, :]
@@ -187,35 +227,42 @@ class WaveDataProvider(WaveProvider):
     def _interpolate_type_for_levels(
         self,
         waveval_type: int,
-        windspeed: float,
+        windspeed: float | np.ndarray,
         direction: float,
         waterlevels: np.ndarray,
     ) -> np.ndarray:
-        group = self.waveval_by_type[waveval_type]
-        ws = group["windspeed"].to_numpy()
-        wd = group["winddir"].to_numpy()
-        wl = group["waterlevel"].to_numpy()
-        wy = group["waveval"].to_numpy()
-
-        wsv, ws_idx = np.unique(ws, return_inverse=True)
-        wdv, wd_idx = np.unique(wd, return_inverse=True)
-        wlv, wl_idx = np.unique(wl, return_inverse=True)
-
-        grid_wswdwl = np.full((wsv.size, wdv.size, wlv.size), np.nan, dtype=float)
-        grid_wswdwl[ws_idx, wd_idx, wl_idx] = wy
-
-        i1, i2, fws = bracketing_indices(wsv, windspeed)
-        grid_wdwl = (1 - fws) * grid_wswdwl[i1, :, :] + fws * grid_wswdwl[i2, :, :]
-
+        wsv, wdv, wlv, grid_wswdwl = self.grid_by_type[waveval_type]
+
+        # per windsnelheid een grid van richting x waterstand
+        windspeeds = np.atleast_1d(windspeed)
+        grid_wdwl = np.empty((windspeeds.size, wdv.size, wlv.size), dtype=float)
+        for i, windspeed_i in enumerate(windspeeds):
+            i1, i2, fws = bracketing_indices(wsv, windspeed_i)
+            grid_wdwl[i] = (1 - fws) * grid_wswdwl[i1, :, :] + fws * grid_wswdwl[
+                i2, :, :
+            ]
+
+        # interpoleer de richting langs de eerste as: (richting, windsnelheid, waterstand)
         wd_ext = np.concatenate([wdv - 360.0, wdv, wdv + 360.0])
-        grid_wd_ext = np.concatenate([grid_wdwl, grid_wdwl, grid_wdwl], axis=0)
+        grid_wd_ext = np.concatenate([grid_wdwl, grid_wdwl, grid_wdwl], axis=1)
         grid_wl = interpolate_1d(
-            np.array([direction]), wd_ext, grid_wd_ext, ll=-np.inf
+            np.array([direction]), wd_ext, grid_wd_ext.transpose(1, 0, 2), ll=-np.inf
         )[0]
 
+        # alle windsnelheden met dezelfde indices op de waterstanden
+        plan = InterpolationPlan(waterlevels, wlv)
         if waveval_type == WaveType.WAVEDIRECTION.value:
-            return circular_interpolate_1d(waterlevels, wlv, grid_wl, ll=-np.inf)
-        return interpolate_1d(waterlevels, wlv, grid_wl, ll=-np.inf)
+            # zie circular_interpolate_1d
+            angles = np.deg2rad(grid_wl)
+            x_i = plan.apply(np.cos(angles), stacked=True)
+            y_i = plan.apply(np.sin(angles), stacked=True)
+            values = (np.rad2deg(np.arctan2(y_i, x_i)) + 360.0) % 360.0
+        else:
+            values = plan.apply(grid_wl, stacked=True)
+
+        if np.ndim(windspeed) == 0:
+            return values[0]
+        return values
 
     def get_wave_conditions_for_directions(
         self,
@@ -236,7 +283,7 @@ class WaveDataProvider(WaveProvider):
 
     def get_wave_conditions_for_levels(
         self,
-        windspeed: float,
+        windspeed: float | np.ndarray,
         direction: float,
         waterlevels: np.ndarray,
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
@@ -1,5 +1,6 @@
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from toolbox_continu_inzicht import DataAdapter
 from toolbox_continu_inzicht.fragility_curves import (
@@ -70,3 +71,23 @@ class ShiftFragilityCurvePipingFixedWaterlevel(FragilityCurvePipingFixedWaterlev
         self.calculate_fragility_curve(input, output)
         self.shift(effect)
         self.data_adapter.output(output=output, df=self.as_dataframe())
+
+    def run_sweep(
+        self, input: list[str], output: str, effects: list[float] | np.ndarray
+    ) -> None:
+        """
+        Runt de berekening van de fragility curve voor piping een keer en verschuift deze met meerdere effecten.
+
+        Parameters
+        ----------
+        input: list[str]
+            Lijst namen van de input dataadapters: prob_input, hydraulicload
+        output: str
+            Naam van de dataadapter voor de fragility curves, een lange tabel met de kolommen
+            effect, hydraulicload en failure_probability
+        effects: list[float] | np.ndarray
+            De waardes waarmee de fragility curve wordt verschoven, eenheid is hetzelfde als je hydraulicload.
+        """
+        self.calculate_fragility_curve(input, output)
+        self.df_out = self.as_shifted_dataframe(effects)
+        self.data_adapter.output(output=output, df=self.df_out)
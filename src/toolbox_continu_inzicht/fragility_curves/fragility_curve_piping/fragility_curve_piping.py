@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from probabilistic_piping import (
     ProbInput,
@@ -9,6 +10,10 @@ from probabilistic_piping import (
 from pydantic.dataclasses import dataclass
 
 from toolbox_continu_inzicht import ToolboxBase, Config, DataAdapter, FragilityCurve
+from toolbox_continu_inzicht.base.fragility_curve_cache import (
+    cached_calculation,
+    resolve_cache_dir,
+)
 
 
 @dataclass(config={"arbitrary_types_allowed": True})
@@ -104,9 +109,10 @@ class FragilityCurvePipingFixedWaterlevel(FragilityCurve):
         global_variables = self.data_adapter.config.global_variables
         progress: bool = False
         debug: bool = False
+        options: dict = {}
         if "FragilityCurvePipingFixedWaterlevel" in global_variables:
             # neem opties over van de config
-            options: dict = global_variables["FragilityCurvePipingFixedWaterlevel"]
+            options = global_variables["FragilityCurvePipingFixedWaterlevel"]
 
             if "progress" in options:
                 progress: bool = options["progress"]
@@ -114,32 +120,55 @@ class FragilityCurvePipingFixedWaterlevel(FragilityCurve):
             if "debug" in options:
                 debug: bool = options["debug"]
 
-        prob_input = ProbInput().from_dataframe(self.df_prob_input)
-        prob_piping_fixed_waterlevel_simple = ProbPipingFixedWaterlevelSimple(
-            progress=progress,
-            debug=debug,
-        )
-        settings, result_uplift, result_heave, result_Sellmeijer, result_combined = (
-            prob_piping_fixed_waterlevel_simple.fixed_waterlevel_fragilitycurve(
-                prob_input=prob_input,
-                hlist=self.df_hydraulicload["hydraulicload"].to_numpy(),
-            )
-        )
-
-        # zet de resultaten om in DataFrames voor elk mechanisme
+        hydraulicload = self.df_hydraulicload["hydraulicload"].to_numpy()
         df_names = [
             "df_result_uplift",
             "df_result_heave",
             "df_result_sellmeijer",
             "df_result_combined",
         ]
-        for name, result in zip(
-            df_names, [result_uplift, result_heave, result_Sellmeijer, result_combined]
-        ):
+
+        def calculate() -> dict[str, np.ndarray]:
+            prob_input = ProbInput().from_dataframe(self.df_prob_input)
+            prob_piping_fixed_waterlevel_simple = ProbPipingFixedWaterlevelSimple(
+                progress=progress,
+                debug=debug,
+            )
+            (
+                settings,
+                result_uplift,
+                result_heave,
+                result_Sellmeijer,
+                result_combined,
+            ) = prob_piping_fixed_waterlevel_simple.fixed_waterlevel_fragilitycurve(
+                prob_input=prob_input,
+                hlist=hydraulicload,
+            )
+            return {
+                name: np.array(
+                    [(res.h, res.prob_cond) for res in result.results], dtype=float
+                ).reshape(-1, 2)
+                for name, result in zip(
+                    df_names,
+                    [result_uplift, result_heave, result_Sellmeijer, result_combined],
+                )
+            }
+
+        # met de optie `cache_dir` wordt een eerder berekende curve met dezelfde input hergebruikt
+        results = cached_calculation(
+            self.data_adapter,
+            options,
+            key_prefix="FragilityCurvePipingFixedWaterlevel",
+            frames=[self.df_prob_input, hydraulicload],
+            calculate=calculate,
+        )
+
+        # zet de resultaten om in DataFrames voor elk mechanisme
+        for name in df_names:
             self.__setattr__(
                 name,
                 pd.DataFrame(
-                    data=[(res.h, res.prob_cond) for res in result.results],
+                    data=results[name],
                     columns=["hydraulicload", "failure_probability"],
                 ),
             )
@@ -257,9 +286,9 @@ class FragilityCurvePipingMultiple(ToolboxBase):
 
                 temp_data_adapter.config.global_variables[
                     "FragilityCurvePipingFixedWaterlevel"
-                ] = update_options_dict_debug_progress(options)
+                ] = update_options_dict_debug_progress(options, global_variables)
 
-                fragility_curve = self.fragility_curve_function_simple(
+                fragility_curve = self.fragility_curve_function_simple._construct(
                     data_adapter=temp_data_adapter
                 )
 
@@ -276,9 +305,14 @@ class FragilityCurvePipingMultiple(ToolboxBase):
         self.data_adapter.output(output, self.df_out)
 
 
-def update_options_dict_debug_progress(options):
+def update_options_dict_debug_progress(options, global_variables: dict | None = None):
     new_options = {}
-    for key in ["progress", "debug"]:
+    for key in ["progress", "debug", "cache_dir", "cache_max_size_mb"]:
         if key in options:
             new_options[key] = options[key]
+    # de tijdelijke DataAdapter heeft geen rootdir, maak de cache map daarom absoluut
+    if "cache_dir" in new_options and global_variables is not None:
+        new_options["cache_dir"] = str(
+            resolve_cache_dir(global_variables, new_options["cache_dir"])
+        )
     return new_options
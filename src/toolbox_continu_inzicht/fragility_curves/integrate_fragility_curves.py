@@ -71,9 +71,11 @@ class IntegrateFragilityCurve(ToolboxBase):
         self.df_exceedance_frequency = self.data_adapter.input(input[0])
         self.df_fragility_curve = self.data_adapter.input(input[1])
 
-        exceedance_frequency_curve = ExceedanceFrequencyCurve(self.data_adapter)
+        exceedance_frequency_curve = ExceedanceFrequencyCurve._construct(
+            data_adapter=self.data_adapter
+        )
         exceedance_frequency_curve.load(input[0])
-        fragility_curve = FragilityCurve(self.data_adapter)
+        fragility_curve = FragilityCurve._construct(data_adapter=self.data_adapter)
         fragility_curve.interp_func = self.interp_func
         fragility_curve.load(input[1])
 
@@ -199,7 +201,9 @@ class IntegrateFragilityCurveMultiple(IntegrateFragilityCurve):
         self.df_exceedance_frequency = self.data_adapter.input(input[0])
         self.df_fragility_curve = self.data_adapter.input(input[1])
 
-        exceedance_frequency_curve = ExceedanceFrequencyCurve(self.data_adapter)
+        exceedance_frequency_curve = ExceedanceFrequencyCurve._construct(
+            data_adapter=self.data_adapter
+        )
         exceedance_frequency_curve.load(input[0])
 
         global_variables = self.data_adapter.config.global_variables
@@ -215,7 +219,7 @@ class IntegrateFragilityCurveMultiple(IntegrateFragilityCurve):
             )
             if status > 0:
                 raise UserWarning(message)
-            fragility_curve = FragilityCurve(self.data_adapter)
+            fragility_curve = FragilityCurve._construct(data_adapter=self.data_adapter)
             fragility_curve.interp_func = self.interp_func
             fragility_curve.from_dataframe(df_fc)
             result = self.calculate_integration(
@@ -1,10 +1,12 @@
 from typing import ClassVar, Optional
 
+import numpy as np
 import pandas as pd
 from pydantic.dataclasses import dataclass
 
 from toolbox_continu_inzicht import DataAdapter, FragilityCurve
 from toolbox_continu_inzicht.base.base_module import ToolboxBase
+from toolbox_continu_inzicht.utils.interpolate import grouped_x_interpolate_1d
 
 """
 Load cached fragility curve heeft 3 niveas:
@@ -107,7 +109,7 @@ class LoadCachedFragilityCurveOneFailureMechanism(ToolboxBase):
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
         """Functie om hergebruik toe te staan van LoadCachedFragilityCurveOneFailureMechanism door LoadCachedFragilityCurve"""
 
-        fragility_curve = FragilityCurve(self.data_adapter)
+        fragility_curve = FragilityCurve._construct(data_adapter=self.data_adapter)
         # measures zijn configurabel
         global_variables = self.data_adapter.config.global_variables
         options = global_variables.get("LoadCachedFragilityCurve", {})
@@ -419,33 +421,182 @@ class LoadCachedFragilityCurveMultiple(LoadCachedFragilityCurve):
             df_section_to_measure_id = self.data_adapter.input(
                 input[2], schema=self.section_id_to_measure_id_schema
             )
-        section_ids = list(df_fragility_curves["section_id"].unique())
-        lst_selected_curves = []
-        lst_initial_curves = []
-        for section in section_ids:
-            df_fragility_curves_per_section = df_fragility_curves[
-                df_fragility_curves["section_id"] == section
-            ]
-            if measure_id is None:
-                corresponding_measure_id = df_section_to_measure_id[
-                    df_section_to_measure_id["section_id"] == section
-                ]
-
-            input_per_section, output_per_section = (
-                self.retrieve_cache_for_multiple_failure_mechanisms(
-                    df_fragility_curves_per_section,
-                    df_measures_to_effect,
-                    corresponding_measure_id,
-                )
-            )
-            output_per_section["section_id"] = section
-            output_per_section["measure_id"] = measure_id
-            lst_selected_curves.append(output_per_section)
-            lst_initial_curves.append(input_per_section)
-
-        self.df_in = pd.concat(lst_initial_curves, ignore_index=True)
-        self.df_out = pd.concat(lst_selected_curves, ignore_index=True)
+        if measure_id is None:
+            corresponding_measure_id = df_section_to_measure_id
+        self.df_in, self.df_out = self.retrieve_cache_for_multiple_sections(
+            df_fragility_curves,
+            df_measures_to_effect,
+            corresponding_measure_id,
+        )
         self.df_out = self.df_out[
             list(self.cache_fragility_curve_schema.keys())
         ]  # fix column order
         self.data_adapter.output(output, self.df_out)
+
+    def retrieve_cache_for_multiple_sections(
+        self,
+        df_fragility_curves: pd.DataFrame,
+        df_measures_to_effect: pd.DataFrame,
+        measure_id: int | pd.DataFrame,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Haalt voor alle vakken en faalmechanismen in een keer de fragility curve van de maatregel op
+
+        De curves worden eenmalig gesorteerd op (section_id, failuremechanism_id, measure_id),
+        waarna elke curve een aaneengesloten blok is. Aanwezige curves worden met deze blokken
+        opgehaald; curves die niet aanwezig zijn worden in een keer verschoven met het effect
+        van de maatregel, net als `FragilityCurve.shift`.
+
+        Parameters
+        ----------
+        df_fragility_curves: pd.DataFrame
+            Fragility curves voor meerdere vakken, faalmechanismen en measure_ids
+        df_measures_to_effect: pd.DataFrame
+            Effect per measure_id, gebruikt als een curve niet aanwezig is
+        measure_id: int | pd.DataFrame
+            Measure_id voor alle curves, of een koppelingstabel met per section_id en
+            failuremechanism_id de measure_id
+
+        Returns
+        -------
+        tuple[pd.DataFrame, pd.DataFrame]
+            De basis curves en de geselecteerde curves
+        """
+        global_variables = self.data_adapter.config.global_variables
+        options = global_variables.get("LoadCachedFragilityCurve", {})
+        default_measure_value = options.get("default_measure_id", 0)
+
+        curve_columns = ["section_id", "failuremechanism_id", "measure_id"]
+        pair_columns = ["section_id", "failuremechanism_id"]
+
+        # Sorteer een keer, zodat elke curve een aaneengesloten blok met rijen is.
+        # De originele volgorde binnen een curve blijft behouden.
+        df_sorted = df_fragility_curves.sort_values(
+            curve_columns, kind="stable"
+        ).reset_index(drop=True)
+        curve = df_sorted.groupby(curve_columns, sort=False).ngroup().to_numpy()
+        curve_start = np.flatnonzero(np.r_[True, curve[1:] != curve[:-1]])
+        curve_end = np.r_[curve_start[1:], len(curve)]
+        df_index = df_sorted.loc[curve_start, curve_columns].reset_index(drop=True)
+        df_index["start"] = curve_start
+        df_index["end"] = curve_end
+
+        # Curves zoals FragilityCurve.from_dataframe ze inleest: gesorteerd en monotoon stijgend
+        df_processed = df_sorted.sort_values(
+            curve_columns + ["hydraulicload", "failure_probability"], kind="stable"
+        )
+        processed_hydraulicload = df_processed["hydraulicload"].to_numpy(dtype=float)
+        processed_failure_probability = (
+            df_processed["failure_probability"]
+            .groupby(curve, sort=False)
+            .cummax()
+            .to_numpy(dtype=float)
+        )
+
+        # Per vak en faalmechanisme de gevraagde maatregel
+        # (in dezelfde volgorde als de vakken en daarbinnen de faalmechanismen voorkomen)
+        df_pairs = df_fragility_curves[pair_columns].drop_duplicates(ignore_index=True)
+        section_order = {
+            section: order
+            for order, section in enumerate(df_pairs["section_id"].unique())
+        }
+        df_pairs = df_pairs.iloc[
+            np.argsort(df_pairs["section_id"].map(section_order), kind="stable")
+        ].reset_index(drop=True)
+        if isinstance(measure_id, pd.DataFrame):
+            df_measure = measure_id[pair_columns + ["measure_id"]].drop_duplicates(
+                pair_columns
+            )
+            df_pairs = df_pairs.merge(df_measure, on=pair_columns, how="left")
+            if df_pairs["measure_id"].isna().any():
+                missing = df_pairs.loc[df_pairs["measure_id"].isna(), pair_columns]
+                raise UserWarning(
+                    f"Geen measure_id gevonden in de koppelingstabel voor:\n{missing.to_string(index=False)}"
+                )
+            df_pairs["measure_id"] = df_pairs["measure_id"].astype(
+                df_fragility_curves["measure_id"].dtype
+            )
+        else:
+            df_pairs["measure_id"] = measure_id
+
+        df_base = df_pairs[pair_columns].merge(
+            df_index[df_index["measure_id"] == default_measure_value],
+            on=pair_columns,
+            how="left",
+        )
+        if df_base["start"].isna().any():
+            raise ValueError(
+                f"Er is geen basis fragility curve (measure_id {default_measure_value}) aanwezig. Zorg dat de input data klopt of pas "
+                f"de default_measure_id aan in de input data adapter onder LoadCachedFragilityCurve:\ndefault_measure_id:"
+            )
+        df_selected = df_pairs.merge(df_index, on=curve_columns, how="left")
+        base_start = df_base["start"].to_numpy(dtype=np.intp)
+        base_end = df_base["end"].to_numpy(dtype=np.intp)
+
+        is_default = (df_pairs["measure_id"] == default_measure_value).to_numpy()
+        is_cached = ~is_default & df_selected["start"].notna().to_numpy()
+        is_shifted = ~is_default & ~is_cached
+
+        # de basis curve wordt ongewijzigd teruggegeven, een gecachte curve zoals ingelezen,
+        # anders de basis curve die verschoven wordt
+        start = np.where(is_cached, df_selected["start"].fillna(0), base_start).astype(
+            np.intp
+        )
+        end = np.where(is_cached, df_selected["end"].fillna(0), base_end).astype(
+            np.intp
+        )
+        rows, pair = _block_indices(start, end)
+
+        hydraulicload = np.where(
+            is_default[pair],
+            df_sorted["hydraulicload"].to_numpy(dtype=float)[rows],
+            processed_hydraulicload[rows],
+        )
+        failure_probability = np.where(
+            is_default[pair],
+            df_sorted["failure_probability"].to_numpy(dtype=float)[rows],
+            processed_failure_probability[rows],
+        )
+
+        if is_shifted.any():
+            measure_to_effect = dict(
+                zip(
+                    df_measures_to_effect["measure_id"], df_measures_to_effect["effect"]
+                )
+            )
+            shifted_measures = set(df_pairs.loc[is_shifted, "measure_id"])
+            missing = shifted_measures - set(measure_to_effect)
+            if len(missing) > 0:
+                raise ValueError(
+                    f"Geen effect gevonden voor measure_id {sorted(missing)}, kan de fragility curve niet verschuiven."
+                )
+            effect = df_pairs["measure_id"].map(measure_to_effect).to_numpy(dtype=float)
+            sel_rows = is_shifted[pair] & (effect[pair] != 0.0)
+            if sel_rows.any():
+                failure_probability[sel_rows] = grouped_x_interpolate_1d(
+                    hydraulicload[sel_rows],
+                    pair[sel_rows],
+                    hydraulicload[sel_rows] + effect[pair[sel_rows]],
+                    failure_probability[sel_rows],
+                    pair[sel_rows],
+                    interp_func=FragilityCurve.interp_x_func,
+                    ll=FragilityCurve.lower_limit,
+                    clip01=True,
+                )
+
+        df_out = df_pairs.iloc[pair].reset_index(drop=True)
+        df_out["hydraulicload"] = hydraulicload
+        df_out["failure_probability"] = failure_probability
+
+        base_rows, _ = _block_indices(base_start, base_end)
+        df_in = df_sorted.iloc[base_rows].reset_index(drop=True)
+        return df_in, df_out
+
+
+def _block_indices(start: np.ndarray, end: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Geeft de rij-indices van de blokken [start, end) en het bloknummer per rij"""
+    length = end - start
+    block = np.repeat(np.arange(len(start)), length)
+    rows = start[block] + (
+        np.arange(length.sum()) - np.repeat(np.cumsum(length) - length, length)
+    )
+    return rows, block
@@ -0,0 +1,255 @@
+"""
+Schrijven van GeoJSON voor de database
+
+Het omzetten van inspectieresultaten naar GeoJSON via `GeoDataFrame.to_json()`, `json.loads`
+en weer `json.dumps` kost veel tijd en geheugen. Hier worden de features in een keer naar een
+buffer geschreven: de properties worden per kolom omgezet naar JSON tekst en de geometrie
+wordt direct uit de coördinaten gemaakt. De uitvoer is
+gelijk aan die van `json.dumps(json.loads(gdf.to_json()))` met een extra `style` property.
+"""
+
+from datetime import date, datetime, time
+import io
+import json
+from typing import Iterator
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+import shapely.geometry
+
+
+def geodataframe_to_geojson(
+    gdf: gpd.GeoDataFrame, style_columns: list[str] | None = None
+) -> str:
+    """Zet een GeoDataFrame om naar een GeoJSON FeatureCollection (tekst)
+
+    Parameters
+    ----------
+    gdf: gpd.GeoDataFrame
+        Features om weg te schrijven, de index wordt het `id` van de feature
+    style_columns: list[str] | None
+        Kolommen die niet als losse property, maar samen in de property `style` komen
+
+    Returns
+    -------
+    str
+        GeoJSON tekst
+    """
+    buffer = io.StringIO()
+    write_geojson(buffer, gdf, style_columns)
+    return buffer.getvalue()
+
+
+def iter_geojson_chunks(
+    gdf: gpd.GeoDataFrame,
+    style_columns: list[str] | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[str]:
+    """Geeft een GeoJSON FeatureCollection per blok van maximaal `chunk_size` features"""
+    if chunk_size is None or len(gdf) <= chunk_size:
+        yield geodataframe_to_geojson(gdf, style_columns)
+        return
+
+    if chunk_size < 1:
+        raise UserWarning("De optie `chunk_size` moet minimaal 1 zijn.")
+    for start in range(0, len(gdf), chunk_size):
+        yield geodataframe_to_geojson(
+            gdf.iloc[start : start + chunk_size], style_columns
+        )
+
+
+def write_geojson(
+    buffer: io.TextIOBase,
+    gdf: gpd.GeoDataFrame,
+    style_columns: list[str] | None = None,
+) -> None:
+    """Schrijft een GeoDataFrame als GeoJSON FeatureCollection naar een buffer
+
+    Parameters
+    ----------
+    buffer: io.TextIOBase
+        Buffer of geopend tekstbestand
+    gdf: gpd.GeoDataFrame
+        Features om weg te schrijven
+    style_columns: list[str] | None
+        Kolommen voor de property `style`, ontbrekende kolommen worden overgeslagen.
+        Zonder `style_columns` (None) wordt er geen property `style` toegevoegd.
+    """
+    geometry_name = gdf.geometry.name
+    if style_columns is not None:
+        style_columns = [
+            column
+            for column in style_columns
+            if column in gdf.columns and column != geometry_name
+        ]
+    property_columns = [
+        column
+        for column in gdf.columns
+        if column != geometry_name and column not in (style_columns or [])
+    ]
+
+    properties = _encode_members(gdf, property_columns)
+    if style_columns is not None:
+        styles = _encode_members(gdf, style_columns)
+        properties = [
+            f'{members}, "style": {{{style}}}' if members else f'"style": {{{style}}}'
+            for members, style in zip(properties, styles)
+        ]
+    ids = [json.dumps(str(index)) for index in gdf.index]
+    geometries = encode_geometries(gdf.geometry.values)
+
+    buffer.write('{"type": "FeatureCollection", "features": [')
+    for i, (feature_id, members, geometry) in enumerate(
+        zip(ids, properties, geometries)
+    ):
+        if i > 0:
+            buffer.write(", ")
+        buffer.write(
+            f'{{"id": {feature_id}, "type": "Feature", "properties": {{{members}}}, "geometry": {geometry}}}'
+        )
+    buffer.write("]")
+
+    # net als geopandas alleen een crs opnemen als het geen WGS84 is
+    if gdf.crs is not None:
+        epsg = gdf.crs.to_epsg()
+        if epsg is not None and epsg != 4326:
+            buffer.write(
+                f', "crs": {{"type": "name", "properties": {{"name": "urn:ogc:def:crs:EPSG::{epsg}"}}}}'
+            )
+    buffer.write("}")
+
+
+def encode_geometries(geometries: np.ndarray) -> list[str]:
+    """Zet geometrieën om naar GeoJSON tekst
+
+    Punten, lijnen en polygonen worden direct vanuit de coördinaten geschreven, overige
+    typen (zoals multi-geometrieën) via `shapely.geometry.mapping`.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    encoded = np.full(len(geometries), "null", dtype=object)
+    missing = shapely.is_missing(geometries) | shapely.is_empty(geometries)
+    type_ids = shapely.get_type_id(geometries)
+    has_z = shapely.has_z(geometries)
+
+    for type_id, geometry_type in GEOJSON_COORDINATE_TYPES.items():
+        for z in [False, True]:
+            selection = ~missing & (type_ids == type_id) & (has_z == z)
+            if not selection.any():
+                continue
+            if type_id == 0:
+                coordinates = shapely.get_coordinates(
+                    geometries[selection], include_z=z
+                ).tolist()
+                texts = [_format_position(xyz) for xyz in coordinates]
+            elif type_id == 1:
+                texts = _encode_coordinate_lists(geometries[selection], z)
+            else:
+                rings, ring_index = shapely.get_rings(
+                    geometries[selection], return_index=True
+                )
+                texts = _join_per_geometry(
+                    _encode_coordinate_lists(rings, z),
+                    ring_index,
+                    int(selection.sum()),
+                )
+            encoded[selection] = [
+                f'{{"type": "{geometry_type}", "coordinates": {text}}}'
+                for text in texts
+            ]
+
+    others = ~missing & ~np.isin(type_ids, list(GEOJSON_COORDINATE_TYPES))
+    for i in np.flatnonzero(others):
+        encoded[i] = json.dumps(shapely.geometry.mapping(geometries[i]))
+    return encoded.tolist()
+
+
+# type id van shapely en het GeoJSON type dat direct vanuit de coördinaten wordt geschreven
+GEOJSON_COORDINATE_TYPES = {0: "Point", 1: "LineString", 3: "Polygon"}
+
+
+def _format_position(xyz: list[float]) -> str:
+    """Schrijft een coördinaat zoals `json.dumps`"""
+    return "[" + ", ".join([repr(value) for value in xyz]) + "]"
+
+
+def _encode_coordinate_lists(geometries: np.ndarray, include_z: bool) -> list[str]:
+    """Schrijft de coördinaten per lijn (of ring) als lijst van coördinaten"""
+    coordinates, index = shapely.get_coordinates(
+        geometries, include_z=include_z, return_index=True
+    )
+    positions = [_format_position(xyz) for xyz in coordinates.tolist()]
+    return _join_per_geometry(positions, index, len(geometries))
+
+
+def _join_per_geometry(texts: list[str], index: np.ndarray, size: int) -> list[str]:
+    """Voegt de teksten met dezelfde (oplopende) index samen tot een JSON lijst"""
+    bounds = np.searchsorted(index, np.arange(size + 1)).tolist()
+    return [
+        "[" + ", ".join(texts[start:end]) + "]"
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def _encode_members(df: pd.DataFrame, columns: list[str]) -> list[str]:
+    """Maakt per rij de tekst `"kolom": waarde, ...` van een JSON object"""
+    if len(columns) == 0:
+        return [""] * len(df)
+    encoded_columns = [
+        [f"{json.dumps(str(column))}: {value}" for value in encode_column(df[column])]
+        for column in columns
+    ]
+    return [", ".join(members) for members in zip(*encoded_columns)]
+
+
+def encode_column(series: pd.Series) -> list[str]:
+    """Zet een kolom om naar JSON waardes, ontbrekende waardes worden `null`"""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) and not series.hasnans:
+        return ["true" if value else "false" for value in series.tolist()]
+
+    if pd.api.types.is_integer_dtype(dtype) and not series.hasnans:
+        return [str(value) for value in series.tolist()]
+
+    if pd.api.types.is_float_dtype(dtype):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        finite = np.isfinite(values)
+        return [
+            repr(value) if is_finite else _encode_value(value)
+            for value, is_finite in zip(values.tolist(), finite.tolist())
+        ]
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return [
+            "null" if pd.isna(value) else json.dumps(value.isoformat())
+            for value in series
+        ]
+
+    return [_encode_value(value) for value in series.tolist()]
+
+
+def _encode_value(value) -> str:
+    """Zet een losse waarde om naar JSON"""
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, float) and np.isnan(value):
+        return "null"
+    if not isinstance(value, (list, tuple, dict, np.ndarray)) and pd.isna(value):
+        return "null"
+    return json.dumps(value, default=_json_default)
+
+
+def _json_default(value):
+    """Waardes die `json.dumps` niet zelf kan omzetten"""
+    if isinstance(value, (datetime, date, time, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, shapely.Geometry):
+        return json.loads(shapely.to_geojson(value))
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
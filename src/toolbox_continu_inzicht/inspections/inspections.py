@@ -10,6 +10,12 @@ from pydantic.dataclasses import dataclass
 
 from toolbox_continu_inzicht.base.base_module import ToolboxBase
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
+from toolbox_continu_inzicht.inspections.geojson import iter_geojson_chunks
+from toolbox_continu_inzicht.utils.geometry import (
+    geodataframe_from_xy,
+    get_epsg,
+    to_crs,
+)
 
 
 @dataclass(config={"arbitrary_types_allowed": True})
@@ -156,12 +162,10 @@ class ClassifyInspections(ToolboxBase):
         options = global_variables.get("ClassifyInspections", {})
         classify_columns = options.get("classify_column", None)
         match_text_on = options.get("classify_text_type", "equals")
-        match_text_on_dict = {
-            "contains": self._contains,
-            "equals": self._equals,
-            "endswith": str.endswith,
-            "startswith": str.startswith,
-        }
+        if match_text_on not in ["contains", "equals", "endswith", "startswith"]:
+            raise UserWarning(
+                f"Onbekende classify_text_type '{match_text_on}', kies uit contains, equals, endswith of startswith"
+            )
         if classify_columns is not None and classify_columns not in self.df_in.columns:
             raise KeyError(
                 f"De kolom '{classify_columns}' is niet aanwezig in de inputdata"
@@ -175,10 +179,9 @@ class ClassifyInspections(ToolboxBase):
                 self.df_in = gpd.GeoDataFrame(self.df_in, geometry="geometry")
             else:
                 if "x" in self.df_in.columns and "y" in self.df_in.columns:
-                    self.df_in = gpd.GeoDataFrame(
-                        index=self.df_in.index,
-                        data=self.df_in.to_dict(),
-                        geometry=gpd.points_from_xy(x=self.df_in.x, y=self.df_in.y),
+                    # punten direct in de projectie van de viewer aanmaken
+                    self.df_in = geodataframe_from_xy(
+                        self.df_in, crs=projection, to_crs="EPSG:4326"
                     )
                 else:
                     raise KeyError(
@@ -188,8 +191,8 @@ class ClassifyInspections(ToolboxBase):
         if self.df_in.crs is None:
             self.df_in.crs = projection
 
-        if self.df_in.crs.to_epsg() != 4326:
-            self.df_in = self.df_in.to_crs(epsg=4326)
+        if get_epsg(self.df_in.crs) != 4326:
+            self.df_in = to_crs(self.df_in, "EPSG:4326")
 
         if geometry_type is None:
             if (  # haal op uit de styling indien aanwezig
@@ -280,14 +283,9 @@ class ClassifyInspections(ToolboxBase):
                 ), (
                     "Type van de classificatie is geen tekst, maar de inspectieresultaten zijn dat wel"
                 )
-                for _, row in filtered_df_styling.iterrows():
-                    for column in columns_to_transfer:
-                        self.df_out.loc[
-                            match_text_on_dict[match_text_on](
-                                values, row["lower_boundary"]
-                            ),
-                            column,
-                        ] = row[column]
+                class_index = self._classify_text(
+                    values, filtered_df_styling["lower_boundary"], match_text_on
+                )
             # Classificatie voor getallen
             elif pd.api.types.is_numeric_dtype(values.dtype):
                 assert self._check_dtype(
@@ -295,23 +293,28 @@ class ClassifyInspections(ToolboxBase):
                 ), (
                     "Type van de classificatie is geen getal, maar de inspectieresultaten zijn dat wel"
                 )
-                for _, row in filtered_df_styling.iterrows():
-                    for column in columns_to_transfer:
-                        if "upper_boundary" in row:
-                            self.df_out.loc[
-                                (values >= row["lower_boundary"])
-                                & (values < row["upper_boundary"]),
-                                column,
-                            ] = row[column]
-                        else:
-                            self.df_out.loc[
-                                (values >= row["lower_boundary"]),
-                                column,
-                            ] = row[column]
+                upper_boundary = (
+                    filtered_df_styling["upper_boundary"]
+                    if "upper_boundary" in filtered_df_styling.columns
+                    else None
+                )
+                class_index = self._classify_numeric(
+                    values, filtered_df_styling["lower_boundary"], upper_boundary
+                )
             else:
                 raise UserWarning(
                     f"De classificatie is niet gelukt, het type van kolom {classify_columns} is geen tekst of getal"
                 )
+
+            # in een keer de opmaak van alle geclassificeerde waardes ophalen
+            classified = class_index >= 0
+            df_classified_styling = filtered_df_styling[columns_to_transfer].take(
+                class_index[classified]
+            )
+            for column in columns_to_transfer:
+                self.df_out.loc[classified, column] = df_classified_styling[
+                    column
+                ].to_numpy()
         # Voeg toe aan de waardes waarbij kolom niet is gedefinieerd
         warnings.filterwarnings("ignore", category=FutureWarning)
 
@@ -335,14 +338,100 @@ class ClassifyInspections(ToolboxBase):
             self.data_adapter.output(output[1], self.df_legend_out)
 
     @staticmethod
-    def _equals(waardes, classificatie):
-        """Vergelijk classificatie en waardes element voor element: voor identieke waardes"""
-        return waardes == classificatie
+    def _classify_numeric(
+        values: pd.Series,
+        lower_boundary: pd.Series,
+        upper_boundary: pd.Series | None = None,
+    ) -> np.ndarray:
+        """Bepaalt per waarde de klasse (positie in de opmaak) op basis van de grenzen.
+
+        Een waarde valt in een klasse als deze groter of gelijk is aan de ondergrens en kleiner
+        dan de bovengrens. Vallen de klasses over elkaar, dan telt de laatste klasse in de opmaak.
+
+        Returns
+        -------
+        np.ndarray
+            Positie van de klasse per waarde, -1 als de waarde niet te classificeren is
+        """
+        x = values.to_numpy(dtype=float, na_value=np.nan)
+        lower = lower_boundary.to_numpy(dtype=float)
+        class_index = np.full(len(x), -1, dtype=np.intp)
+        if len(lower) == 0:
+            return class_index
+        valid = ~np.isnan(x)
+
+        order = np.argsort(lower, kind="stable")
+        sorted_lower = lower[order]
+        # positie van de grootste ondergrens kleiner of gelijk aan de waarde
+        position = np.searchsorted(sorted_lower, x, side="right") - 1
+        has_lower = valid & (position >= 0)
+
+        if upper_boundary is None:
+            # alle klasses met een lagere ondergrens passen, de laatste in de opmaak telt
+            last_class = np.maximum.accumulate(order)
+            class_index[has_lower] = last_class[position[has_lower]]
+            return class_index
+
+        upper = upper_boundary.to_numpy(dtype=float)
+        sorted_upper = upper[order]
+        if np.all(sorted_upper[:-1] <= sorted_lower[1:]):
+            # aaneengesloten of losse klasses: hooguit een klasse per waarde
+            candidate = np.where(has_lower, position, 0)
+            in_class = has_lower & (x < sorted_upper[candidate])
+            class_index[in_class] = order[candidate[in_class]]
+            return class_index
+
+        # overlappende klasses: per waarde de laatste passende klasse
+        matches = (x[:, None] >= lower[None, :]) & (x[:, None] < upper[None, :])
+        last_match = matches.shape[1] - 1 - np.argmax(matches[:, ::-1], axis=1)
+        in_class = matches.any(axis=1)
+        class_index[in_class] = last_match[in_class]
+        return class_index
 
     @staticmethod
-    def _contains(waardes, classificatie):
-        """Vergelijk classificatie en waardes element voor element: voor waardes in andere"""
-        return waardes.apply(lambda x: classificatie in x)
+    def _classify_text(
+        values: pd.Series, classifications: pd.Series, match_text_on: str
+    ) -> np.ndarray:
+        """Bepaalt per waarde de klasse (positie in de opmaak) voor tekst.
+
+        De unieke waardes worden eenmalig vergeleken met de classificaties, daarna wordt het
+        resultaat via de codes terug gezet naar alle waardes. Bij `equals` is dit een join op
+        de tekst, bij meerdere passende klasses telt de laatste klasse in de opmaak.
+
+        Returns
+        -------
+        np.ndarray
+            Positie van de klasse per waarde, -1 als de waarde niet te classificeren is
+        """
+        codes, uniques = pd.factorize(values)
+        unique_class_index = np.full(len(uniques), -1, dtype=np.intp)
+
+        if match_text_on == "equals":
+            lookup = {
+                classification: index
+                for index, classification in enumerate(classifications)
+            }
+            unique_class_index[:] = [lookup.get(value, -1) for value in uniques]
+        else:
+            text_match = {
+                "contains": lambda value, classification: classification in value,
+                "startswith": str.startswith,
+                "endswith": str.endswith,
+            }[match_text_on]
+            is_text = np.array(
+                [isinstance(value, str) for value in uniques], dtype=bool
+            )
+            for index, classification in enumerate(classifications):
+                matches = np.array(
+                    [
+                        text and text_match(value, classification)
+                        for value, text in zip(uniques, is_text)
+                    ],
+                    dtype=bool,
+                )
+                unique_class_index[matches] = index
+
+        return np.where(codes >= 0, unique_class_index[codes], -1)
 
     @staticmethod
     def _check_dtype(values_dtype: pd.api.types, type: str) -> bool:
@@ -605,6 +694,13 @@ class InspectionsToDatabase(ClassifyInspections):
 
     - max_rows = 10, Maximale toegestane rijen geodata in een databaseveld
     - index = 0, Index van df_in_layers waarin de geodata wordt opgeslagen
+    - chunk_size = None, Maximaal aantal inspectieresultaten per laag. Bij meer resultaten worden
+      de resultaten verdeeld over meerdere lagen (kopieën van de laag op `index`, met het
+      volgnummer achter de `layer_name`). Met deze optie geldt `max_rows` niet, omdat elk
+      databaseveld maximaal `chunk_size` resultaten bevat.
+
+    De GeoJSON wordt direct vanuit de kolommen en de geometrie geschreven, zie
+    `toolbox_continu_inzicht.inspections.geojson`.
 
     De layers tabel geeft de mogelijkheid om de meer configuratie door te geven aan de viewer. Als deze niet aanwezig is, worden standaardopties gebruikt.
     Hier moet minimaal de volgende kolommen in zitten:
@@ -682,8 +778,9 @@ class InspectionsToDatabase(ClassifyInspections):
         options = global_variables.get("InspectionsToDatabase", {})
         max_rows = options.get("max_rows", 10)
         insert_layer_index = options.get("index", 0)
+        chunk_size = options.get("chunk_size", None)
 
-        if len(self.df_in_inspections) >= max_rows:
+        if chunk_size is None and len(self.df_in_inspections) >= max_rows:
             raise UserWarning(
                 f"Er zijn meer dan {max_rows} inspectieresultaten, dit kan de database belasten."
                 + "Dit maximum is aan te passen met `max_rows` in de global variables"
@@ -699,24 +796,9 @@ class InspectionsToDatabase(ClassifyInspections):
         # voor een mooie popup in de legenda willen we de styling in een 'style'-kolom
         style_columns = self.get_possible_styling()
         style_columns += ["x", "y", "symbol"]
-        style_dicts = []
-        for index, row in self.df_in_inspections.iterrows():
-            style_dict = {}
-            for col in style_columns:
-                if col in self.df_in_inspections.columns:
-                    style_dict[col] = row[col]
-            style_dicts.append(style_dict)
-
-        self.df_in_inspections = self.df_in_inspections.drop(
-            columns=list(style_dicts[0].keys())
+        layer_data = list(
+            iter_geojson_chunks(self.df_in_inspections, style_columns, chunk_size)
         )
-        output_json = dict(json.loads(self.df_in_inspections.to_json()))
-        number_features = len(output_json["features"])
-        for i in range(number_features):
-            output_json["features"][i]["properties"]["style"] = style_dicts[i]
-
-        self.df_out["layer_data"] = ""
-        self.df_out.loc[insert_layer_index, "layer_data"] = json.dumps(output_json)
 
         # Als upper en lower boundary aanwezig zijn, combineer deze in een 'name'
         if (
@@ -742,10 +824,32 @@ class InspectionsToDatabase(ClassifyInspections):
         # fix met nieuwe versie van pandas
         warnings.filterwarnings("ignore", category=FutureWarning)
         self.df_in_legend.fillna("", inplace=True)
-        self.df_out["layer_legend"] = ""
-        self.df_out.loc[insert_layer_index, "layer_legend"] = json.dumps(
+        layer_legend = json.dumps(
             [value for key, value in self.df_in_legend.T.to_dict().items()]
         )
+
+        self.df_out["layer_data"] = ""
+        self.df_out["layer_legend"] = ""
+        if len(layer_data) == 1:
+            self.df_out.loc[insert_layer_index, "layer_data"] = layer_data[0]
+            self.df_out.loc[insert_layer_index, "layer_legend"] = layer_legend
+        else:
+            # een kopie van de laag per blok, op de plek van de oorspronkelijke laag
+            position = self.df_out.index.get_loc(insert_layer_index)
+            df_layers = self.df_out.iloc[[position] * len(layer_data)].copy()
+            df_layers["layer_data"] = layer_data
+            df_layers["layer_legend"] = layer_legend
+            df_layers["layer_name"] = [
+                f"{name} ({i + 1}/{len(layer_data)})"
+                for i, name in enumerate(df_layers["layer_name"])
+            ]
+            self.df_out = pd.concat(
+                [
+                    self.df_out.iloc[:position],
+                    df_layers,
+                    self.df_out.iloc[position + 1 :],
+                ]
+            ).reset_index(drop=True)
         self.data_adapter.output(output, self.df_out)
 
     def set_default_styling():
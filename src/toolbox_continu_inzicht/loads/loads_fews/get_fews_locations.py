@@ -1,7 +1,9 @@
 import pandas as pd
 from toolbox_continu_inzicht.utils.fetch_functions import fetch_data_get
+from toolbox_continu_inzicht.utils.metadata_cache import cached_metadata
 
 
+@cached_metadata
 def get_fews_locations(
     host: str, port: int, region: str, filter_id: str
 ) -> pd.DataFrame:
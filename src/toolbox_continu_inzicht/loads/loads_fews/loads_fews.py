@@ -1,9 +1,13 @@
+import heapq
+import time
 import warnings
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from typing import Optional
 
 import pandas as pd
 from pydantic.dataclasses import dataclass
+import requests
 
 from toolbox_continu_inzicht.base.base_module import ToolboxBase
 from toolbox_continu_inzicht.base.aquo import read_aquo
@@ -11,13 +15,22 @@ from toolbox_continu_inzicht.base.data_adapter import DataAdapter
 from toolbox_continu_inzicht.utils.datetime_functions import (
     datetime_from_string,
 )
-from toolbox_continu_inzicht.utils.fetch_functions import fetch_data_get
+from toolbox_continu_inzicht.utils.fetch_functions import (
+    create_session,
+    fetch_data_get,
+)
 
 
 @dataclass(config={"arbitrary_types_allowed": True})
 class LoadsFews(ToolboxBase):
     """
     Met deze functie worden gegevens uit de opgegeven FEWS omgeving opgehaald via REST.
+
+    Bij veel locaties kan het ophalen worden opgedeeld in blokken van locaties en parameters
+    (opties `location_chunk_size` en `parameter_chunk_size` onder `LoadsFews`). De blokken
+    worden gelijktijdig opgehaald over dezelfde sessie (`max_workers`), verwerkt zodra ze
+    binnen zijn en bij een verbindingsfout, time-out of serverfout (5xx) los van elkaar
+    opnieuw opgevraagd (`retries`, `retry_delay`).
     """
 
     data_adapter: DataAdapter
@@ -82,29 +95,146 @@ class LoadsFews(ToolboxBase):
                 options["MISSING_VALUE"] = -999
 
         url = self.create_url(options=options)
-        parameters = self.create_params(
+        chunked_parameters = self.create_chunked_params(
             calc_time=calc_time,
             options=options,
             moments=options["moments"],
             locations=self.df_in,
         )
-        status, json_data = fetch_data_get(
-            url=url, params=parameters, mime_type="json", path_certificate=None
+        dataframes = self.fetch_chunks(
+            url=url,
+            chunked_parameters=chunked_parameters,
+            options=options,
+            calc_time=calc_time,
+            global_variables=global_variables,
         )
 
-        if status is None and json_data is not None:
-            self.df_out = self.create_dataframe(
-                options=options,
-                calc_time=calc_time,
-                json_data=json_data,
-                locations=self.df_in,
-                global_variables=global_variables,
-            )
+        # alleen uitvoer als tenminste een blok is opgehaald
+        dataframes = [df for df in dataframes if df is not None]
+        if len(dataframes) > 0:
+            non_empty = [df for df in dataframes if not df.empty]
+            if len(non_empty) > 1:
+                self.df_out = pd.concat(non_empty, ignore_index=True)
+            else:
+                self.df_out = (non_empty or dataframes)[0]
 
             self.data_adapter.output(output=output, df=self.df_out)
 
         return self.df_out
 
+    def fetch_chunks(
+        self,
+        url: str,
+        chunked_parameters: list[dict],
+        options: dict,
+        calc_time: datetime,
+        global_variables: dict,
+    ) -> list[pd.DataFrame | None]:
+        """
+        Haal de blokken gelijktijdig op en zet elk blok om naar een dataframe zodra het binnen is.
+
+        Parameters
+        ----------
+        url: str
+            De URL voor de FEWS REST API
+        chunked_parameters: list[dict]
+            Parameters per blok, zie `create_chunked_params`
+        options: dict
+            Opties uit de invoer yaml, met optioneel `max_workers` (standaard 4),
+            `retries` (standaard 2), `retry_delay` (standaard 1 seconde, verdubbelt per poging)
+            en `timeout` (standaard 60 seconden). Alleen verbindingsfouten, time-outs en
+            serverfouten (5xx) worden opnieuw geprobeerd.
+        calc_time: datetime
+            T0 in UTC
+        global_variables: dict
+            Globale variabelen uit de invoer yaml
+
+        Returns
+        -------
+        list[pd.DataFrame | None]
+            Dataframe per blok in de volgorde van `chunked_parameters`, None voor een blok
+            dat ook na de herhaalpogingen niet is opgehaald
+        """
+        max_workers = max(
+            1, min(options.get("max_workers", 4), len(chunked_parameters))
+        )
+        retries = options.get("retries", 2)
+        retry_delay = options.get("retry_delay", 1.0)
+        timeout = options.get("timeout", 60.0)
+
+        dataframes = [None] * len(chunked_parameters)
+        attempts = [0] * len(chunked_parameters)
+        errors = {}
+
+        def fetch(params: dict):
+            return fetch_data_get(
+                url=url,
+                params=params,
+                mime_type="json",
+                timeout=timeout,
+                path_certificate=None,
+                session=session,
+                return_http_error=True,
+            )
+
+        with (
+            create_session(pool_size=max_workers) as session,
+            ThreadPoolExecutor(max_workers=max_workers) as executor,
+        ):
+            pending = {
+                executor.submit(fetch, params): index
+                for index, params in enumerate(chunked_parameters)
+            }
+            # herhaalpogingen (tijdstip, blok) wachten hier, niet in een thread van de pool
+            scheduled = []
+            while pending or scheduled:
+                now = time.monotonic()
+                while scheduled and scheduled[0][0] <= now:
+                    _, index = heapq.heappop(scheduled)
+                    pending[executor.submit(fetch, chunked_parameters[index])] = index
+                if not pending:
+                    time.sleep(scheduled[0][0] - now)
+                    continue
+
+                done, _ = wait(
+                    pending,
+                    timeout=scheduled[0][0] - now if scheduled else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    index = pending.pop(future)
+                    status, json_data = future.result()
+
+                    if status is None and json_data is not None:
+                        dataframes[index] = self.create_dataframe(
+                            options=options,
+                            calc_time=calc_time,
+                            json_data=json_data,
+                            locations=self.df_in,
+                            global_variables=global_variables,
+                        )
+                        continue
+
+                    attempts[index] += 1
+                    if attempts[index] <= retries and _is_retryable(status):
+                        delay = retry_delay * 2 ** (attempts[index] - 1)
+                        heapq.heappush(scheduled, (time.monotonic() + delay, index))
+                    else:
+                        errors[index] = status
+
+        if len(errors) > 0:
+            failed_locations = [
+                location
+                for index in sorted(errors)
+                for location in chunked_parameters[index].get("locationIds", [])
+            ]
+            self.data_adapter.logger.warning(
+                f"{len(errors)} van de {len(chunked_parameters)} blokken niet opgehaald uit FEWS, "
+                f"locaties: {sorted(set(failed_locations))}, fout: {errors[min(errors)]}"
+            )
+
+        return dataframes
+
     def create_url(self, options: dict) -> str:
         """
         Maak een REST-URL voor FEWS
@@ -171,6 +301,54 @@ class LoadsFews(ToolboxBase):
 
         return params
 
+    def create_chunked_params(
+        self, calc_time: datetime, options: dict, moments: list, locations: pd.DataFrame
+    ) -> list[dict]:
+        """
+        Maak de parameters per blok van locaties en parameters.
+
+        Zonder `location_chunk_size` en `parameter_chunk_size` in de opties is er een blok
+        met alle locaties en parameters, gelijk aan `create_params`.
+
+        Parameters
+        ----------
+        calc_time: datetime
+            T0 in UTC
+        options: dict
+            options uit de invoer yaml
+        moments: list
+            Lijst van momenten in uren
+        locations: pd.DataFrame
+            Dataframe met meetlocaties
+
+        Returns
+        -------
+        list[dict]
+            De parameters per blok
+        """
+        location_codes = locations["measurement_location_code"].tolist()
+        parameter_ids = options["parameters"]
+        if isinstance(parameter_ids, str):
+            parameter_ids = [parameter_ids]
+
+        location_chunks = _chunks(location_codes, options.get("location_chunk_size"))
+        parameter_chunks = _chunks(parameter_ids, options.get("parameter_chunk_size"))
+
+        base_params = self.create_params(
+            calc_time=calc_time, options=options, moments=moments, locations=locations
+        )
+        if len(location_chunks) == 1 and len(parameter_chunks) == 1:
+            return [base_params]
+
+        chunked_parameters = []
+        for parameter_chunk in parameter_chunks:
+            for location_chunk in location_chunks:
+                params = dict(base_params)
+                params["parameterIds"] = parameter_chunk
+                params["locationIds"] = location_chunk
+                chunked_parameters.append(params)
+        return chunked_parameters
+
     def create_dataframe(
         self,
         options: dict,
@@ -284,3 +462,19 @@ class LoadsFews(ToolboxBase):
             dataframe = pd.DataFrame.from_records(records)
 
         return dataframe
+
+
+def _chunks(values: list, chunk_size: int | None) -> list[list]:
+    """Verdeel een lijst in blokken van maximaal `chunk_size`, zonder `chunk_size` een blok"""
+    if chunk_size is None or len(values) <= chunk_size:
+        return [values]
+    if chunk_size < 1:
+        raise UserWarning("De grootte van een blok moet minimaal 1 zijn.")
+    return [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+
+def _is_retryable(status) -> bool:
+    """Alleen verbindingsfouten, time-outs en serverfouten (5xx) opnieuw proberen"""
+    if isinstance(status, requests.HTTPError):
+        return status.response is not None and status.response.status_code >= 500
+    return isinstance(status, (requests.ConnectionError, requests.Timeout))
@@ -2,6 +2,7 @@ import geopandas as gpd
 import pandas as pd
 
 from toolbox_continu_inzicht.utils.fetch_functions import fetch_data_get
+from toolbox_continu_inzicht.utils.metadata_cache import cached_metadata
 
 
 def import_folium():
@@ -15,6 +16,7 @@ def import_folium():
     return folium
 
 
+@cached_metadata
 def get_matroos_locations(
     source: str | None = None,
     parameter: str | None = None,
@@ -133,6 +135,7 @@ def get_matroos_locations_map(
     return m
 
 
+@cached_metadata
 def get_matroos_sources(endpoint: str = "timeseries") -> pd.DataFrame:
     """Haalt alle matroos bronnen op
 
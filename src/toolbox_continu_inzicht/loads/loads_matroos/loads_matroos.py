@@ -14,6 +14,7 @@ from toolbox_continu_inzicht.loads.loads_matroos.get_matroos_locations import (
 from toolbox_continu_inzicht.base.base_module import ToolboxBase
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
 from toolbox_continu_inzicht.utils.fetch_functions import fetch_data_get
+from toolbox_continu_inzicht.utils.metadata_cache import configure_metadata_cache
 from toolbox_continu_inzicht.base.aquo import read_aquo
 
 
@@ -93,6 +94,13 @@ class LoadsMatroos(ToolboxBase):
 
         self.df_in = self.data_adapter.input(input)
 
+        # bronnen en locaties eventueel uit de metadata cache
+        if "MetadataCache" in global_variables:
+            configure_metadata_cache(
+                **global_variables["MetadataCache"],
+                root_dir=global_variables.get("used_root_dir", None),
+            )
+
         wanted_location_names = self.get_matroos_available_locations(
             self.df_in, options, endpoint_model="timeseries"
         )
@@ -448,6 +456,13 @@ class LoadsMatroosNetCDF(LoadsMatroos):
             options["MISSING_VALUE"] = -999
 
         self.df_in = self.data_adapter.input(input)
+
+        # bronnen en locaties eventueel uit de metadata cache
+        if "MetadataCache" in global_variables:
+            configure_metadata_cache(
+                **global_variables["MetadataCache"],
+                root_dir=global_variables.get("used_root_dir", None),
+            )
         map_location_to_id = self.df_in.set_index("measurement_location_code")[
             "measurement_location_id"
         ].to_dict()
@@ -1,8 +1,9 @@
 import pandas as pd
 from toolbox_continu_inzicht.utils.fetch_functions import fetch_data_post
+from toolbox_continu_inzicht.utils.metadata_cache import cached_metadata
 
 
-# TODO: add caching for debugging: assumption that on a given day the locations do not change
+@cached_metadata
 def get_rws_webservices_locations():
     """Haal locaties op die bekend zijn bij de RWS webservice."""
 
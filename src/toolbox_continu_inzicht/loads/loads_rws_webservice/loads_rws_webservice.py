@@ -12,6 +12,7 @@ from toolbox_continu_inzicht.loads.loads_rws_webservice.get_rws_webservices_loca
     get_rws_webservices_locations,
 )
 from toolbox_continu_inzicht.utils.fetch_functions import fetch_data_post
+from toolbox_continu_inzicht.utils.metadata_cache import configure_metadata_cache
 
 
 @dataclass(config={"arbitrary_types_allowed": True})
@@ -76,6 +77,13 @@ class LoadsWaterwebservicesRWS(ToolboxBase):
 
         self.df_in = self.data_adapter.input(input)
 
+        # locaties eventueel uit de metadata cache
+        if "MetadataCache" in global_variables:
+            configure_metadata_cache(
+                **global_variables["MetadataCache"],
+                root_dir=global_variables.get("used_root_dir", None),
+            )
+
         # doe een data type check
         if "measurement_location_id" not in self.df_in.columns:
             raise UserWarning(
@@ -1,7 +1,9 @@
 import pandas as pd
 from toolbox_continu_inzicht.utils.fetch_functions import fetch_data_get
+from toolbox_continu_inzicht.utils.metadata_cache import cached_metadata
 
 
+@cached_metadata
 def get_waterinfo_thresholds(
     location_code: str, parameter_id: str = "waterhoogte"
 ) -> pd.DataFrame:
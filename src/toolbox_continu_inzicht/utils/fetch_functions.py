@@ -1,13 +1,33 @@
 import requests
+from requests.adapters import HTTPAdapter
 import httpx
 
 
+def create_session(pool_size: int = 10) -> requests.Session:
+    """
+    Maak een sessie waarvan de verbindingen worden hergebruikt, ook bij gelijktijdige requests.
+
+    Args:
+        pool_size (int, optional): maximaal aantal open verbindingen per host. Standaardwaarde is 10.
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 def fetch_data_get(
     url: str,
     params: dict,
     mime_type: str = "text",
     timeout: float = 60.0,
     path_certificate: str = None,
+    session: requests.Session | None = None,
+    return_http_error: bool = False,
 ):
     """
     Haal data op van gegeven URL.
@@ -18,6 +38,8 @@ def fetch_data_get(
         mime_type (str, optional): mime type. Standaardwaarde is "text".
         timeout (float, optional): tijd voordat de verbinding verbroken wordt (in seconden). Standaardwaarde is 10.0 seconden.
         path_certificate (str, optional): locatie naar een pem-bestand
+        session (requests.Session, optional): sessie om de verbinding te hergebruiken, zie `create_session`
+        return_http_error (bool, optional): geef bij een foutcode een `requests.HTTPError` (met de response) terug in plaats van de tekst. Standaardwaarde is False.
 
     Returns:
         status: status code van de http request
@@ -32,7 +54,10 @@ def fetch_data_get(
             # Zet de 'Accept' header naar application/json
             headers = {"Accept": "application/json"}
 
-        response = requests.get(url, headers=headers, params=params)
+        if session is None:
+            response = requests.get(url, headers=headers, params=params)
+        else:
+            response = session.get(url, headers=headers, params=params, timeout=timeout)
 
         if response.status_code == 200:
             if mime_type == "json":
@@ -44,6 +69,8 @@ def fetch_data_get(
         else:
             data = None
             result = response.text
+            if return_http_error:
+                result = requests.HTTPError(response.text, response=response)
 
     except Exception as error:
         result = error
@@ -0,0 +1,180 @@
+"""
+Hulpfuncties voor geometrieën
+
+- Een cache van pyproj `Transformer` objecten per proces (en per thread, omdat een
+  `Transformer` niet thread-safe is), zodat een transformatie niet bij elke aanroep
+  opnieuw wordt opgebouwd.
+- Het opbouwen van een GeoDataFrame direct uit arrays met coördinaten.
+- Het eenmalig bepalen van afgeleide eigenschappen (oppervlakte, bounds) van een GeoDataFrame.
+"""
+
+from functools import cached_property, lru_cache
+import threading
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyproj
+import shapely
+
+_local = threading.local()
+
+
+def get_crs(crs) -> pyproj.CRS:
+    """Zet een projectie (bijv. 4326, "EPSG:28992" of een pyproj.CRS) om naar een pyproj.CRS"""
+    if isinstance(crs, pyproj.CRS):
+        return crs
+    return _get_crs_from_user_input(crs)
+
+
+@lru_cache(maxsize=64)
+def _get_crs_from_user_input(crs) -> pyproj.CRS:
+    return pyproj.CRS.from_user_input(crs)
+
+
+@lru_cache(maxsize=64)
+def get_epsg(crs: pyproj.CRS) -> int | None:
+    """Geeft de EPSG code van een projectie, of None als er geen code is gevonden"""
+    return get_crs(crs).to_epsg()
+
+
+def get_transformer(crs_from, crs_to) -> pyproj.Transformer:
+    """Geeft een (hergebruikte) transformatie tussen twee projecties, met x/y volgorde
+
+    Parameters
+    ----------
+    crs_from, crs_to
+        Projecties, alles wat `pyproj.CRS.from_user_input` accepteert
+
+    Returns
+    -------
+    pyproj.Transformer
+    """
+    transformers = getattr(_local, "transformers", None)
+    if transformers is None:
+        transformers = _local.transformers = {}
+
+    key = (get_crs(crs_from), get_crs(crs_to))
+    transformer = transformers.get(key)
+    if transformer is None:
+        transformer = pyproj.Transformer.from_crs(*key, always_xy=True)
+        transformers[key] = transformer
+    return transformer
+
+
+def transform_xy(
+    x: np.ndarray, y: np.ndarray, crs_from, crs_to
+) -> tuple[np.ndarray, np.ndarray]:
+    """Transformeert arrays met x en y coördinaten naar een andere projectie"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if get_crs(crs_from) == get_crs(crs_to):
+        return x, y
+    return get_transformer(crs_from, crs_to).transform(x, y)
+
+
+def to_crs(gdf: gpd.GeoDataFrame, crs) -> gpd.GeoDataFrame:
+    """Zet een GeoDataFrame om naar een andere projectie met een hergebruikte transformatie
+
+    Alle coördinaten worden in een keer getransformeerd. Als de projectie al gelijk is,
+    wordt het GeoDataFrame zelf teruggegeven.
+    """
+    if gdf.crs is None:
+        raise ValueError(
+            "Het GeoDataFrame heeft geen projectie, stel deze eerst in met `set_crs`."
+        )
+    crs = get_crs(crs)
+    if gdf.crs == crs:
+        return gdf
+
+    transformer = get_transformer(gdf.crs, crs)
+    geometries = np.asarray(gdf.geometry.values, dtype=object)
+    has_z = shapely.has_z(geometries)
+    transformed = np.empty_like(geometries)
+    for z in [False, True]:
+        selection = has_z == z
+        if not selection.any():
+            continue
+        coordinates = shapely.get_coordinates(geometries[selection], include_z=z)
+        new_coordinates = np.column_stack(transformer.transform(*coordinates.T))
+        transformed[selection] = shapely.set_coordinates(
+            geometries[selection].copy(), new_coordinates
+        )
+
+    result = gdf.copy()
+    result[gdf.geometry.name] = gpd.GeoSeries(transformed, index=gdf.index, crs=crs)
+    return result.set_crs(crs, allow_override=True)
+
+
+def geodataframe_from_xy(
+    df: pd.DataFrame,
+    x: str = "x",
+    y: str = "y",
+    crs=None,
+    to_crs=None,
+) -> gpd.GeoDataFrame:
+    """Maakt een GeoDataFrame met punten direct uit de kolommen met coördinaten
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        DataFrame met de kolommen `x` en `y`, de kolommen blijven behouden
+    x, y: str
+        Namen van de kolommen met coördinaten
+    crs
+        Projectie van de coördinaten
+    to_crs
+        Optioneel, projectie van de punten. De coördinaten worden eerst als arrays
+        getransformeerd, zodat de punten maar een keer worden aangemaakt.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+    """
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    if to_crs is not None:
+        if crs is None:
+            raise ValueError("Geef een projectie (crs) op om te kunnen transformeren.")
+        xs, ys = transform_xy(xs, ys, crs, to_crs)
+        crs = to_crs
+    return gpd.GeoDataFrame(df, geometry=shapely.points(xs, ys), crs=crs)
+
+
+class GeometryProperties:
+    """
+    Afgeleide eigenschappen van de geometrieën van een GeoDataFrame, eenmalig berekend
+
+    Parameters
+    ----------
+    gdf: gpd.GeoDataFrame
+        GeoDataFrame waarvan de geometrieën tijdens het gebruik niet veranderen
+
+    Examples
+    --------
+    >>> properties = GeometryProperties(gdf)
+    >>> properties.area_hectare
+    """
+
+    def __init__(self, gdf: gpd.GeoDataFrame):
+        self.gdf = gdf
+
+    @cached_property
+    def area(self) -> pd.Series:
+        """Oppervlakte per geometrie, in de eenheid van de projectie"""
+        return self.gdf.geometry.area
+
+    @cached_property
+    def area_hectare(self) -> pd.Series:
+        """Oppervlakte per geometrie in hectare (bij een projectie in meters)"""
+        return self.area / 10000
+
+    @cached_property
+    def bounds(self) -> pd.DataFrame:
+        """Bounds (minx, miny, maxx, maxy) per geometrie"""
+        return self.gdf.geometry.bounds
+
+    @cached_property
+    def total_bounds(self) -> np.ndarray:
+        """Bounds van alle geometrieën samen"""
+        return self.gdf.geometry.total_bounds
@@ -14,29 +14,143 @@ def import_scipy():
     return norm
 
 
-def _interpolate_1d(x, xp, fp, side="left", sorter=None):
-    # Computes the index of the lower bracket in xp to use for linear
-    # interpolation of x. First np.searchsorted(xp, x) finds where each value
-    # in x would be inserted into the (assumed sorted) array xp to keep order;
-    # subtracting 1 turns that insertion index into the index of the element
-    # just below (the lower neighbor).
-    # Because searchsorted can return 0 or len(xp), the expression wraps that
-    # result with clamps to keep intidx in the valid range: it never drops
-    # below 0 and never exceeds len(xp) - 2. The upper clamp is len(xp) - 2 so
-    # that later code can safely access xp[intidx + 1].
-    intidx = np.searchsorted(xp, x, side=side, sorter=sorter) - 1
-    intidx = np.clip(intidx, 0, len(xp) - 2)
-
-    # Bepaal stapgrootte van de gegeven x-waarden. Om delen door 0 te voorkomen
-    # gebruiken we een kleine waarde in plaats van 0
-    xstep = xp[intidx + 1] - xp[intidx]
-    xstep[xstep == 0] = 1e-16
-    # Bepaal interpolatiefracties
-    fracs = (x - xp[intidx]) / xstep
-    # Interpolatie: (1 - frac) * f_low + frac * f_up
-    f = (1 - fracs) * fp[intidx] + fracs * fp[intidx + 1]
+class InterpolationPlan:
+    """
+    Vooraf berekende indices en fracties voor het interpoleren van x-waardes op een vaste xp.
 
-    return f
+    Als meerdere vectoren met y-waardes (fp) op hetzelfde paar (x, xp) geinterpoleerd worden,
+    hoeven de indices en fracties maar een keer bepaald te worden. De fp-vectoren kunnen als
+    2-D array (een rij per vector) in een keer worden geinterpoleerd.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        X-waardes waarop geinterpoleerd moet worden
+    xp : np.ndarray
+        Referentievector van x-waardes (oplopend gesorteerd)
+    side : str
+        Zijde voor np.searchsorted, standaard "left"
+    sorter : np.ndarray | None
+        Optionele sorteervolgorde van xp voor np.searchsorted
+    intidx : np.ndarray | None
+        Optioneel, vooraf bepaalde indices van de ondergrens in xp (bijv. per groep)
+
+    Examples
+    --------
+    >>> plan = InterpolationPlan(x, xp)
+    >>> f = plan.log_x_interpolate_1d(np.vstack([fp_1, fp_2]), clip01=True)
+    """
+
+    def __init__(self, x, xp, side="left", sorter=None, intidx=None):
+        self.x = x
+        self.xp = xp
+        # Computes the index of the lower bracket in xp to use for linear
+        # interpolation of x. First np.searchsorted(xp, x) finds where each value
+        # in x would be inserted into the (assumed sorted) array xp to keep order;
+        # subtracting 1 turns that insertion index into the index of the element
+        # just below (the lower neighbor).
+        # Because searchsorted can return 0 or len(xp), the expression wraps that
+        # result with clamps to keep intidx in the valid range: it never drops
+        # below 0 and never exceeds len(xp) - 2. The upper clamp is len(xp) - 2 so
+        # that later code can safely access xp[intidx + 1].
+        # Bij gegroepeerde interpolatie zijn de indices al per groep bepaald.
+        if intidx is None:
+            intidx = np.searchsorted(xp, x, side=side, sorter=sorter) - 1
+            intidx = np.clip(intidx, 0, len(xp) - 2)
+        self.intidx = intidx
+
+        # Bepaal stapgrootte van de gegeven x-waarden. Om delen door 0 te voorkomen
+        # gebruiken we een kleine waarde in plaats van 0
+        xstep = xp[intidx + 1] - xp[intidx]
+        xstep[xstep == 0] = 1e-16
+        # Bepaal interpolatiefracties
+        self.fracs = (x - xp[intidx]) / xstep
+
+    def matches(self, x, xp) -> bool:
+        """Geeft aan of dit plan gemaakt is voor dezelfde x en xp"""
+        return (
+            np.shape(x) == np.shape(self.x)
+            and np.shape(xp) == np.shape(self.xp)
+            and np.array_equal(x, self.x)
+            and np.array_equal(xp, self.xp)
+        )
+
+    def apply(self, fp: np.ndarray, stacked: bool = False) -> np.ndarray:
+        """Lineaire interpolatie van fp
+
+        Met `stacked=True` mag fp 2-D zijn met een vector per rij, anders wordt (zoals
+        in `interpolate_1d`) langs de eerste as van fp geinterpoleerd.
+        """
+        # Interpolatie: (1 - frac) * f_low + frac * f_up
+        if stacked:
+            return (1 - self.fracs) * fp[..., self.intidx] + self.fracs * fp[
+                ..., self.intidx + 1
+            ]
+        return (1 - self.fracs) * fp[self.intidx] + self.fracs * fp[self.intidx + 1]
+
+    def interpolate_1d(
+        self, fp: np.ndarray, ll: float = 0.0, clip01: bool = False
+    ) -> np.ndarray:
+        """Zie `interpolate_1d`, fp mag 2-D zijn"""
+        return _transformed_x_interpolate_1d(
+            self.x, self.xp, fp, ll, clip01, plan=self, stacked=True
+        )
+
+    def log_x_interpolate_1d(
+        self, fp: np.ndarray, ll: float = 1e-200, clip01: bool = False
+    ) -> np.ndarray:
+        """Zie `log_x_interpolate_1d`, fp mag 2-D zijn"""
+        return _transformed_x_interpolate_1d(
+            self.x,
+            self.xp,
+            fp,
+            ll,
+            clip01,
+            ftransform=np.log,
+            finvtransform=np.exp,
+            plan=self,
+            stacked=True,
+        )
+
+    def beta_x_interpolate_1d(
+        self, fp: np.ndarray, ll: float = 1e-200, clip01: bool = False
+    ) -> np.ndarray:
+        """Zie `beta_x_interpolate_1d`, fp mag 2-D zijn"""
+        norm = import_scipy()
+        return _transformed_x_interpolate_1d(
+            self.x,
+            self.xp,
+            fp,
+            ll,
+            clip01,
+            ftransform=norm.isf,
+            finvtransform=norm.sf,
+            plan=self,
+            stacked=True,
+        )
+
+    def apply_interp_func(
+        self, interp_func: Callable, fp: np.ndarray, ll: float, clip01: bool
+    ) -> np.ndarray:
+        """Interpoleer met een van de x-interpolatiefuncties uit deze module
+
+        Voor andere functies wordt de functie zelf aangeroepen (per rij bij een 2-D fp).
+        """
+        if interp_func is interpolate_1d:
+            return self.interpolate_1d(fp, ll=ll, clip01=clip01)
+        elif interp_func is log_x_interpolate_1d:
+            return self.log_x_interpolate_1d(fp, ll=ll, clip01=clip01)
+        elif interp_func is beta_x_interpolate_1d:
+            return self.beta_x_interpolate_1d(fp, ll=ll, clip01=clip01)
+        elif np.ndim(fp) == 2:
+            return np.vstack(
+                [interp_func(self.x, self.xp, row, ll=ll, clip01=clip01) for row in fp]
+            )
+        return interp_func(self.x, self.xp, fp, ll=ll, clip01=clip01)
+
+
+def _interpolate_1d(x, xp, fp, side="left", sorter=None):
+    return InterpolationPlan(x, xp, side=side, sorter=sorter).apply(fp)
 
 
 def _transformed_x_interpolate_1d(
@@ -47,17 +161,22 @@ def _transformed_x_interpolate_1d(
     clip01: bool,
     ftransform: Callable | None = None,
     finvtransform: Callable | None = None,
+    plan: InterpolationPlan | None = None,
+    stacked: bool = False,
 ):
     if ll > 0:
         # Pas de lower limit toe op een kopie van de input
         fp = np.copy(fp)
         fp[fp < ll] = ll
 
+    if plan is None:
+        plan = InterpolationPlan(x, xp, side="left")
+
     if ftransform is not None and finvtransform is not None:
         # Transformeer de fp-waarden
-        f = finvtransform(_interpolate_1d(x, xp, ftransform(fp), side="left"))
+        f = finvtransform(plan.apply(ftransform(fp), stacked=stacked))
     else:
-        f = _interpolate_1d(x, xp, fp, side="left")
+        f = plan.apply(fp, stacked=stacked)
 
     if ll > 0:
         # Reset lower limit naar 0
@@ -313,3 +432,78 @@ def beta_y_interpolate_1d(
     """
     norm = import_scipy()
     return _transformed_y_interpolate_1d(y, xp, fp, ll, ftransform=norm.isf)
+
+
+def grouped_x_interpolate_1d(
+    x: np.ndarray,
+    x_group: np.ndarray,
+    xp: np.ndarray,
+    fp: np.ndarray,
+    xp_group: np.ndarray,
+    interp_func: Callable = log_x_interpolate_1d,
+    ll: float = 1e-200,
+    clip01: bool = False,
+) -> np.ndarray:
+    """Interpoleer meerdere curves in een keer, elke x-waarde op de curve van zijn eigen groep
+
+    De referentievectoren van alle curves staan achter elkaar in `xp` en `fp`, gesorteerd op
+    groep en binnen een groep op x-waarde. Extrapolatie gebeurt per groep, net als bij
+    `interpolate_1d`.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        X-waardes waarop geinterpoleerd moet worden
+    x_group : np.ndarray
+        Groepsnummer (int) per x-waarde
+    xp : np.ndarray
+        Referentievector van x-waardes van alle groepen
+    fp : np.ndarray
+        Referentievector van y-waardes van alle groepen
+    xp_group : np.ndarray
+        Oplopend groepsnummer (int) per referentiewaarde, elke groep heeft minimaal twee waardes
+    interp_func : Callable
+        Interpolatiefunctie, `interpolate_1d`, `log_x_interpolate_1d` of `beta_x_interpolate_1d`.
+        Andere functies worden per groep aangeroepen.
+    ll : float
+        Ondergrens voor de interpolatie, deze waarde of kleiner wordt als 0 gezien
+    clip01 : bool
+        Begrens resultaat tussen [0, 1]
+
+    Returns
+    -------
+    np.array
+        geinterpoleerde vector
+    """
+    x = np.asarray(x, dtype=float)
+    xp = np.asarray(xp, dtype=float)
+    xp_group_start = np.searchsorted(xp_group, x_group, side="left")
+    xp_group_end = np.searchsorted(xp_group, x_group, side="right")
+    if np.any(xp_group_end - xp_group_start < 2):
+        raise UserWarning("Elke groep moet minimaal twee referentiewaardes bevatten.")
+
+    if interp_func not in (interpolate_1d, log_x_interpolate_1d, beta_x_interpolate_1d):
+        f = np.empty(len(x), dtype=float)
+        for group in np.unique(x_group):
+            xs = x_group == group
+            xps = xp_group == group
+            f[xs] = interp_func(x[xs], xp[xps], fp[xps], ll=ll, clip01=clip01)
+        return f
+
+    # Bepaal per x-waarde het aantal referentiewaardes (over alle groepen) dat kleiner is,
+    # door x en xp samen te sorteren op groep en waarde. Bij gelijke waardes komt x eerst,
+    # net als bij np.searchsorted(..., side="left").
+    values = np.concatenate([x, xp])
+    groups = np.concatenate([x_group, xp_group])
+    is_reference = np.concatenate(
+        [np.zeros(len(x), dtype=np.int8), np.ones(len(xp), dtype=np.int8)]
+    )
+    order = np.lexsort((is_reference, values, groups))
+    n_smaller = np.cumsum(is_reference[order])
+    insert_index = np.empty(len(x), dtype=np.intp)
+    sel_x = is_reference[order] == 0
+    insert_index[order[sel_x]] = n_smaller[sel_x]
+
+    intidx = np.clip(insert_index - 1, xp_group_start, xp_group_end - 2)
+    plan = InterpolationPlan(x, xp, intidx=intidx)
+    return plan.apply_interp_func(interp_func, fp, ll=ll, clip01=clip01)
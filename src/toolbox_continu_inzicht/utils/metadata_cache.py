@@ -0,0 +1,290 @@
+"""
+Cache voor metadata van de belastingbronnen
+
+Locaties, bronnen en drempelwaardes van FEWS, Waterinfo, Matroos en de RWS webservice
+veranderen zelden. Met de decorator `cached_metadata` wordt het resultaat van een functie
+die deze metadata ophaalt bewaard:
+
+- in het geheugen, zolang het resultaat niet ouder is dan de `ttl` (in seconden);
+- optioneel als snapshot op schijf (`cache_dir`), zodat ook een volgende run (bijvoorbeeld
+  elk uur via een scheduler) de metadata niet opnieuw hoeft op te halen;
+- met `background_refresh` wordt een verouderd resultaat direct teruggegeven en op de
+  achtergrond vernieuwd.
+
+Als het vernieuwen mislukt met een `ConnectionError` en er is een verouderd resultaat,
+dan wordt dat resultaat gebruikt. Lege resultaten worden niet bewaard.
+
+De standaard cache wordt ingesteld met `configure_metadata_cache`, of in de configuratie
+onder `GlobalVariables: MetadataCache:` voor de belastingmodules die metadata gebruiken.
+De map voor de snapshots kan ook met de omgevingsvariabele
+`TOOLBOX_CONTINU_INZICHT_METADATA_CACHE` worden opgegeven. De oorspronkelijke functie,
+zonder cache, is beschikbaar als `functie.__wrapped__`.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import os
+from pathlib import Path
+import pickle
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+import warnings
+
+import pandas as pd
+
+METADATA_CACHE_ENVIRONMENT_VARIABLE = "TOOLBOX_CONTINU_INZICHT_METADATA_CACHE"
+
+
+class MetadataCache:
+    """
+    Cache met een maximale leeftijd, een snapshot op schijf en vernieuwen op de achtergrond
+
+    Parameters
+    ----------
+    ttl: float
+        Maximale leeftijd van een resultaat in seconden, standaard een dag
+    cache_dir: str | Path | None
+        Optioneel, map voor de snapshots op schijf
+    background_refresh: bool
+        Geef een verouderd resultaat direct terug en vernieuw het op de achtergrond
+    enabled: bool
+        Zonder cache wordt de metadata altijd opgehaald
+    """
+
+    def __init__(
+        self,
+        ttl: float = 24 * 3600,
+        cache_dir: str | Path | None = None,
+        background_refresh: bool = False,
+        enabled: bool = True,
+    ):
+        self.ttl = ttl
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.background_refresh = background_refresh
+        self.enabled = enabled
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._refreshing: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Geeft het resultaat uit de cache, of haalt het op met `fetch`
+
+        Parameters
+        ----------
+        key: str
+            Unieke sleutel van de functie en de argumenten
+        fetch: Callable[[], Any]
+            Functie die de metadata ophaalt
+
+        Returns
+        -------
+        Any
+            Een kopie van het resultaat, zodat aanpassingen de cache niet veranderen
+        """
+        if not self.enabled:
+            return fetch()
+
+        entry = self._get_entry(key)
+        if entry is not None:
+            fetched_at, value = entry
+            if time.time() - fetched_at < self.ttl:
+                return _copy(value)
+            if self.background_refresh:
+                self._refresh_in_background(key, fetch)
+                return _copy(value)
+
+        try:
+            value = self._refresh(key, fetch)
+        except ConnectionError as e:
+            if entry is None:
+                raise
+            warnings.warn(
+                f"Vernieuwen van de metadata is mislukt ({e}), de metadata van "
+                f"{time.ctime(entry[0])} wordt gebruikt."
+            )
+            value = entry[1]
+        return _copy(value)
+
+    def clear(self) -> None:
+        """Verwijdert de resultaten uit het geheugen en de snapshots op schijf"""
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.pkl"):
+                path.unlink(missing_ok=True)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wacht tot het vernieuwen op de achtergrond klaar is"""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def _get_entry(self, key: str) -> tuple[float, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load_snapshot(key)
+            if entry is not None:
+                with self._lock:
+                    self._entries.setdefault(key, entry)
+        return entry
+
+    def _refresh(self, key: str, fetch: Callable[[], Any]) -> Any:
+        value = fetch()
+        if not _is_empty(value):
+            entry = (time.time(), value)
+            with self._lock:
+                self._entries[key] = entry
+            self._save_snapshot(key, entry)
+        return value
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any]) -> None:
+        def refresh():
+            try:
+                self._refresh(key, fetch)
+            except Exception as e:
+                warnings.warn(
+                    f"Vernieuwen van de metadata op de achtergrond mislukt: {e}"
+                )
+            finally:
+                with self._lock:
+                    self._refreshing.pop(key, None)
+
+        with self._lock:
+            if key in self._refreshing:
+                return
+            thread = threading.Thread(target=refresh, daemon=True)
+            self._refreshing[key] = thread
+        thread.start()
+
+    def _snapshot_path(self, key: str) -> Path:
+        name = key.split("(", 1)[0].rsplit(".", 1)[-1]
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{name}-{digest}.pkl"
+
+    def _load_snapshot(self, key: str) -> tuple[float, Any] | None:
+        if self.cache_dir is None:
+            return None
+        path = self._snapshot_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                stored_key, fetched_at, value = pickle.load(f)
+        except Exception:
+            # een beschadigde snapshot wordt genegeerd en later overschreven
+            return None
+        if stored_key != key:
+            return None
+        return fetched_at, value
+
+    def _save_snapshot(self, key: str, entry: tuple[float, Any]) -> None:
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._snapshot_path(key)
+        # eerst onder een tijdelijke naam, zodat een andere run nooit een half bestand leest
+        file_descriptor, tmp_path = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=f".{path.stem}-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                pickle.dump((key, *entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    return False
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+_metadata_cache = MetadataCache(
+    cache_dir=os.environ.get(METADATA_CACHE_ENVIRONMENT_VARIABLE, None)
+)
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Geeft de standaard cache voor metadata"""
+    return _metadata_cache
+
+
+def configure_metadata_cache(
+    ttl: float | None = None,
+    cache_dir: str | Path | None = None,
+    background_refresh: bool | None = None,
+    enabled: bool | None = None,
+    root_dir: str | Path | None = None,
+) -> MetadataCache:
+    """Stelt de standaard cache voor metadata in, opties die None zijn blijven ongewijzigd
+
+    Parameters
+    ----------
+    ttl: float | None
+        Maximale leeftijd van de metadata in seconden
+    cache_dir: str | Path | None
+        Map voor de snapshots op schijf
+    background_refresh: bool | None
+        Verouderde metadata op de achtergrond vernieuwen
+    enabled: bool | None
+        Cache aan- of uitzetten
+    root_dir: str | Path | None
+        Optioneel, een relatieve `cache_dir` is ten opzichte van deze map
+
+    Returns
+    -------
+    MetadataCache
+    """
+    cache = _metadata_cache
+    if ttl is not None:
+        cache.ttl = float(ttl)
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        if root_dir is not None and not cache_dir.is_absolute():
+            cache_dir = Path(root_dir) / cache_dir
+        cache.cache_dir = cache_dir
+    if background_refresh is not None:
+        cache.background_refresh = background_refresh
+    if enabled is not None:
+        cache.enabled = enabled
+    return cache
+
+
+def cached_metadata(func: Callable) -> Callable:
+    """Decorator die het resultaat van een functie in de standaard metadata cache bewaart
+
+    De sleutel bestaat uit de naam van de functie en alle argumenten (inclusief
+    standaardwaardes), zodat `f("a")` en `f(location="a")` hetzelfde resultaat delen.
+    """
+    signature = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = ", ".join(
+            f"{argument}={value!r}" for argument, value in bound.arguments.items()
+        )
+        return _metadata_cache.get(
+            f"{name}({arguments})", lambda: func(*args, **kwargs)
+        )
+
+    return wrapper
@@ -1,6 +1,7 @@
 from pathlib import Path
 import os
 import warnings
+import pandas as pd
 from toolbox_continu_inzicht.base.config import Config
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
 from toolbox_continu_inzicht.proof_of_concept import ValuesTimesTwo, ValuesDivideTwo
@@ -192,3 +193,92 @@ def test_DataAdapter_temporary_adapter_config():
         assert current["path"] == "temp.csv"
 
     assert data_adapter.config.data_adapters[adapter_name] == original
+
+
+def test_DataAdapter_csv_schema_dtypes():
+    """Datatypes uit het schema worden bij het inlezen gebruikt"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(config_path=test_data_sets_path / "test_config.yaml")
+    config.lees_config()
+
+    data_adapter = DataAdapter(config=config)
+    schema = {
+        "measurement_location_id": "int64",
+        "parameter_id": "int32",
+        "date_time": ["datetime64[ns, UTC]", "object"],
+        "value": "float64",
+    }
+    df = data_adapter.input("MyCSV_schema_in", schema=schema)
+    assert str(df["parameter_id"].dtype) == "int32"
+    assert str(df["date_time"].dtype) == "datetime64[ns, UTC]"
+
+    # met engine pyarrow komen dezelfde gegevens terug
+    df_pyarrow = data_adapter.input("MyCSV_schema_pyarrow_in", schema=schema)
+    pd.testing.assert_frame_equal(df, df_pyarrow)
+
+    # zonder schema blijft het gedrag ongewijzigd
+    df_no_schema = data_adapter.input("MyCSV_schema_in")
+    assert str(df_no_schema["parameter_id"].dtype) == "int64"
+    assert df_no_schema["date_time"].dtype == object
+
+    # standaard (zonder schema_dtypes) worden de datatypes niet aangepast
+    schema_default = schema | {"parameter_id": "int64", "date_time": "object"}
+    with data_adapter.temporary_adapter_config(
+        "MyCSV_schema_in", {"schema_dtypes": False}
+    ):
+        df_default = data_adapter.input("MyCSV_schema_in", schema=schema_default)
+    pd.testing.assert_frame_equal(df_default, df_no_schema)
+
+
+def test_DataAdapter_csv_chunks():
+    """Met chunksize wordt een iterator met blokken teruggegeven die elk gecontroleerd worden"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(config_path=test_data_sets_path / "test_config.yaml")
+    config.lees_config()
+
+    data_adapter = DataAdapter(config=config)
+    schema = {
+        "measurement_location_id": "int64",
+        "parameter_id": "int32",
+        "date_time": ["datetime64[ns, UTC]", "object"],
+        "value": "float64",
+    }
+    chunks = list(data_adapter.input("MyCSV_schema_chunks_in", schema=schema))
+    assert [len(df_chunk) for df_chunk in chunks] == [2, 2, 1]
+    assert all(
+        str(df_chunk["date_time"].dtype) == "datetime64[ns, UTC]" for df_chunk in chunks
+    )
+
+    df = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(
+        df, data_adapter.input("MyCSV_schema_in", schema=schema)
+    )
+
+    with pytest.raises(UserWarning):
+        list(
+            data_adapter.input(
+                "MyCSV_schema_chunks_in", schema={"measurement_location_id": "object"}
+            )
+        )
+
+    # de pyarrow parser kan niet in blokken lezen
+    with data_adapter.temporary_adapter_config(
+        "MyCSV_schema_chunks_in", {"engine": "pyarrow"}
+    ):
+        with pytest.raises(UserWarning, match="chunksize"):
+            data_adapter.input("MyCSV_schema_chunks_in", schema=schema)
+
+
+def test_DataAdapter_csv_source_chunks():
+    """Met chunksize wordt elk blok op de kolom 'source' gefilterd"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(config_path=test_data_sets_path / "test_config.yaml")
+    config.lees_config()
+
+    data_adapter = DataAdapter(config=config)
+    df = data_adapter.input("MyCSV_source_in")
+    assert df["measurement_location_id"].tolist() == [1, 3, 5]
+
+    chunks = list(data_adapter.input("MyCSV_source_chunks_in"))
+    assert [len(df_chunk) for df_chunk in chunks] == [1, 1, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks), df)
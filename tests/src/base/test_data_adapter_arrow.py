@@ -0,0 +1,122 @@
+from pathlib import Path
+import shutil
+import pandas as pd
+import pytest
+from toolbox_continu_inzicht.base.config import Config
+from toolbox_continu_inzicht.base.data_adapter import DataAdapter
+
+
+def helper_create_data_adapter():
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(config_path=test_data_sets_path / "test_config_arrow.yaml")
+    config.lees_config()
+    return DataAdapter(config=config)
+
+
+def helper_create_dataframe():
+    df = pd.read_csv(Path(__file__).parent / "data_sets" / "test_csv_in.csv")
+    df["date_time"] = pd.to_datetime(df["date_time"], unit="ms", utc=True)
+    df["date_time"] += pd.to_timedelta(df["objectid"], unit="h")
+    df["objecttype"] = df["objecttype"].astype("category")
+    return df
+
+
+@pytest.mark.parametrize("file_type", ["parquet", "feather"])
+def test_DataAdapter_arrow_dtypes(file_type):
+    """Controleer of de datatypes behouden blijven bij het wegschrijven en inlezen"""
+    data_adapter = helper_create_data_adapter()
+    df = helper_create_dataframe()
+    data_adapter.output(f"my_{file_type}_out", df)
+    df_in = data_adapter.input(
+        f"my_{file_type}_in", schema={"date_time": "datetime64[ns, UTC]"}
+    )
+    pd.testing.assert_frame_equal(df_in, df.reset_index(drop=True))
+
+
+@pytest.mark.parametrize("file_type", ["parquet", "feather"])
+def test_DataAdapter_arrow_columns_filters(file_type):
+    """Controleer het selecteren van kolommen en filteren op waarden en datetimes"""
+    data_adapter = helper_create_data_adapter()
+    df = helper_create_dataframe()
+    data_adapter.output(f"my_{file_type}_out", df)
+    overrides = {
+        "columns": ["objectid", "date_time", "value"],
+        "filters": [
+            ["objectid", "in", [1, 2, 3, 4]],
+            ["date_time", ">", df["date_time"].iloc[1].strftime("%Y-%m-%d %H:%M:%S")],
+        ],
+    }
+    with data_adapter.temporary_adapter_config(f"my_{file_type}_in", overrides):
+        df_in = data_adapter.input(f"my_{file_type}_in")
+
+    assert df_in.columns.tolist() == ["objectid", "date_time", "value"]
+    assert df_in["objectid"].tolist() == [3, 4]
+
+
+def test_DataAdapter_feather_record_batches():
+    """Controleer het filteren per record batch op een kolom die niet wordt ingelezen"""
+    import pyarrow as pa
+
+    data_adapter = helper_create_data_adapter()
+    df = helper_create_dataframe()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    path = Path(__file__).parent / "data_sets" / "hidden_test_out.feather"
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=2):
+                writer.write_batch(batch)
+
+    overrides = {"columns": ["value"], "filters": [["objectid", ">=", 3]]}
+    with data_adapter.temporary_adapter_config("my_feather_in", overrides):
+        df_in = data_adapter.input("my_feather_in")
+
+    assert df_in.columns.tolist() == ["value"]
+    assert df_in["value"].tolist() == df.loc[df["objectid"] >= 3, "value"].tolist()
+
+
+def test_DataAdapter_arrow_invalid_filter():
+    data_adapter = helper_create_data_adapter()
+    data_adapter.output("my_parquet_out", helper_create_dataframe())
+    overrides = {"filters": [["not_a_column", "==", 1]]}
+    with data_adapter.temporary_adapter_config("my_parquet_in", overrides):
+        with pytest.raises(UserWarning, match="not_a_column"):
+            data_adapter.input("my_parquet_in")
+
+
+def test_DataAdapter_parquet_dataset():
+    """Controleer het partitioneren op rekentijd en het inlezen van alleen de gefilterde partities"""
+    data_adapter = helper_create_data_adapter()
+    dataset_path = Path(__file__).parent / "data_sets" / "hidden_test_dataset"
+    shutil.rmtree(dataset_path, ignore_errors=True)
+    df = helper_create_dataframe()
+
+    calc_times = ["2024-11-17 23:00:00+00:00", "2024-11-18 00:00:00+00:00"]
+    for calc_time in calc_times + calc_times[-1:]:  # laatste run wordt herhaald
+        data_adapter.set_global_variable("calc_time", pd.Timestamp(calc_time))
+        data_adapter.output("my_parquet_dataset_out", df)
+
+    assert (dataset_path / "calc_date=2024-11-18" / "objectid=1").is_dir()
+    assert len(list(dataset_path.rglob(".*"))) == 0  # geen tijdelijke bestanden
+
+    df_in = data_adapter.input("my_parquet_dataset_in")
+    # herhalen van een run vervangt de resultaten van die rekentijd
+    assert len(df_in) == 2 * len(df)
+
+    overrides = {
+        "filters": [["calc_date", "==", "2024-11-18"], ["objectid", "in", [1, 2]]]
+    }
+    with data_adapter.temporary_adapter_config("my_parquet_dataset_in", overrides):
+        df_in = data_adapter.input("my_parquet_dataset_in")
+    assert sorted(df_in["objectid"].tolist()) == [1, 2]
+    assert (df_in["calc_time"] == pd.Timestamp(calc_times[-1])).all()
+
+    # met overwrite_partitions verdwijnen eerdere rekentijden uit de geschreven partities
+    calc_time = pd.Timestamp("2024-11-18 01:00:00+00:00")
+    data_adapter.set_global_variable("calc_time", calc_time)
+    overrides = {"overwrite_partitions": True}
+    with data_adapter.temporary_adapter_config("my_parquet_dataset_out", overrides):
+        data_adapter.output("my_parquet_dataset_out", df)
+    df_in = data_adapter.input("my_parquet_dataset_in")
+    assert len(df_in) == 2 * len(df)
+    df_in = df_in[df_in["calc_time"].dt.strftime("%Y-%m-%d") == "2024-11-18"]
+    assert (df_in["calc_time"] == calc_time).all()
@@ -0,0 +1,99 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+from toolbox_continu_inzicht.base.config import Config
+from toolbox_continu_inzicht.base.adapters.output import xml
+from toolbox_continu_inzicht.base.data_adapter import DataAdapter
+
+
+def helper_create_data_adapter():
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(config_path=test_data_sets_path / "test_config_xml.yaml")
+    config.lees_config()
+    return DataAdapter(config=config)
+
+
+def test_DataAdapter_xml_timeseries():
+    """Controleer het inlezen van een PI-XML bestand (tijdzone, locaties en id's)"""
+    data_adapter = helper_create_data_adapter()
+    df = data_adapter.input("my_xml_in")
+
+    assert len(df) == 8
+    assert str(df["date_time"].dtype) == "datetime64[ns, UTC]"
+    # tijdzone 1.0 in het bestand, omgezet naar UTC
+    assert df["date_time"].iloc[0] == pd.Timestamp("2024-11-06 07:00:00", tz="UTC")
+    assert df["date_time"].iloc[-1] == pd.Timestamp("2024-11-07 00:00:00", tz="UTC")
+    # zonder locationId wordt de stationName gebruikt
+    assert df["measurement_location_code"].unique().tolist() == ["PB-288", "PB-301"]
+    assert df["value"].iloc[5:].tolist() == [1.5, 1.25, 1.0]
+
+    # dezelfde code geeft hetzelfde id
+    assert (
+        df.groupby("measurement_location_code")["measurement_location_id"]
+        .nunique()
+        .eq(1)
+        .all()
+    )
+    assert df["measurement_location_id"].nunique() == 2
+    assert df["parameter_id"].nunique() == 1
+    assert df["parameter_id"].dtype == "int64"
+
+
+def test_DataAdapter_xml_timeseries_chunks():
+    """In blokken inlezen geeft (samengevoegd) hetzelfde resultaat"""
+    data_adapter = helper_create_data_adapter()
+    df = data_adapter.input("my_xml_in")
+    chunks = list(data_adapter.input("my_xml_chunks_in"))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+
+def test_DataAdapter_xml_timeseries_write():
+    """Wegschrijven en opnieuw inlezen geeft dezelfde reeksen terug"""
+    data_adapter = helper_create_data_adapter()
+    df = data_adapter.input("my_xml_in")
+    data_adapter.output("my_xml_out", df.copy())
+    df_out = data_adapter.input("my_xml_out_in")
+
+    # het bestand wordt met tijdzone 1.0 geschreven, de datums gelden dan als UTC+1
+    df_expected = df.copy()
+    df_expected["date_time"] -= pd.Timedelta(hours=1)
+    pd.testing.assert_frame_equal(df_out, df_expected)
+
+    text = (Path(__file__).parent / "data_sets" / "hidden_test_out.xml").read_text()
+    assert text.count("<series>") == 2
+    assert "<locationId>PB-301</locationId>" in text
+    assert '<timeStep unit="second" multiplier="3600"/>' in text
+    assert '<event date="2024-11-06" time="22:00:00" value="1.5" flag="0"/>' in text
+
+
+def test_DataAdapter_xml_timeseries_write_blocks(monkeypatch):
+    """Kleine blokken events geven hetzelfde bestand"""
+    data_adapter = helper_create_data_adapter()
+    df = data_adapter.input("my_xml_in")
+    path = Path(__file__).parent / "data_sets" / "hidden_test_out.xml"
+    data_adapter.output("my_xml_out", df.copy())
+    text = path.read_text()
+
+    monkeypatch.setattr(xml, "XML_EVENT_BLOCK_SIZE", 3)
+    data_adapter.output("my_xml_out", df.copy())
+    assert path.read_text() == text
+
+
+def test_DataAdapter_xml_timeseries_write_error(monkeypatch):
+    """Bij een fout tijdens het schrijven blijft het bestaande bestand ongewijzigd"""
+    data_adapter = helper_create_data_adapter()
+    df = data_adapter.input("my_xml_in")
+    path = Path(__file__).parent / "data_sets" / "hidden_test_out.xml"
+    data_adapter.output("my_xml_out", df.copy())
+    text = path.read_text()
+
+    def format_events(date_time, value):
+        raise ValueError("Ongeldige waarde")
+
+    monkeypatch.setattr(xml, "_format_events", format_events)
+    with pytest.raises(ValueError):
+        data_adapter.output("my_xml_out", df.copy())
+    assert path.read_text() == text
+    assert list(path.parent.glob(".hidden_test_out.xml-*")) == []
@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from toolbox_continu_inzicht.base.fragility_curve_cache import FragilityCurveCache
+
+
+def _get_cache_dir() -> Path:
+    cache_dir = Path(__file__).parent / "data_sets" / "hidden_fragility_curve_cache"
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return cache_dir
+
+
+def test_fragility_curve_cache_hash_inputs():
+    """De sleutel hangt af van de inhoud, niet van een integer index of de volgorde van opties"""
+    df = pd.DataFrame({"x": [1.0, 2.0], "slopetypeid": [1, 2]})
+    key = FragilityCurveCache.hash_inputs([df], options={"a": 1, "b": 2})
+
+    df_other_index = df.set_index(pd.Index([10, 11]))
+    assert key == FragilityCurveCache.hash_inputs(
+        [df_other_index], options={"b": 2, "a": 1, "cache_dir": "ergens"}
+    )
+    df_changed = df.assign(x=[1.0, 2.5])
+    assert key != FragilityCurveCache.hash_inputs(
+        [df_changed], options={"a": 1, "b": 2}
+    )
+    assert key != FragilityCurveCache.hash_inputs([df], options={"a": 1, "b": 3})
+    assert key != FragilityCurveCache.hash_inputs(
+        [df], options={"a": 1, "b": 2}, key_prefix="piping"
+    )
+
+
+def test_fragility_curve_cache_lru():
+    """Bij het overschrijden van de maximale grootte wordt de langst niet gebruikte entry verwijderd"""
+    cache = FragilityCurveCache(_get_cache_dir(), max_size_mb=1.0)
+    arrays = {"failure_probability": np.zeros(50_000)}  # ~0.4 MB per entry
+
+    assert cache.get("a") is None
+    cache.put("a", arrays)
+    cache.put("b", arrays)
+    # maak 'a' recent gebruikt, zodat 'b' als eerste verwijderd wordt
+    os.utime(cache._get_path("b"), (0, 0))
+    assert cache.get("a") is not None
+    cache.put("c", arrays)
+
+    assert cache.get("b") is None
+    assert np.array_equal(
+        cache.get("a")["failure_probability"], arrays["failure_probability"]
+    )
+    assert cache.get("c") is not None
+    assert cache.hits == 3
+    assert cache.misses == 2
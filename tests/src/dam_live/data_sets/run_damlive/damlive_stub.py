@@ -0,0 +1,69 @@
+"""
+Vervanger van DAM Live voor de tests
+
+Leest de invoer tijdreeksen en schrijft per tijdstip een stabiliteitsfactor voor twee
+locaties, afgeleid van het gemiddelde van de invoer op dat tijdstip. Met de omgevingsvariabele
+DAMLIVE_STUB_SLEEP (seconden) kan een lange berekening worden nagebootst, met
+DAMLIVE_STUB_FAIL een berekening die direct mislukt als het .damx pad deze tekst bevat.
+"""
+
+import argparse
+import os
+from pathlib import Path
+import time
+import xml.etree.ElementTree as ET
+
+NAMESPACE = "{http://www.wldelft.nl/fews/PI}"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-d", dest="damx", required=True)
+parser.add_argument("-i", dest="input", required=True)
+parser.add_argument("-o", dest="output", required=True)
+parser.add_argument("-p", dest="parameters", required=True)
+args = parser.parse_args()
+
+for path in [args.damx, args.input, args.parameters]:
+    if not Path(path).exists():
+        raise SystemExit(f"Bestand {path} niet gevonden")
+
+# DAM Live schrijft de berekeningen naast het .damx bestand
+damx = Path(args.damx)
+(damx.parent / f"{damx.stem}.Calc").mkdir(exist_ok=True)
+print(f"Start berekening {damx.name}", flush=True)
+fail = os.environ.get("DAMLIVE_STUB_FAIL", "")
+if fail and fail in str(damx):
+    raise SystemExit("Berekening mislukt")
+time.sleep(float(os.environ.get("DAMLIVE_STUB_SLEEP", 0)))
+
+root = ET.parse(args.input).getroot()
+time_zone = root.find(f"{NAMESPACE}timeZone").text
+values = {}
+for event in root.iter(f"{NAMESPACE}event"):
+    key = (event.get("date"), event.get("time"))
+    values.setdefault(key, []).append(float(event.get("value")))
+
+lines = [
+    '<?xml version="1.0" encoding="utf-8" standalone="yes"?>',
+    '<TimeSeries version="1.2" xmlns="http://www.wldelft.nl/fews/PI">',
+    f"  <timeZone>{time_zone}</timeZone>",
+]
+for offset, location in enumerate(["PU0013_DWP001", "PU0021_DWP002"]):
+    lines += [
+        "  <series>",
+        "    <header>",
+        "      <type>instantaneous</type>",
+        f"      <locationId>{location}</locationId>",
+        "      <parameterId>StabilityInsideFactor</parameterId>",
+        "      <stationName></stationName>",
+        "      <units>-</units>",
+        "    </header>",
+    ]
+    for (date, time_str), event_values in sorted(values.items()):
+        factor = 1.0 + offset + sum(event_values) / len(event_values) / 10
+        lines.append(
+            f'    <event date="{date}" time="{time_str}" value="{factor}" flag="0" />'
+        )
+    lines.append("  </series>")
+lines.append("</TimeSeries>")
+Path(args.output).write_text("\n".join(lines), encoding="utf-8")
+print(f"Klaar, {len(values)} tijdstippen berekend", flush=True)
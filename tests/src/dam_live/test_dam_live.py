@@ -1,6 +1,12 @@
 # initialiseer de (toolbox continu inzicht) modules
 from pathlib import Path
+import shutil
+import subprocess
+import sys
 
+import pandas as pd
+
+from toolbox_continu_inzicht.base.adapters.input.dam_live import json_folder
 from toolbox_continu_inzicht.base.config import Config
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
 from toolbox_continu_inzicht.dam_live.merge_stage import CombineDamLiveResults
@@ -35,3 +41,79 @@ def test_dam_live_parse():
     assert len(merge_df.df_merged_soils) > 0
     assert len(merge_df.df_merged_waternet) > 0
     assert len(merge_df.df_merged_calculations) > 0
+
+
+def test_dam_live_json_cache(tmp_path):
+    """Ongewijzigde JSON folders komen uit de cache, na een wijziging wordt opnieuw ingelezen"""
+    folder = tmp_path / "geometries"
+    shutil.copytree(
+        Path(__file__).parent / "data_sets" / "WV2030_PU0013_87074-1" / "geometries",
+        folder,
+    )
+    data_adapter = setup_data_adapter()
+    data_adapter.config.global_variables["rootdir"] = str(tmp_path)
+
+    # zonder de optie `cache` wordt niets bewaard
+    json_folder._json_table_cache.clear()
+    data_adapter.input("geometries")
+    assert len(json_folder._json_table_cache) == 0
+    assert list(tmp_path.glob("*.parquet")) == []
+
+    data_adapter.config.data_adapters["geometries"]["cache"] = True
+
+    df = data_adapter.input("geometries")
+    cache_path = tmp_path / ".geometries.geometries.parquet"
+    assert cache_path.exists()
+
+    # zonder de cache in het geheugen: lezen uit het Parquet bestand
+    json_folder._json_table_cache.clear()
+    df_cached = data_adapter.input("geometries")
+    pd.testing.assert_frame_equal(df_cached, df)
+    assert isinstance(df_cached["points"].iloc[0], list)
+
+    # een gewijzigd bestand wordt opnieuw ingelezen
+    geometry_file = folder / "geometry.json"
+    geometry_file.write_text(
+        geometry_file.read_text().replace('"Surface 14"', '"Surface 14 (nieuw)"')
+    )
+    df_changed = data_adapter.input("geometries")
+    assert "Surface 14 (nieuw)" in df_changed["layer_label"].tolist()
+    assert "Surface 14 (nieuw)" not in df["layer_label"].tolist()
+
+
+def test_dam_live_merge_without_matplotlib():
+    """Het importeren van de module laadt matplotlib niet"""
+    code = (
+        "import sys; import toolbox_continu_inzicht.dam_live.merge_stage; "
+        "assert 'matplotlib' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_dam_live_render_stages(tmp_path):
+    data_adapter = setup_data_adapter()
+    data_adapter.config.global_variables["CombineDamLiveResults"] = {
+        "plot": True,
+        "figure_dir": str(tmp_path),
+        "xlim": [0, 60],
+        "ylim": [-15, 6],
+        "max_workers": 2,
+    }
+    merge_df = CombineDamLiveResults(data_adapter=data_adapter)
+    merge_df.run(
+        input=[
+            "scenario",
+            "geometries",
+            "soils",
+            "soillayers",
+            "waternets",
+            "calculationsettings",
+        ],
+        output=["merge_soil", "merge_waternet", "merge_calculations"],
+    )
+    figure = tmp_path / "stage_43.png"
+    assert figure.exists()
+    assert figure.read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+
+    paths = merge_df.render_stages(output_dir=tmp_path / "serial", max_workers=1)
+    assert paths == [tmp_path / "serial" / "stage_43.png"]
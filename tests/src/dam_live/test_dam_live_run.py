@@ -0,0 +1,105 @@
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+from toolbox_continu_inzicht.base.config import Config
+from toolbox_continu_inzicht.base.data_adapter import DataAdapter
+from toolbox_continu_inzicht.dam_live import UpdateDamLive
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="DAM Live stub wordt als shell script gestart"
+)
+
+
+def setup_data_adapter(tmp_path: Path, options: dict) -> DataAdapter:
+    """Kopieert de testdata naar een tijdelijke map en gebruikt de stub als DAM Live"""
+    test_data_path = Path(__file__).parent / "data_sets" / "run_damlive"
+    root_dir = tmp_path / "run_damlive"
+    shutil.copytree(test_data_path, root_dir)
+
+    damlive_exe = tmp_path / "damlive"
+    damlive_exe.write_text(
+        f'#!/bin/sh\nexec "{sys.executable}" "{root_dir / "damlive_stub.py"}" "$@"\n'
+    )
+    damlive_exe.chmod(0o755)
+    dotenv_path = tmp_path / ".env"
+    dotenv_path.write_text(f"DAMLIVE_EXE={damlive_exe}\n")
+
+    config = Config(config_path=test_data_path / "test_dam_live_run_config.yaml")
+    config.lees_config()
+    config.global_variables["rootdir"] = str(root_dir)
+    config.global_variables["dotenv_path"] = str(dotenv_path)
+    config.global_variables["UpdateDamLive"].update(options)
+    return DataAdapter(config=config)
+
+
+def run_dam_live(data_adapter: DataAdapter) -> pd.DataFrame:
+    update_dam_live = UpdateDamLive(data_adapter=data_adapter)
+    update_dam_live.run(input=["loads", "parameters"], output="output")
+    return update_dam_live.df_out
+
+
+def test_dam_live_run(tmp_path):
+    data_adapter = setup_data_adapter(tmp_path / "single", {})
+    df_out = run_dam_live(data_adapter)
+
+    assert df_out["measurement_location_code"].unique().tolist() == [
+        "PU0013_DWP001",
+        "PU0021_DWP002",
+    ]
+    assert len(df_out) == 2 * 24
+    assert (tmp_path / "single" / "run_damlive" / "stub.Calc").exists()
+
+
+def test_dam_live_run_shards(tmp_path):
+    """Parallel in delen rekenen geeft dezelfde uitvoer als in een keer"""
+    df_single = run_dam_live(setup_data_adapter(tmp_path / "single", {}))
+
+    data_adapter = setup_data_adapter(
+        tmp_path / "shards", {"n_shards": 3, "max_workers": 2, "timeout": 60}
+    )
+    df_shards = run_dam_live(data_adapter)
+    pd.testing.assert_frame_equal(df_shards, df_single)
+    # de invoer wordt alleen per deel geschreven
+    assert not (
+        tmp_path / "shards" / "run_damlive" / "live.InputTimeSeries.xml"
+    ).exists()
+
+    # elk deel heeft een eigen werkmap en een eigen kopie van het .damx bestand
+    shard_dir = tmp_path / "shards" / "run_damlive" / "live_shards"
+    shards = sorted(path.name for path in shard_dir.iterdir())
+    assert shards == ["shard_000", "shard_001", "shard_002"]
+    for shard in shards:
+        assert (shard_dir / shard / "stub.damx").exists()
+        assert (shard_dir / shard / "stub.Calc").exists()
+        assert (shard_dir / shard / "live.OutputTimeSeries.xml").exists()
+
+
+def test_dam_live_run_timeout(tmp_path, monkeypatch):
+    monkeypatch.setenv("DAMLIVE_STUB_SLEEP", "30")
+    data_adapter = setup_data_adapter(
+        tmp_path, {"n_shards": 2, "max_workers": 2, "timeout": 0.5}
+    )
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_dam_live(data_adapter)
+
+
+def test_dam_live_run_shard_error(tmp_path, monkeypatch):
+    """Na een mislukt deel worden de overige delen gestopt en niet meer gestart"""
+    monkeypatch.setenv("DAMLIVE_STUB_SLEEP", "30")
+    monkeypatch.setenv("DAMLIVE_STUB_FAIL", "shard_000")
+    data_adapter = setup_data_adapter(tmp_path, {"n_shards": 3, "max_workers": 2})
+
+    start = time.monotonic()
+    with pytest.raises(subprocess.CalledProcessError):
+        run_dam_live(data_adapter)
+    assert time.monotonic() - start < 20
+
+    shard_dir = tmp_path / "run_damlive" / "live_shards"
+    for shard in ["shard_001", "shard_002"]:
+        assert not (shard_dir / shard / "live.OutputTimeSeries.xml").exists()
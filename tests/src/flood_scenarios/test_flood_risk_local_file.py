@@ -0,0 +1,103 @@
+from pathlib import Path
+import numpy as np
+import pytest
+import rasterio
+from toolbox_continu_inzicht.base.config import Config
+from toolbox_continu_inzicht.base.data_adapter import DataAdapter
+
+
+def helper_create_data_adapter(name):
+    """Create a DataAdapter object with the given config file name, reducing code duplication."""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(config_path=test_data_sets_path / name)
+    config.lees_config()
+    return DataAdapter(config=config)
+
+
+def helper_write_synthetic_grid():
+    """Schrijft een klein grid (40 x 50 pixels van 10 m) met een nodata-waarde in de hoek."""
+    data = np.arange(40 * 50, dtype=np.float32).reshape(40, 50)
+    data[0, 0] = -9999
+    transform = rasterio.transform.from_origin(1000, 2000, 10, 10)
+    grid_path = Path(__file__).parent / "data_sets" / "hidden_synthetic_grid.tif"
+    with rasterio.open(
+        grid_path,
+        "w",
+        driver="GTiff",
+        height=data.shape[0],
+        width=data.shape[1],
+        count=1,
+        dtype="float32",
+        nodata=-9999,
+        transform=transform,
+    ) as dst:
+        dst.write(data, 1)
+    return data, transform
+
+
+def test_flood_risk_local_file_full():
+    data, transform = helper_write_synthetic_grid()
+    data_adapter = helper_create_data_adapter("test_flood_risk_local_file.yaml")
+    array_masked_grid, affine = data_adapter.input("flood_risk_local_file")
+    assert array_masked_grid.shape == data.shape
+    assert array_masked_grid.dtype == np.float32
+    assert array_masked_grid.mask[0, 0]
+    assert affine == transform
+    assert array_masked_grid[5, 7] == data[5, 7]
+
+
+def test_flood_risk_local_file_bounds():
+    data, _ = helper_write_synthetic_grid()
+    data_adapter = helper_create_data_adapter("test_flood_risk_local_file.yaml")
+    # grenzen vallen niet precies op pixels, dus wordt naar buiten afgerond
+    overrides = {"bounds": [1105, 1805, 1195, 1895]}
+    with data_adapter.temporary_adapter_config("flood_risk_local_file", overrides):
+        array_masked_grid, affine = data_adapter.input("flood_risk_local_file")
+    assert array_masked_grid.shape == (10, 10)
+    assert (affine.c, affine.f) == (1100, 1900)
+    np.testing.assert_array_equal(array_masked_grid.data, data[10:20, 10:20])
+
+
+def test_flood_risk_local_file_bounds_outside():
+    helper_write_synthetic_grid()
+    data_adapter = helper_create_data_adapter("test_flood_risk_local_file.yaml")
+    overrides = {"bounds": [0, 0, 10, 10]}
+    with data_adapter.temporary_adapter_config("flood_risk_local_file", overrides):
+        with pytest.raises(UserWarning, match="vallen buiten het raster"):
+            data_adapter.input("flood_risk_local_file")
+
+    # met window_optional wordt dan het hele raster gelezen
+    overrides["window_optional"] = True
+    with data_adapter.temporary_adapter_config("flood_risk_local_file", overrides):
+        array_masked_grid, _ = data_adapter.input("flood_risk_local_file")
+    assert array_masked_grid.shape == (40, 50)
+
+
+def test_flood_risk_local_file_overview_level():
+    helper_write_synthetic_grid()
+    data_adapter = helper_create_data_adapter("test_flood_risk_local_file.yaml")
+    with data_adapter.temporary_adapter_config(
+        "flood_risk_local_file", {"overview_level": 0}
+    ):
+        array_masked_grid, affine = data_adapter.input("flood_risk_local_file")
+    assert array_masked_grid.shape == (20, 25)
+    assert affine.a == 20 and affine.e == -20
+
+
+def test_flood_risk_local_file_blocks():
+    data, transform = helper_write_synthetic_grid()
+    data_adapter = helper_create_data_adapter("test_flood_risk_local_file.yaml")
+    result = np.full(data.shape, np.nan, dtype=np.float32)
+    n_blocks = 0
+    for window, array_masked_block, affine in data_adapter.input(
+        "flood_risk_local_file_blocks"
+    ):
+        n_blocks += 1
+        assert array_masked_block.shape[0] <= 16 and array_masked_block.shape[1] <= 16
+        assert affine == rasterio.windows.transform(window, transform)
+        row_slice, col_slice = window.toslices()
+        result[row_slice, col_slice] = array_masked_block.filled(np.nan)
+
+    assert n_blocks == 3 * 4
+    assert np.isnan(result[0, 0])
+    np.testing.assert_array_equal(result[1:, 1:], data[1:, 1:])
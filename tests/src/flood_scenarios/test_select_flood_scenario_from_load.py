@@ -1,4 +1,9 @@
+import numpy as np
+import pytest
 from toolbox_continu_inzicht.flood_scenarios import SelectFloodScenarioFromLoad
+from toolbox_continu_inzicht.flood_scenarios.select_flood_scenario_from_load import (
+    select_scenario_positions,
+)
 
 from pathlib import Path
 from toolbox_continu_inzicht.base.config import Config
@@ -130,3 +135,27 @@ def test_load_from_flood_scenario_two_small():
         2.497,
         2.723,
     ]
+
+
+def test_select_scenario_positions_unsorted():
+    """test of de selectie onafhankelijk is van de volgorde van de gevolgberekeningen"""
+    positions = select_scenario_positions(
+        consequence_segment_ids=np.array([2, 1, 2, 1, 2, 1]),
+        consequence_loads=np.array([3.0, 2.0, 1.0, 1.0, 2.0, 3.0]),
+        segment_ids=np.array([1, 2]),
+        hydraulic_loads=np.array([1.5, 5.0]),
+        return_two_scenarios=True,
+    )
+    # segment 1: 1.0 (positie 3) en 2.0 (positie 1), segment 2: 2.0 (positie 4) en 3.0 (positie 0)
+    assert positions.tolist() == [3, 1, 4, 0]
+
+
+def test_select_scenario_positions_missing_segment():
+    """test of een segment zonder gevolgberekeningen een duidelijke melding geeft"""
+    with pytest.raises(UserWarning, match="segment"):
+        select_scenario_positions(
+            consequence_segment_ids=np.array([1, 1]),
+            consequence_loads=np.array([1.0, 2.0]),
+            segment_ids=np.array([1, 3]),
+            hydraulic_loads=np.array([1.5, 1.5]),
+        )
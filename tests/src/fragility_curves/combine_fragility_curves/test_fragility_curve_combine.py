@@ -9,6 +9,7 @@ from toolbox_continu_inzicht.base.data_adapter import DataAdapter
 from toolbox_continu_inzicht.fragility_curves import (
     CombineFragilityCurvesDependent,
     CombineFragilityCurvesIndependent,
+    CombineFragilityCurvesMultiple,
     CombineFragilityCurvesWeightedSum,
 )
 
@@ -357,3 +358,128 @@ def test_combine_fragility_curves_largeset_csv(benchmark):
 
     results = benchmark(perf_test)
     assert all(results)
+
+
+def test_combine_fragility_curves_multiple_step():
+    """Test de CombineFragilityCurvesMultiple functie met gewogen som voor 2 vakken met stapfragility curves"""
+    df_fc = pd.DataFrame(
+        {
+            "hydraulicload": [1, 1.2, 1.2, 1.6, 1, 1.4, 1.4, 1.6],
+            "failure_probability": [0.01, 0.01, 0.1, 0.1, 0.01, 0.01, 0.1, 0.1],
+            "failuremechanism_id": [2, 2, 2, 2, 3, 3, 3, 3],
+        }
+    )
+    # vak 2 heeft dezelfde curves in omgekeerde volgorde, het resultaat moet gelijk zijn
+    df_fc_multiple = pd.concat(
+        [
+            df_fc.assign(section_id=1, measure_id=0),
+            df_fc.iloc[::-1].assign(section_id=2, measure_id=0),
+        ],
+        ignore_index=True,
+    )
+    df_weights = pd.DataFrame({"failuremechanism_id": [2, 3], "weights": [0.5, 0.5]})
+
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(
+        config_path=test_data_sets_path / "test_combine_fragility_curve.yaml"
+    )
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+    data_adapter.set_dataframe_adapter("fc_step", df_fc_multiple, if_not_exist="create")
+    data_adapter.set_dataframe_adapter("weights", df_weights, if_not_exist="create")
+    data_adapter.set_dataframe_adapter("df_test", pd.DataFrame(), if_not_exist="create")
+    data_adapter.config.global_variables["CombineFragilityCurvesMultiple"] = {
+        "combine_method": "weighted_sum"
+    }
+
+    combine_fragility_curve = CombineFragilityCurvesMultiple(data_adapter=data_adapter)
+    combine_fragility_curve.run(input=["fc_step", "weights"], output="df_test")
+    result = combine_fragility_curve.df_out
+
+    expected_fp = [0.01] * 6 + [0.055] * 6 + [0.1] * 5
+    for section_id in [1, 2]:
+        result_section = result[result["section_id"] == section_id]
+        assert (result_section["failuremechanism_id"] == 1).all()
+        assert np.allclose(result_section["failure_probability"], expected_fp, atol=0)
+        assert np.allclose(
+            result_section["hydraulicload"].to_numpy()[[4, 5, 6, 10, 11, 12]],
+            [1.2, 1.2, 1.2, 1.4, 1.4, 1.4],
+        )
+
+
+def test_combine_fragility_curves_multiple_unknown_method():
+    """Test dat een onbekende combine_method een foutmelding geeft"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(
+        config_path=test_data_sets_path / "test_combine_fragility_curve.yaml"
+    )
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+    df_fc = pd.DataFrame(
+        {
+            "section_id": [1, 1],
+            "measure_id": [0, 0],
+            "failuremechanism_id": [2, 2],
+            "hydraulicload": [1.0, 2.0],
+            "failure_probability": [0.1, 0.2],
+        }
+    )
+    data_adapter.set_dataframe_adapter("fc", df_fc, if_not_exist="create")
+    data_adapter.config.global_variables["CombineFragilityCurvesMultiple"] = {
+        "combine_method": "onbekend"
+    }
+    combine_fragility_curve = CombineFragilityCurvesMultiple(data_adapter=data_adapter)
+    with pytest.raises(UserWarning):
+        combine_fragility_curve.run(input="fc", output="fragility_curves")
+
+
+@pytest.mark.performance
+def test_combine_fragility_curves_multiple_largeset_csv(benchmark):
+    """Test de CombineFragilityCurvesMultiple met een grote dataset in een enkele run"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    df_large = pd.read_csv(test_data_sets_path / "fragilitycurves_largeset.csv")
+    df_large = df_large.rename(
+        columns={
+            "sectionid": "section_id",
+            "measureid": "measure_id",
+            "failuremechanismid": "failuremechanism_id",
+        }
+    )
+    # faalmechanisme 1 is de gecombineerde curve ter controle
+    df_check = df_large[df_large["failuremechanism_id"] == 1]
+    df_input = df_large[df_large["failuremechanism_id"] != 1]
+
+    config = Config(
+        config_path=test_data_sets_path / "test_combine_fragility_curve.yaml"
+    )
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+    data_adapter.set_dataframe_adapter("fc_largeset", df_input, if_not_exist="create")
+    data_adapter.set_dataframe_adapter("df_test", pd.DataFrame(), if_not_exist="create")
+
+    def perf_test():
+        combine_fc = CombineFragilityCurvesMultiple(data_adapter=data_adapter)
+        combine_fc.run(input="fc_largeset", output="df_test")
+        return combine_fc.df_out
+
+    df_out = benchmark(perf_test)
+
+    usecols = ["hydraulicload", "failure_probability"]
+    results = []
+    for (section_id, measure_id), df_combi in df_out.groupby(
+        ["section_id", "measure_id"]
+    ):
+        df_combi_check = df_check[
+            (df_check["section_id"] == section_id)
+            & (df_check["measure_id"] == measure_id)
+        ]
+        results.append(
+            np.allclose(
+                df_combi[usecols].to_numpy(),
+                df_combi_check[usecols].to_numpy(),
+                atol=1e-8,
+                rtol=1e-2,
+            )
+        )
+    assert len(results) == df_check.groupby(["section_id", "measure_id"]).ngroups
+    assert all(results)
@@ -149,6 +149,37 @@ def test_ShiftFragilityCurveOvertopping():
     )
 
 
+def test_ShiftFragilityCurveOvertopping_sweep():
+    """run_sweep berekent de curve een keer en geeft per effect hetzelfde resultaat als run"""
+    data_adapter = setup_data_adapter()
+    input_val = ["slopes", "profiles", "bed_levels"]
+    output_val = "fragility_curves"
+    effects = [0.0, 0.5, -0.5]
+
+    shift_fragility_curve_overtopping = ShiftFragilityCurveOvertoppingBedlevelFetch(
+        data_adapter=data_adapter
+    )
+    shift_fragility_curve_overtopping.run_sweep(
+        input=input_val, output=output_val, effects=effects
+    )
+    df_sweep = shift_fragility_curve_overtopping.df_out
+    assert list(df_sweep["effect"].unique()) == effects
+
+    for effect in effects:
+        shift_check = ShiftFragilityCurveOvertoppingBedlevelFetch(
+            data_adapter=data_adapter
+        )
+        shift_check.run(input=input_val, output=output_val, effect=effect)
+        df_effect = df_sweep[df_sweep["effect"] == effect]
+        assert np.array_equal(
+            df_effect["hydraulicload"].to_numpy(), shift_check.hydraulicload
+        )
+        assert np.array_equal(
+            df_effect["failure_probability"].to_numpy(),
+            shift_check.failure_probability,
+        )
+
+
 def test_ChangeCrestHeightFragilityCurveOvertopping():
     """Test the change crest height fragility curve overtopping function compared to a previous run"""
     data_adapter = setup_data_adapter()
@@ -181,3 +212,41 @@ def test_ChangeCrestHeightFragilityCurveOvertopping():
         result_fragility_curve_overtopping,
         result_change_crest_height_fragility_curve_overtopping,
     )
+
+
+def test_ChangeCrestHeightFragilityCurveOvertopping_sweep():
+    """De sweep over meerdere kruinhoogtes geeft per effect hetzelfde resultaat als run"""
+    data_adapter = setup_data_adapter()
+    input_val = ["slopes", "profiles", "bed_levels"]
+    effects = [0.0, 0.3, -0.2, 0.25, 2.5]
+
+    change_crest_height_fragility_curve_overtopping = (
+        ChangeCrestHeightFragilityCurveOvertoppingBedlevelFetch(
+            data_adapter=data_adapter
+        )
+    )
+    change_crest_height_fragility_curve_overtopping.run_sweep(
+        input=input_val, output="fragility_curves", effects=effects
+    )
+    df_sweep = change_crest_height_fragility_curve_overtopping.df_out
+    assert list(df_sweep.columns) == ["effect", "hydraulicload", "failure_probability"]
+    assert df_sweep["effect"].unique().tolist() == effects
+
+    for effect in effects:
+        change_crest_height_fragility_curve_overtopping = (
+            ChangeCrestHeightFragilityCurveOvertoppingBedlevelFetch(
+                data_adapter=data_adapter
+            )
+        )
+        change_crest_height_fragility_curve_overtopping.run(
+            input=input_val, output="fragility_curves", effect=effect
+        )
+        df_effect = df_sweep[df_sweep["effect"] == effect]
+        assert np.array_equal(
+            df_effect["hydraulicload"].to_numpy(),
+            change_crest_height_fragility_curve_overtopping.hydraulicload,
+        )
+        assert np.array_equal(
+            df_effect["failure_probability"].to_numpy(),
+            change_crest_height_fragility_curve_overtopping.failure_probability,
+        )
@@ -1,4 +1,5 @@
 from pathlib import Path
+import shutil
 
 import numpy as np
 import pandas as pd
@@ -6,9 +7,19 @@ import pytest
 
 from toolbox_continu_inzicht.base.config import Config
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
+from toolbox_continu_inzicht.base.fragility_curve_cache import (
+    get_fragility_curve_cache,
+)
 from toolbox_continu_inzicht.fragility_curves import (
     FragilityCurveOvertoppingBedlevelFetch,
 )
+from toolbox_continu_inzicht.fragility_curves.fragility_curve_overtopping.overtopping_utils import (
+    build_pydra_profiles,
+)
+from toolbox_continu_inzicht.fragility_curves.fragility_curve_overtopping.wave_overtopping_calculation import (
+    clear_pydra_cache,
+    get_custom_model_uncertainty,
+)
 
 # %%
 slopes = {
@@ -355,3 +366,166 @@ def test_fragility_curves_wave_overtopping_parametric(
     )
     result = wave_overtopping_fragility_curve.failure_probability[41:59]
     assert np.allclose(result, expected)
+
+
+def test_fragility_curves_wave_overtopping_cache():
+    """Een tweede berekening met dezelfde input komt uit de cache"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    shutil.rmtree(
+        test_data_sets_path / "hidden_fragility_curve_cache", ignore_errors=True
+    )
+    config = Config(
+        config_path=test_data_sets_path
+        / "test_fragility_curve_overtopping_bedlevelfetch.yaml"
+    )
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+    options = data_adapter.config.global_variables[
+        "FragilityCurveOvertoppingBedlevelFetch"
+    ]
+    options["cache_dir"] = "hidden_fragility_curve_cache"
+
+    cache = get_fragility_curve_cache(data_adapter, options)
+    hits, misses = cache.hits, cache.misses
+    results = []
+    for _ in range(2):
+        wave_overtopping_fragility_curve = FragilityCurveOvertoppingBedlevelFetch(
+            data_adapter=data_adapter
+        )
+        wave_overtopping_fragility_curve.run(
+            input=["slopes", "profiles", "bedlevel_fetch"],
+            output="fragility_curves",
+        )
+        results.append(wave_overtopping_fragility_curve.as_array())
+
+    assert cache.misses == misses + 1
+    assert cache.hits == hits + 1
+    assert np.array_equal(results[0], results[1])
+
+    # andere opties geven een nieuwe berekening
+    options["gh_onz_mu"] = 1.0
+    wave_overtopping_fragility_curve.run(
+        input=["slopes", "profiles", "bedlevel_fetch"],
+        output="fragility_curves",
+    )
+    assert cache.misses == misses + 2
+
+
+def test_fragility_curves_wave_overtopping_pydra_cache():
+    """Modelonzekerheden worden hergebruikt bij een herhaalde berekening"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(
+        config_path=test_data_sets_path
+        / "test_fragility_curve_overtopping_bedlevelfetch.yaml"
+    )
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+
+    clear_pydra_cache()
+    results = []
+    for _ in range(2):
+        wave_overtopping_fragility_curve = FragilityCurveOvertoppingBedlevelFetch(
+            data_adapter=data_adapter
+        )
+        wave_overtopping_fragility_curve.run(
+            input=["slopes", "profiles", "bedlevel_fetch"],
+            output="fragility_curves",
+        )
+        results.append(wave_overtopping_fragility_curve.as_array())
+
+    assert get_custom_model_uncertainty.cache_info().misses == 1
+    assert np.array_equal(results[0], results[1])
+
+    # de profielen worden niet gedeeld tussen aanroepen
+    df_slopes = pd.DataFrame(
+        {
+            "slopetypeid": [1, 1, 2, 2],
+            "x": [0.0, 10.0, -20.0, 0.0],
+            "y": [0.0, 3.0, 0.0, 0.0],
+            "r": [1.0, 1.0, 1.0, 1.0],
+        }
+    )
+    profile_series = pd.Series(
+        {"orientation": 45.0, "crestlevel": 3.0, "dam": 0.0, "damheight": 0.0}
+    )
+    basis_profiel, overtopping = build_pydra_profiles(df_slopes, profile_series)
+    overtopping.set_dike_crest_level(5.0)
+    _, overtopping_new = build_pydra_profiles(df_slopes, profile_series)
+    assert overtopping_new is not overtopping
+    assert overtopping_new.dike_crest_level == 3.0
+
+    # dezelfde modelonzekerheden geven hetzelfde object
+    uncertainty_options = {
+        "gh_onz_mu": 0.96,
+        "gh_onz_sigma": 0.27,
+        "gp_onz_mu_tspec": 1.03,
+        "gp_onz_sigma_tspec": 0.13,
+        "gh_onz_aantal": 7,
+        "gp_onz_aantal": 7,
+        "closing_situation": 0,
+    }
+    model_uncertainty = get_custom_model_uncertainty(**uncertainty_options)
+    assert get_custom_model_uncertainty(**uncertainty_options) is model_uncertainty
+    assert model_uncertainty.get_model_uncertainty("hs", 0).mu == 0.96
+
+
+def _setup_windspeed_data_adapter(windspeed: float) -> DataAdapter:
+    data_adapter = DataAdapter(config=Config(config_path=Path.cwd()))
+    data_adapter.config.global_variables["FragilityCurveOvertoppingBedlevelFetch"] = {
+        "closing_situation": 0
+    }
+    profiles = {
+        "sectionid": 11,  # only for our reference
+        "crestlevel": 14.63,
+        "orientation": 167,
+        "dam": 0,
+        "damheight": 0,
+        "qcr": "closed",
+        "windspeed": windspeed,
+        "sectormin": 180,
+        "sectorsize": 90,
+        "closing_situation": 0,
+    }
+    data_adapter.set_dataframe_adapter(
+        "slopes", pd.DataFrame(slopes), if_not_exist="create"
+    )
+    data_adapter.set_dataframe_adapter(
+        "profiles",
+        pd.DataFrame(index=["values"], data=[profiles]).T,
+        if_not_exist="create",
+    )
+    data_adapter.set_dataframe_adapter(
+        "bed_levels", pd.DataFrame(bed_levels), if_not_exist="create"
+    )
+    data_adapter.set_dataframe_adapter(
+        "fragility_curves", pd.DataFrame(), if_not_exist="create"
+    )
+    return data_adapter
+
+
+def test_fragility_curves_wave_overtopping_windspeed_surface():
+    """Het vlak over meerdere windsnelheden geeft per windsnelheid hetzelfde resultaat als run"""
+    windspeeds = [10.0, 20.0, 40.0]
+    fragility_curve_overtopping = FragilityCurveOvertoppingBedlevelFetch(
+        data_adapter=_setup_windspeed_data_adapter(20.0)
+    )
+    df_surface = fragility_curve_overtopping.calculate_fragility_curve_surface(
+        ["slopes", "profiles", "bed_levels"], windspeeds
+    )
+
+    for windspeed in windspeeds:
+        fragility_curve_check = FragilityCurveOvertoppingBedlevelFetch(
+            data_adapter=_setup_windspeed_data_adapter(windspeed)
+        )
+        fragility_curve_check.run(
+            input=["slopes", "profiles", "bed_levels"], output="fragility_curves"
+        )
+        df_windspeed = df_surface[df_surface["windspeed"] == windspeed]
+        assert np.array_equal(
+            df_windspeed["hydraulicload"].to_numpy(),
+            fragility_curve_check.hydraulicload,
+        )
+        assert np.array_equal(
+            df_windspeed["failure_probability"].to_numpy(),
+            fragility_curve_check.failure_probability,
+        )
@@ -114,6 +114,52 @@ def test_fragility_curve_wavedata_effects():
     assert not np.allclose(base_fp, crest_fp)
 
 
+def test_fragility_curve_wavedata_crest_sweep():
+    """De sweep over meerdere kruinhoogtes geeft per effect hetzelfde resultaat als run"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(
+        config_path=test_data_sets_path
+        / "test_fragility_curve_overtopping_wavedata.yaml"
+    )
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+    data_adapter.set_dataframe_adapter(
+        "fragility_curves_sweep", pd.DataFrame(), if_not_exist="create"
+    )
+    input_val = [
+        "slopes",
+        "profiles",
+        "waveval_uncert",
+        "waveval_id",
+        "waveval",
+    ]
+    effects = [0.0, 0.5, -0.25]
+
+    change_crest_curve = ChangeCrestHeightFragilityCurveOvertoppingWaveData(
+        data_adapter=data_adapter
+    )
+    change_crest_curve.run_sweep(
+        input=input_val, output="fragility_curves_sweep", effects=effects
+    )
+    df_sweep = change_crest_curve.df_out
+
+    for effect in effects:
+        change_crest_curve = ChangeCrestHeightFragilityCurveOvertoppingWaveData(
+            data_adapter=data_adapter
+        )
+        change_crest_curve.run(
+            input=input_val, output="fragility_curves_sweep", effect=effect
+        )
+        df_effect = df_sweep[df_sweep["effect"] == effect]
+        assert np.array_equal(
+            df_effect["hydraulicload"].to_numpy(), change_crest_curve.hydraulicload
+        )
+        assert np.array_equal(
+            df_effect["failure_probability"].to_numpy(),
+            change_crest_curve.failure_probability,
+        )
+
+
 def test_waveval_uncertainty_overrides_applied_with_globals():
     test_data_sets_path = Path(__file__).parent / "data_sets"
     config = Config(
@@ -185,3 +231,69 @@ def test_waveval_uncertainty_overrides_applied_without_globals():
     assert options["gh_onz_sigma"] == pytest.approx(0.15)
     assert options["gp_onz_mu_tspec"] == pytest.approx(0.89)
     assert options["gp_onz_sigma_tspec"] == pytest.approx(0.04)
+
+
+def test_fragility_curve_wavedata_windspeed_surface():
+    """Het vlak over meerdere windsnelheden geeft per windsnelheid hetzelfde resultaat als run"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(
+        config_path=test_data_sets_path
+        / "test_fragility_curve_overtopping_wavedata.yaml"
+    )
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+    data_adapter.set_dataframe_adapter(
+        "fragility_curves_windspeed", pd.DataFrame(), if_not_exist="create"
+    )
+    input_val = [
+        "slopes",
+        "profiles",
+        "waveval_uncert",
+        "waveval_id",
+        "waveval",
+    ]
+    windspeeds = [15.0, 20.0, 30.0]
+
+    fragility_curve_overtopping = FragilityCurveOvertoppingWaveData(
+        data_adapter=data_adapter
+    )
+    df_surface = fragility_curve_overtopping.calculate_fragility_curve_surface(
+        input_val, windspeeds
+    )
+    assert list(df_surface["windspeed"].unique()) == windspeeds
+
+    df_profile = data_adapter.input("profiles").set_index("parameters")
+    for windspeed in windspeeds:
+        df_profile.loc["windspeed", "values"] = windspeed
+        data_adapter.set_dataframe_adapter(
+            "profiles_windspeed", df_profile.reset_index(), if_not_exist="create"
+        )
+        fragility_curve_check = FragilityCurveOvertoppingWaveData(
+            data_adapter=data_adapter
+        )
+        fragility_curve_check.run(
+            input=["slopes", "profiles_windspeed", *input_val[2:]],
+            output="fragility_curves_windspeed",
+        )
+        df_windspeed = df_surface[df_surface["windspeed"] == windspeed]
+        assert np.array_equal(
+            df_windspeed["hydraulicload"].to_numpy(),
+            fragility_curve_check.hydraulicload,
+        )
+        assert np.array_equal(
+            df_windspeed["failure_probability"].to_numpy(),
+            fragility_curve_check.failure_probability,
+        )
+
+    # tussen de berekende windsnelheden wordt geinterpoleerd
+    fragility_curve_overtopping.interpolate_fragility_curve_surface(df_surface, 25.0)
+    fp_20 = df_surface.loc[df_surface["windspeed"] == 20.0, "failure_probability"]
+    fp_30 = df_surface.loc[df_surface["windspeed"] == 30.0, "failure_probability"]
+    assert np.allclose(
+        fragility_curve_overtopping.failure_probability,
+        np.maximum.accumulate(0.5 * fp_20.to_numpy() + 0.5 * fp_30.to_numpy()),
+    )
+    with pytest.raises(UserWarning):
+        fragility_curve_overtopping.interpolate_fragility_curve_surface(
+            df_surface, 40.0
+        )
@@ -1,7 +1,12 @@
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from toolbox_continu_inzicht.base.config import Config
+from toolbox_continu_inzicht.base.adapters.input.wavedata.cube_wavedata import (
+    WaveDataCube,
+    open_wavedata_cube,
+)
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
 from toolbox_continu_inzicht.fragility_curves import (
     FragilityCurveOvertoppingWaveDataMultiple,
@@ -72,3 +77,87 @@ def test_fragility_curves_wavedata():
     )
     df_actual = df_out.loc[df_expected.index, ["hydraulicload", "failure_probability"]]
     pd.testing.assert_frame_equal(df_actual, df_expected, rtol=1e-12)
+
+
+def test_fragility_curves_wavedata_cube():
+    """De golfdata kubus geeft dezelfde fragility curves als de csv bestanden"""
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(
+        config_path=test_data_sets_path
+        / "test_fragility_curves_overtopping_wavedata.yaml"
+    )
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+
+    # golftabellen eenmalig omzetten naar een kubus
+    df_waveval_id = pd.read_csv(test_data_sets_path / "waveval_id_multi.csv")
+    df_waveval = pd.read_csv(test_data_sets_path / "waveval_multi.csv")
+    df_wavedata = df_waveval_id.merge(df_waveval, on="waveval_id")
+    data_adapter.output("waveval_cube", df_wavedata)
+
+    cube = data_adapter.input("waveval_cube")
+    assert isinstance(cube.values, np.memmap)
+    assert len(cube) == df_waveval_id["hr_locid"].nunique()
+    hr_locid = int(cube.hr_locid[0])
+    location = cube.select(hr_locid)
+    assert np.shares_memory(location.values, cube.values)
+
+    # de kubus bevat dezelfde waardes als de tabellen
+    df_location = df_wavedata[
+        (df_wavedata["hr_locid"] == hr_locid) & (df_wavedata["waveval_type"] == 2)
+    ]
+    grid = location.get_grid(2)
+    i_ws = np.searchsorted(location.windspeed, df_location["windspeed"])
+    i_wd = np.searchsorted(location.winddir, df_location["winddir"])
+    i_wl = np.searchsorted(location.waterlevel, df_location["waterlevel"])
+    np.testing.assert_array_equal(
+        grid[i_ws, i_wd, i_wl], df_location["waveval"].to_numpy()
+    )
+    cube_in_memory = WaveDataCube.open(
+        test_data_sets_path / "hidden_wavedata_cube", memory_map=False
+    )
+    np.testing.assert_array_equal(cube_in_memory.values, cube.values)
+
+    input = ["slopes", "profiles", "section_hrloc", "waveval_uncert"]
+    fragility_curves_csv = FragilityCurveOvertoppingWaveDataMultiple(
+        data_adapter=data_adapter
+    )
+    fragility_curves_csv.run(
+        input=input + ["waveval_id", "waveval"], output="fragility_curves"
+    )
+    fragility_curves_cube = FragilityCurveOvertoppingWaveDataMultiple(
+        data_adapter=data_adapter
+    )
+    fragility_curves_cube.run(input=input + ["waveval_cube"], output="fragility_curves")
+
+    pd.testing.assert_frame_equal(
+        fragility_curves_cube.df_out, fragility_curves_csv.df_out, rtol=1e-12
+    )
+
+
+def test_wavedata_cube_overwrite(tmp_path):
+    """Een overschreven kubus wordt in een keer vervangen en opnieuw geopend"""
+    df = pd.DataFrame(
+        {
+            "hr_locid": [1, 1, 2, 2],
+            "waveval_type": [2, 2, 2, 2],
+            "windspeed": [10.0, 20.0, 10.0, 20.0],
+            "winddir": [0.0, 0.0, 0.0, 0.0],
+            "waterlevel": [1.0, 1.0, 1.0, 1.0],
+            "waveval": [0.5, 1.0, 0.6, 1.1],
+        }
+    )
+    path = tmp_path / "cube"
+    WaveDataCube.from_long_dataframe(df).save(path)
+    cube = open_wavedata_cube(path)
+    assert open_wavedata_cube(path) is cube
+
+    # minder locaties, de assen bestanden veranderen ook
+    WaveDataCube.from_long_dataframe(df[df["hr_locid"] == 2]).save(path)
+    new_cube = open_wavedata_cube(path)
+    assert new_cube is not cube
+    assert new_cube.hr_locid.tolist() == [2]
+    assert new_cube.values.shape[0] == 1
+    # de oude memory map blijft leesbaar
+    assert cube.values.shape[0] == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cube"]
@@ -1,7 +1,11 @@
 from pathlib import Path
+import shutil
 import pandas as pd
 import numpy as np
 from toolbox_continu_inzicht.base.data_adapter import Config, DataAdapter
+from toolbox_continu_inzicht.base.fragility_curve_cache import (
+    get_fragility_curve_cache,
+)
 from toolbox_continu_inzicht.fragility_curves import (
     FragilityCurvePipingFixedWaterlevel,
     FragilityCurvePipingMultiple,
@@ -87,3 +91,41 @@ def test_fragility_curve_piping_multiple_sections():
         atol=1e-8,
         rtol=1e-8,
     )
+
+
+def test_fragility_curve_piping_simple_cache():
+    """Een tweede berekening met dezelfde input komt uit de cache"""
+    path = Path(__file__).parent / "data_sets"
+    shutil.rmtree(path / "hidden_fragility_curve_cache", ignore_errors=True)
+    config = Config(config_path=path / "test_fragility_curve_piping.yaml")
+    config.lees_config()
+    data_adapter = DataAdapter(config=config)
+    options = data_adapter.config.global_variables[
+        "FragilityCurvePipingFixedWaterlevel"
+    ]
+    options["cache_dir"] = "hidden_fragility_curve_cache"
+
+    cache = get_fragility_curve_cache(data_adapter, options)
+    hits, misses = cache.hits, cache.misses
+    lst_fragility_curves = []
+    for _ in range(2):
+        fragility_curve_piping_fixed_waterlevel = FragilityCurvePipingFixedWaterlevel(
+            data_adapter=data_adapter
+        )
+        fragility_curve_piping_fixed_waterlevel.run(
+            input=["probabilistic_input", "waterlevels"], output="fragility_curve"
+        )
+        lst_fragility_curves.append(fragility_curve_piping_fixed_waterlevel)
+
+    assert cache.misses == misses + 1
+    assert cache.hits == hits + 1
+    for attr in [
+        "df_result_uplift",
+        "df_result_heave",
+        "df_result_sellmeijer",
+        "df_result_combined",
+    ]:
+        pd.testing.assert_frame_equal(
+            getattr(lst_fragility_curves[0], attr),
+            getattr(lst_fragility_curves[1], attr),
+        )
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import numpy as np
+
 from toolbox_continu_inzicht import Config, DataAdapter
 from toolbox_continu_inzicht.fragility_curves import (
     LoadCachedFragilityCurveOneFailureMechanism,
@@ -114,3 +116,60 @@ def tests_loadcached_multi_section_multi_failure_mechanism_missing_cached_curve(
 
 
 # TODO add non-trivial tests with different measure_ids per section and failure mechanism
+
+
+def tests_load_cached_multi_section_multi_failure_mechanism_measure_id_per_curve():
+    """checks that the output contains the measure_id from section_id_to_measure_id per curve and that cached curves are used as is"""
+    data_adapter = load_data_adapter(
+        "test_fragility_curve_from_cache_multi_section_multi_failure.yaml"
+    )
+    load_cached_fragility_curve = LoadCachedFragilityCurveMultiple(
+        data_adapter=data_adapter
+    )
+    load_cached_fragility_curve.run(
+        input=[
+            "fragility_curve_multi_section_multi_failure",
+            "measures_to_effect",
+            "section_id_to_measure_id_not_cached",
+        ],
+        output="resulting_fragility_curve",
+    )
+    df_out = load_cached_fragility_curve.df_out
+    df_measures = df_out[
+        ["section_id", "failuremechanism_id", "measure_id"]
+    ].drop_duplicates()
+    df_expected = data_adapter.input("section_id_to_measure_id_not_cached")
+    assert (
+        df_measures.sort_values(["section_id", "failuremechanism_id"]).to_numpy()
+        == df_expected.sort_values(["section_id", "failuremechanism_id"]).to_numpy()
+    ).all()
+
+    # measure_id 1 is aanwezig in de cache en wordt direct gebruikt
+    df_fragility_curves = data_adapter.input(
+        "fragility_curve_multi_section_multi_failure"
+    )
+    df_cached = df_fragility_curves[
+        (df_fragility_curves["section_id"] == 102)
+        & (df_fragility_curves["failuremechanism_id"] == 2)
+        & (df_fragility_curves["measure_id"] == 1)
+    ]
+    df_selected = df_out[
+        (df_out["section_id"] == 102) & (df_out["failuremechanism_id"] == 2)
+    ]
+    assert np.allclose(
+        df_selected["failure_probability"].to_numpy(),
+        np.maximum.accumulate(df_cached["failure_probability"].to_numpy()),
+    )
+    # measure_id 4 is niet aanwezig en wordt verschoven, de basis curve blijft ongewijzigd
+    df_shifted = df_out[
+        (df_out["section_id"] == 103) & (df_out["failuremechanism_id"] == 2)
+    ]
+    df_base = load_cached_fragility_curve.df_in[
+        (load_cached_fragility_curve.df_in["section_id"] == 103)
+        & (load_cached_fragility_curve.df_in["failuremechanism_id"] == 2)
+    ]
+    assert len(df_shifted) == len(df_base)
+    assert (
+        df_shifted["failure_probability"].to_numpy()
+        <= df_base["failure_probability"].to_numpy()
+    ).all()
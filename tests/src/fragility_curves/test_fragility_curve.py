@@ -1,6 +1,7 @@
 from pathlib import Path
 
 import numpy as np
+import pytest
 
 from toolbox_continu_inzicht.base.config import Config
 from toolbox_continu_inzicht.base.data_adapter import DataAdapter
@@ -99,3 +100,120 @@ def test_fragility_curve_monotonic():
         ]
     )
     assert np.allclose(check_data, data, atol=0, rtol=1e-8)
+
+
+def test_fragility_curve_refine_many():
+    """refine_many geeft hetzelfde resultaat als refine per curve"""
+    hydraulicload = np.array([1.0, 2.0, 2.0, 3.0])
+    new_hydraulicload = np.linspace(0.5, 3.5, 13)
+    lst_failure_probability = [
+        np.array([0, 1e-8, 1e-6, 1e-6]),
+        np.array([1e-5, 1e-4, 1e-3, 1e-2]),
+    ]
+    lst_fc = [
+        _setup_fragility_curve(hydraulicload.copy(), fp.copy(), False)
+        for fp in lst_failure_probability
+    ]
+    # afwijkende belastingen krijgen een eigen interpolatie
+    lst_fc.append(
+        _setup_fragility_curve(np.array([1.5, 2.5]), np.array([1e-4, 1e-1]), False)
+    )
+    FragilityCurve.refine_many(lst_fc, new_hydraulicload, add_steps=True)
+
+    for fc, (hl, fp) in zip(
+        lst_fc,
+        [(hydraulicload, fp) for fp in lst_failure_probability]
+        + [(np.array([1.5, 2.5]), np.array([1e-4, 1e-1]))],
+    ):
+        fc_check = _setup_fragility_curve(hl.copy(), fp.copy(), False)
+        fc_check.refine(new_hydraulicload, add_steps=True)
+        assert np.array_equal(fc.as_array(), fc_check.as_array())
+
+
+def test_fragility_curve_shift_many():
+    """shift_many geeft per effect hetzelfde resultaat als shift"""
+    hydraulicload = np.array([1.0, 2.0, 2.0, 3.0, 4.0])
+    failure_probability = np.array([0, 1e-8, 1e-6, 1e-4, 1e-2])
+    fc = _setup_fragility_curve(hydraulicload, failure_probability, False)
+    effects = np.array([0.0, 0.5, -0.25, 1.5])
+
+    failure_probabilities = fc.shift_many(effects)
+    assert failure_probabilities.shape == (len(effects), len(hydraulicload))
+    assert np.array_equal(fc.failure_probability, failure_probability)
+    for effect, shifted_failure_probability in zip(effects, failure_probabilities):
+        fc_check = fc.copy()
+        fc_check.shift(effect)
+        assert np.array_equal(shifted_failure_probability, fc_check.failure_probability)
+
+    df = fc.as_shifted_dataframe(effects)
+    assert list(df.columns) == ["effect", "hydraulicload", "failure_probability"]
+    assert np.array_equal(
+        df.loc[df["effect"] == 0.5, "failure_probability"], failure_probabilities[1]
+    )
+
+
+def test_fragility_curve_copy_on_write():
+    """Een kopie deelt de arrays, maar aanpassingen raken het origineel niet"""
+    hydraulicload = np.array([1.0, 2.0, 3.0, 4.0])
+    failure_probability = np.array([1e-5, 1e-4, 1e-3, 1e-2])
+    fc = _setup_fragility_curve(hydraulicload, failure_probability, True)
+    fc_copy = fc.copy()
+
+    assert type(fc_copy) is FragilityCurve
+    assert fc_copy.data_adapter is fc.data_adapter
+    assert fc_copy.failure_probability is fc.failure_probability
+
+    initial_value = fc.failure_probability.copy()
+    fc_copy.reliability_update(update_level=2.5, trust_factor=1)
+    fc_copy.shift(0.5)
+    assert np.array_equal(fc.failure_probability, initial_value)
+    assert not np.array_equal(fc_copy.failure_probability, initial_value)
+
+
+def test_fragility_curve_construct():
+    """_construct vult standaardwaardes aan en slaat validatie over"""
+    fc = _setup_fragility_curve(np.array([1.0, 2.0]), np.array([0.1, 0.2]), True)
+    fc_construct = FragilityCurve._construct(
+        data_adapter=fc.data_adapter,
+        hydraulicload=fc.hydraulicload,
+        failure_probability=fc.failure_probability,
+    )
+    assert fc_construct.lower_limit == fc.lower_limit
+    assert fc_construct.interp_x_func is fc.interp_x_func
+    assert fc_construct.enforce_monotonic
+    assert np.array_equal(fc_construct.as_array(), fc.as_array())
+
+    with pytest.raises(TypeError):
+        FragilityCurve._construct(hydraulicload=fc.hydraulicload)
+
+
+@pytest.mark.performance
+def test_fragility_curve_construct_benchmark(benchmark):
+    """Kosten per instantie van _construct, vergelijk met de constructor hieronder"""
+    fc = _setup_fragility_curve(np.array([1.0, 2.0]), np.array([0.1, 0.2]), True)
+
+    def construct():
+        return FragilityCurve._construct(
+            data_adapter=fc.data_adapter,
+            hydraulicload=fc.hydraulicload,
+            failure_probability=fc.failure_probability,
+        )
+
+    fc_construct = benchmark(construct)
+    assert fc_construct.hydraulicload is fc.hydraulicload
+
+
+@pytest.mark.performance
+def test_fragility_curve_init_benchmark(benchmark):
+    """Kosten per instantie van de (validerende) constructor"""
+    fc = _setup_fragility_curve(np.array([1.0, 2.0]), np.array([0.1, 0.2]), True)
+
+    def init():
+        return FragilityCurve(
+            data_adapter=fc.data_adapter,
+            hydraulicload=fc.hydraulicload,
+            failure_probability=fc.failure_probability,
+        )
+
+    fc_init = benchmark(init)
+    assert fc_init.hydraulicload is fc.hydraulicload
@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 import pytest
 from toolbox_continu_inzicht.inspections.inspections import ClassifyInspections
 
@@ -146,6 +147,44 @@ def test_classify_inspections_text_contains():
     assert all(result[:, 1] == expected[:, 1])
 
 
+def test_classify_inspections_text_startswith():
+    """test werkt met text, waarbij de waarde moet beginnen met de classificatie"""
+    data_adapter = helper_create_data_adapter("test_inspection.yaml")
+    data_adapter.config.global_variables["ClassifyInspections"]["classify_column"] = (
+        "opmerking"
+    )
+    data_adapter.config.data_adapters["styling_example"]["path"] = (
+        "styling_example_text.csv"
+    )
+    data_adapter.config.global_variables["ClassifyInspections"][
+        "classify_text_type"
+    ] = "startswith"
+    classify_inspection = ClassifyInspections(data_adapter=data_adapter)
+    classify_inspection.run(
+        input=["locations_inspections", "styling_example"], output="classify_resultaten"
+    )
+    result = classify_inspection.df_out["color"].to_list()
+    assert result == ["#a9070f", "#07a9a1", "#0760a9"]
+
+
+def test_classify_inspections_numeric_overlapping_classes():
+    """bij overlappende klasses telt de laatste klasse, net als zonder bovengrens"""
+    values = pd.Series([0.5, 1.5, 2.5, 3.5, np.nan, 10.0])
+    lower_boundary = pd.Series([0.0, 1.0, 2.0])
+    class_index = ClassifyInspections._classify_numeric(
+        values, lower_boundary, pd.Series([4.0, 3.0, 3.0])
+    )
+    assert class_index.tolist() == [0, 1, 2, 0, -1, -1]
+    class_index = ClassifyInspections._classify_numeric(
+        values, lower_boundary, pd.Series([1.0, 2.0, 3.0])
+    )
+    assert class_index.tolist() == [0, 1, 2, -1, -1, -1]
+    class_index = ClassifyInspections._classify_numeric(
+        values, pd.Series([2.0, 0.0, 1.0])
+    )
+    assert class_index.tolist() == [1, 2, 2, 2, -1, 2]
+
+
 def test_classify_inspections_edit_default_styling():
     """test of het werkt om de default styling aan te passen"""
     data_adapter = helper_create_data_adapter("test_inspection.yaml")
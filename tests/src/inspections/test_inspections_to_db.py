@@ -1,4 +1,9 @@
+import json
+
+import geopandas as gpd
 import pytest
+from shapely.geometry import LineString, Polygon
+from toolbox_continu_inzicht.inspections.geojson import geodataframe_to_geojson
 from toolbox_continu_inzicht.inspections.inspections import InspectionsToDatabase
 
 from pathlib import Path
@@ -65,3 +70,43 @@ def test_classify_simple_polygon_to_db():
     # check layer legend and data have been added
     assert (len(inspections_to_database.df_out.loc[0, "layer_legend"])) >= 234
     assert (len(inspections_to_database.df_out.loc[0, "layer_data"])) >= 699
+
+
+def test_inspections_to_database_chunks():
+    """test of grote aantallen resultaten over meerdere lagen worden verdeeld"""
+    data_adapter = helper_create_data_adapter("test_inspection_to_db.yaml")
+    data_adapter.config.global_variables["InspectionsToDatabase"]["chunk_size"] = 2
+    data_adapter.config.global_variables["InspectionsToDatabase"]["index"] = 2
+    inspections_to_database = InspectionsToDatabase(data_adapter=data_adapter)
+    inspections_to_database.run(
+        input=["classify_resultaten", "legenda", "layers"],
+        output="example_to_database",
+    )
+    df_out = inspections_to_database.df_out
+    assert df_out["layer_name"].to_list() == [
+        "wms test",
+        "table test",
+        "data test (1/2)",
+        "data test (2/2)",
+    ]
+    features = [
+        feature
+        for layer_data in df_out.loc[2:, "layer_data"]
+        for feature in json.loads(layer_data)["features"]
+    ]
+    assert [feature["id"] for feature in features] == ["0", "1", "2"]
+    assert features[0]["properties"]["style"]["color"] == "#a9070f"
+    assert all(len(legend) >= 472 for legend in df_out.loc[2:, "layer_legend"])
+
+
+def test_geodataframe_to_geojson_equals_to_json():
+    """de GeoJSON is gelijk aan die van geopandas"""
+    gdf = gpd.read_file(
+        Path(__file__).parent / "data_sets" / "classify_resultaten.geojson"
+    ).drop(columns=["tijd"])
+    gdf.loc[1, "opacity"] = float("nan")
+    gdf.loc[1, "geometry"] = LineString([(5.1, 52.1), (5.2, 52.3)])
+    gdf.loc[2, "geometry"] = Polygon(
+        [(0, 0), (1.1, 0), (1, 0.3)], [[(0.5, 0.1), (0.6, 0.1), (0.55, 0.15)]]
+    )
+    assert geodataframe_to_geojson(gdf) == json.dumps(json.loads(gdf.to_json()))
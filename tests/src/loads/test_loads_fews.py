@@ -1,6 +1,7 @@
 import os
 import pandas as pd
 import pytest
+import requests
 
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -177,3 +178,123 @@ def test_create_dataframe():
     )
     assert df_out is not None
     assert len(df_out) == 1
+
+
+def test_create_chunked_params():
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(config_path=test_data_sets_path / "test_loads_fews_config.yaml")
+    config.lees_config()
+
+    data_adapter = DataAdapter(config=config)
+    fews = LoadsFews(data_adapter=data_adapter)
+
+    options = {
+        "version": "1.25",
+        "parameters": ["WATHTE", "WINDSHD"],
+    }
+    locations = pd.DataFrame(
+        data={"measurement_location_code": ["a", "b", "c", "d", "e"]}
+    )
+    calc_time = datetime(2024, 10, 17, 12, 0, 0).replace(tzinfo=timezone.utc)
+
+    # zonder opties een blok, gelijk aan create_params
+    chunked_params = fews.create_chunked_params(
+        calc_time=calc_time, options=options, moments=[-24, 0], locations=locations
+    )
+    assert chunked_params == [
+        fews.create_params(
+            calc_time=calc_time, options=options, moments=[-24, 0], locations=locations
+        )
+    ]
+
+    options["location_chunk_size"] = 2
+    options["parameter_chunk_size"] = 1
+    chunked_params = fews.create_chunked_params(
+        calc_time=calc_time, options=options, moments=[-24, 0], locations=locations
+    )
+    assert len(chunked_params) == 6
+    assert [params["locationIds"] for params in chunked_params[:3]] == [
+        ["a", "b"],
+        ["c", "d"],
+        ["e"],
+    ]
+    assert [params["parameterIds"] for params in chunked_params[::3]] == [
+        ["WATHTE"],
+        ["WINDSHD"],
+    ]
+
+
+def test_fetch_chunks_retry(monkeypatch):
+    test_data_sets_path = Path(__file__).parent / "data_sets"
+    config = Config(config_path=test_data_sets_path / "test_loads_fews_config.yaml")
+    config.lees_config()
+
+    data_adapter = DataAdapter(config=config)
+    fews = LoadsFews(data_adapter=data_adapter)
+    fews.df_in = pd.DataFrame(
+        data={
+            "measurement_location_id": [1, 2, 3, 4],
+            "measurement_location_code": ["a", "b", "c", "d"],
+            "measurement_location_description": ["A", "B", "C", "D"],
+        }
+    )
+    options = {
+        "version": "1.25",
+        "parameters": ["WATHTE"],
+        "location_chunk_size": 1,
+        "retries": 1,
+        "retry_delay": 0.01,
+        "MISSING_VALUE": -999,
+    }
+    calc_time = datetime(2024, 10, 17, 12, 0, 0).replace(tzinfo=timezone.utc)
+
+    calls = []
+
+    def http_error(status_code: int) -> requests.HTTPError:
+        response = requests.Response()
+        response.status_code = status_code
+        return requests.HTTPError("Error", response=response)
+
+    def fake_fetch_data_get(
+        url, params, mime_type, timeout, path_certificate, session, return_http_error
+    ):
+        location = params["locationIds"][0]
+        calls.append(location)
+        # blok b faalt de eerste keer (verbinding), blok c altijd (5xx), blok d met een 4xx
+        if location == "b" and calls.count("b") == 1:
+            return requests.ConnectionError("Connection failed"), None
+        if location == "c":
+            return http_error(503), None
+        if location == "d":
+            return http_error(404), None
+        serie = {
+            "header": {"parameterId": "WATHTE", "locationId": location, "units": "m"},
+            "events": [{"date": "2024-10-17", "time": "12:00:00", "value": "1.0"}],
+        }
+        return None, {"timeSeries": [serie]}
+
+    monkeypatch.setattr(
+        "toolbox_continu_inzicht.loads.loads_fews.loads_fews.fetch_data_get",
+        fake_fetch_data_get,
+    )
+
+    chunked_params = fews.create_chunked_params(
+        calc_time=calc_time,
+        options=options,
+        moments=[-24, 0],
+        locations=fews.df_in,
+    )
+    dataframes = fews.fetch_chunks(
+        url="http://localhost",
+        chunked_parameters=chunked_params,
+        options=options,
+        calc_time=calc_time,
+        global_variables={"aquo_alias": {}},
+    )
+
+    # een 4xx wordt niet opnieuw geprobeerd
+    assert sorted(calls) == ["a", "b", "b", "c", "c", "d"]
+    assert dataframes[0]["measurement_location_code"].tolist() == ["a"]
+    assert dataframes[1]["measurement_location_code"].tolist() == ["b"]
+    assert dataframes[2] is None
+    assert dataframes[3] is None
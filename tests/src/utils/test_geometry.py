@@ -0,0 +1,69 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import LineString, Point, Polygon
+
+from toolbox_continu_inzicht.utils.geometry import (
+    GeometryProperties,
+    geodataframe_from_xy,
+    get_transformer,
+    to_crs,
+)
+
+
+def test_get_transformer_cached():
+    """
+    Test of dezelfde transformatie wordt hergebruikt
+    """
+    transformer = get_transformer(28992, "EPSG:4326")
+    assert get_transformer("EPSG:28992", 4326) is transformer
+    assert get_transformer(4326, 28992) is not transformer
+
+
+def test_to_crs():
+    """
+    Test of het omzetten van projectie gelijk is aan dat van geopandas, ook met z-waardes
+    """
+    gdf = gpd.GeoDataFrame(
+        {"id": [1, 2, 3]},
+        geometry=[
+            Point(155000, 463000),
+            LineString([(155000, 463000, 1.0), (156000, 464000, 2.0)]),
+            Polygon([(155000, 463000), (156000, 463000), (156000, 464000)]),
+        ],
+        crs=28992,
+    )
+    pd.testing.assert_frame_equal(to_crs(gdf, 4326), gdf.to_crs(4326))
+    assert to_crs(gdf, "EPSG:28992") is gdf
+
+
+def test_geodataframe_from_xy():
+    """
+    Test het aanmaken van punten uit coördinaten, met en zonder transformatie
+    """
+    df = pd.DataFrame({"x": [155000.0, 156000.0], "y": [463000.0, 464000.0]})
+    gdf = geodataframe_from_xy(df, crs=28992)
+    assert gdf.crs.to_epsg() == 28992
+    assert list(gdf.geometry.x) == [155000.0, 156000.0]
+
+    gdf_wgs84 = geodataframe_from_xy(df, crs=28992, to_crs=4326)
+    expected = gpd.GeoDataFrame(
+        df, geometry=gpd.points_from_xy(df.x, df.y), crs=28992
+    ).to_crs(4326)
+    pd.testing.assert_frame_equal(gdf_wgs84, expected)
+    # de oorspronkelijke coördinaten blijven behouden
+    assert list(gdf_wgs84["x"]) == [155000.0, 156000.0]
+
+
+def test_geometry_properties():
+    """
+    Test of de oppervlaktes en bounds maar een keer worden bepaald
+    """
+    gdf = gpd.GeoDataFrame(
+        geometry=[Polygon([(0, 0), (200, 0), (200, 100), (0, 100)])], crs=28992
+    )
+    properties = GeometryProperties(gdf)
+    assert properties.area_hectare.tolist() == [2.0]
+    assert properties.area is properties.area
+    assert np.array_equal(properties.total_bounds, [0, 0, 200, 100])
+    assert properties.bounds.loc[0, "maxx"] == 200
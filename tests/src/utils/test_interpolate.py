@@ -6,6 +6,8 @@ from toolbox_continu_inzicht.utils.interpolate import (
     log_y_interpolate_1d,
     circular_interpolate_1d,
     bracketing_indices,
+    grouped_x_interpolate_1d,
+    InterpolationPlan,
 )
 import numpy as np
 from test_interpolate_data import fragility_curve_data
@@ -150,3 +152,46 @@ def test_bracketing_indices_wrap():
 
     assert (i0, i1) == (3, 0)
     assert np.isclose(f, (350.0 - 270.0) / 90.0)
+
+
+def test_grouped_x_interpolate():
+    """Gegroepeerde interpolatie geeft hetzelfde resultaat als per groep interpoleren"""
+    xp = np.array([1.0, 2.0, 2.0, 3.0, 0.0, 5.0, 10.0])
+    fp = np.array([0.01, 0.01, 0.1, 0.2, 1e-5, 1e-3, 0.5])
+    xp_group = np.array([0, 0, 0, 0, 1, 1, 1])
+    x = np.array([0.5, 1.5, 2.0, 3.5, -1.0, 2.0, 7.5, 12.0])
+    x_group = np.array([0, 0, 0, 0, 1, 1, 1, 1])
+    for interp_func in [interpolate_1d, log_x_interpolate_1d, beta_x_interpolate_1d]:
+        f = grouped_x_interpolate_1d(
+            x, x_group, xp, fp, xp_group, interp_func=interp_func, clip01=True
+        )
+        for group in [0, 1]:
+            expected = interp_func(
+                x[x_group == group],
+                xp[xp_group == group],
+                fp[xp_group == group],
+                ll=1e-200,
+                clip01=True,
+            )
+            assert np.array_equal(f[x_group == group], expected)
+
+
+def test_interpolation_plan_2d():
+    """Een plan geeft voor een stapel fp-vectoren hetzelfde resultaat als per vector"""
+    xp = np.array([1.0, 2.0, 2.0, 3.0])
+    fp = np.array([[0.01, 0.01, 0.1, 0.2], [1e-5, 1e-4, 1e-3, 1e-2]])
+    x = np.array([0.5, 1.5, 1.99, 2.0, 2.01, 3.5])
+    plan = InterpolationPlan(x, xp)
+    assert plan.matches(x, xp)
+    assert not plan.matches(x[:-1], xp)
+    for interp_func, plan_func in [
+        (interpolate_1d, plan.interpolate_1d),
+        (log_x_interpolate_1d, plan.log_x_interpolate_1d),
+        (beta_x_interpolate_1d, plan.beta_x_interpolate_1d),
+    ]:
+        f = plan_func(fp, ll=1e-200, clip01=True)
+        assert f.shape == fp.shape[:1] + x.shape
+        for row, fp_row in zip(f, fp):
+            assert np.array_equal(
+                row, interp_func(x, xp, fp_row, ll=1e-200, clip01=True)
+            )
@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+from toolbox_continu_inzicht.utils.metadata_cache import (
+    MetadataCache,
+    cached_metadata,
+    configure_metadata_cache,
+    get_metadata_cache,
+)
+
+
+class Fetcher:
+    """Telt het aantal keer dat de metadata wordt opgehaald"""
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("Connection failed")
+        return pd.DataFrame({"location": ["a", "b"], "call": self.calls})
+
+
+def test_metadata_cache_ttl():
+    """
+    Test of de metadata binnen de ttl niet opnieuw wordt opgehaald
+    """
+    cache = MetadataCache(ttl=3600)
+    fetch = Fetcher()
+
+    df = cache.get("key", fetch)
+    df.loc[0, "location"] = "aangepast"
+    df_cached = cache.get("key", fetch)
+    assert fetch.calls == 1
+    assert df_cached["location"].tolist() == ["a", "b"]
+
+    cache.ttl = 0
+    assert cache.get("key", fetch)["call"].tolist() == [2, 2]
+    assert fetch.calls == 2
+
+
+def test_metadata_cache_snapshot(tmp_path):
+    """
+    Test of een volgende run de snapshot op schijf gebruikt en bij een fout terugvalt
+    op verouderde metadata
+    """
+    fetch = Fetcher()
+    MetadataCache(cache_dir=tmp_path).get("key", fetch)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    df = MetadataCache(cache_dir=tmp_path).get("key", fetch)
+    assert fetch.calls == 1
+    assert df["location"].tolist() == ["a", "b"]
+
+    with pytest.warns(UserWarning):
+        df = MetadataCache(ttl=0, cache_dir=tmp_path).get("key", Fetcher(fail=True))
+    assert df["location"].tolist() == ["a", "b"]
+
+    with pytest.raises(ConnectionError):
+        MetadataCache(cache_dir=tmp_path).get("other_key", Fetcher(fail=True))
+
+
+def test_metadata_cache_background_refresh():
+    """
+    Test of verouderde metadata direct wordt teruggegeven en op de achtergrond wordt vernieuwd
+    """
+    cache = MetadataCache(ttl=3600, background_refresh=True)
+    fetch = Fetcher()
+    cache.get("key", fetch)
+
+    cache.ttl = 0
+    assert cache.get("key", fetch)["call"].tolist() == [1, 1]
+    cache.wait(timeout=10)
+    assert fetch.calls == 2
+    assert cache.get("key", fetch)["call"].tolist() == [2, 2]
+
+
+def test_cached_metadata_decorator():
+    """
+    Test of positionele argumenten en keyword argumenten hetzelfde resultaat delen
+    """
+    cache = get_metadata_cache()
+    old_settings = (cache.ttl, cache.enabled)
+    configure_metadata_cache(ttl=3600, enabled=True)
+    calls = []
+
+    @cached_metadata
+    def get_locations(parameter_id: str = "waterhoogte"):
+        calls.append(parameter_id)
+        return pd.DataFrame({"parameter": [parameter_id]})
+
+    try:
+        get_locations()
+        get_locations("waterhoogte")
+        get_locations(parameter_id="waterhoogte")
+        get_locations("windsnelheid")
+        get_locations.__wrapped__("waterhoogte")
+        assert calls == ["waterhoogte", "windsnelheid", "waterhoogte"]
+    finally:
+        cache.ttl, cache.enabled = old_settings